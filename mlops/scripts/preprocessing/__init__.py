@@ -0,0 +1 @@
+"""Preprocessing package for trending-movies-tvshows project."""
@@ -0,0 +1,133 @@
+"""Benchmark the vectorized field parsers and item IDs against per-row loops.
+
+Usage:
+    python -m mlops.scripts.preprocessing.benchmark_parsers --rows 2000000
+"""
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..scraping.relational_export import item_id
+from .hashing import item_ids
+from .parsers import (
+    parse_date,
+    parse_duration,
+    parse_percent,
+    parse_rating,
+    parse_review_score,
+)
+
+# Realistic spellings as returned by the extraction prompts
+SAMPLES = {
+    "duration": ["1h 30min", "24min", "2h 5min", "45min", "1h", "", None],
+    "imdbRating": ["7.8/10", "6.1/10", "8", "N/A", None],
+    "rottenTomatoesRating": ["91%", "45%", "100%", "", None],
+    "releaseDate": ["2024-05-01", "May 1, 2024", "01 May 2024", "2023", "Soon", None],
+    "original_score": ["8/10", "4 stars", "A-", "85%", "3.5 out of 5", "7", None],
+}
+
+PARSERS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    "duration": parse_duration,
+    "imdbRating": parse_rating,
+    "rottenTomatoesRating": parse_percent,
+    "releaseDate": parse_date,
+    "original_score": parse_review_score,
+}
+
+DURATION_RE = re.compile(r"^(?:(\d+)\s*h)?\s*(?:(\d+)\s*min)?$")
+
+
+def _loop_duration(value: Optional[str]) -> float:
+    """Per-row reference implementation used as the baseline."""
+    match = DURATION_RE.match((value or "").strip())
+    if not match or not any(match.groups()):
+        return np.nan
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def make_column(field: str, rows: int, seed: int = 0) -> pd.Series:
+    """Build a column of ``rows`` values sampled from :data:`SAMPLES`."""
+    rng = np.random.default_rng(seed)
+    samples = SAMPLES[field]
+    return pd.Series([samples[i] for i in rng.integers(len(samples), size=rows)])
+
+
+def make_items(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build ``rows`` items, most titles listed several times."""
+    rng = np.random.default_rng(seed)
+    titles = rng.integers(max(1, rows // 4), size=rows)
+    return pd.DataFrame(
+        {
+            "detailUrl": [f"/us/movie/title-{i}" for i in titles],
+            "title": [f"Title {i}" for i in titles],
+            "yearReleased": ["2024"] * rows,
+        }
+    )
+
+
+def _timed(field: str, rows: int, func: Callable[[], object]) -> Dict:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {
+        "field": field,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_s": rows / elapsed,
+    }
+
+
+def run(rows: int) -> List[Dict]:
+    """Time every parser on a column of ``rows`` values.
+
+    Args:
+        rows: Number of rows per column.
+
+    Returns:
+        One result dict per field with the elapsed seconds and rows/second.
+    """
+    results = []
+    for field, parse in PARSERS.items():
+        column = make_column(field, rows)
+        results.append(_timed(field, rows, lambda: parse(column)))
+
+    column = make_column("duration", rows)
+    results.append(
+        _timed(
+            "duration (per-row loop)",
+            rows,
+            lambda: [_loop_duration(value) for value in column],
+        )
+    )
+
+    items = make_items(rows)
+    results.append(_timed("item_ids", rows, lambda: item_ids(items)))
+    records = items.to_dict("records")
+    results.append(
+        _timed(
+            "item_ids (per-row loop)",
+            rows,
+            lambda: [item_id(record) for record in records],
+        )
+    )
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    results = pd.DataFrame(run(args.rows))
+    print(results.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Stable item IDs, source data hashes and the index of hashes already seen.
+
+Item IDs are the surrogate IDs of the relational export
+(:func:`~mlops.scripts.scraping.relational_export.item_id`). Natural keys
+are built column-wise and only distinct keys are hashed. Source data hashes are computed over whole
+columns with pandas' vectorized SipHash (``pd.util.hash_pandas_object``), a
+fast keyed non-cryptographic 64-bit digest, and stored as 16-character hex
+strings.
+
+Usage:
+    python -m mlops.scripts.preprocessing.hashing data/raw/justwatch_data_<ts>.jsonl
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+from urllib.parse import urljoin
+
+import numpy as np
+import pandas as pd
+
+from ..scraping.known_items import JUSTWATCH_URL, canonical_url
+from ..scraping.relational_export import stable_id
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+HASH_INDEX_PATH = DATA_DIR / "state" / "source_hash_index.parquet"
+
+# Fields whose change means a record has to be processed again
+SOURCE_HASH_FIELDS = (
+    "title",
+    "contentType",
+    "yearReleased",
+    "releaseDate",
+    "synopsis",
+    "genres",
+    "cast",
+    "directors",
+)
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype="S1")
+
+
+def _to_hex(digests: np.ndarray) -> np.ndarray:
+    """Format uint64 digests as 16-character hex strings without a row loop."""
+    octets = digests.astype(">u8").view(np.uint8).reshape(-1, 8)
+    nibbles = np.stack([octets >> 4, octets & 0xF], axis=-1).reshape(-1, 16)
+    return HEX_DIGITS[nibbles].view("S16").ravel().astype(str)
+
+
+# Item fields the natural key of an item is built from
+ITEM_KEY_FIELDS = ("detailUrl", "title", "yearReleased")
+
+# Absolute http(s) URLs and host-relative paths, both without dot segments,
+# are resolved and canonicalized with string operations
+SIMPLE_URL_RE = r"^(?:https?://[^/?#]*)?/(?!/)(?!(?:[^?#]*/)?\.\.?(?:[/?#]|$))"
+URL_PARTS_RE = r"^(?:(?P<scheme>[^:/?#]+)://(?P<netloc>[^/?#]*))?(?P<path>[^?#]*)"
+
+
+def _column(df: pd.DataFrame, field: str) -> pd.Series:
+    """Return a key field as objects with missing values as None."""
+    if field not in df:
+        return pd.Series("", index=df.index, dtype=object)
+    column = df[field].astype(object)
+    return column.where(column.notna(), None)
+
+
+def _canonical_detail_urls(urls: pd.Series, base_url: str) -> pd.Series:
+    """Resolve detail URLs against ``base_url`` and canonicalize them.
+
+    Matches ``canonical_url(urljoin(base_url, url))`` for every value; the
+    rare URLs the string operations do not cover are resolved one distinct
+    value at a time.
+    """
+    simple = urls.str.contains(SIMPLE_URL_RE, regex=True)
+    parts = urls[simple].str.extract(URL_PARTS_RE)
+    base_parts = pd.Series([base_url]).str.extract(URL_PARTS_RE).iloc[0]
+    scheme = parts["scheme"].fillna(base_parts["scheme"]).str.lower()
+    netloc = parts["netloc"].fillna(base_parts["netloc"]).str.lower()
+    resolved = scheme + "://" + netloc + parts["path"].str.rstrip("/")
+
+    others = urls[~simple]
+    distinct = others.drop_duplicates()
+    canonical = dict(
+        zip(distinct, (canonical_url(urljoin(base_url, url)) for url in distinct))
+    )
+    return pd.concat([resolved, others.map(canonical)]).reindex(urls.index)
+
+
+def _natural_keys(keys: pd.DataFrame, base_url: str) -> pd.Series:
+    """Return ``relational_export.item_natural_key`` of every key row."""
+    urls = keys["detailUrl"]
+    has_url = urls.notna() & (urls != "")
+    # Same spelling as item_natural_key, including "None" for missing values
+    natural = (
+        "title:"
+        + keys["title"].astype(str).str.lower()
+        + ":"
+        + keys["yearReleased"].astype(str)
+    )
+    natural[has_url] = _canonical_detail_urls(urls[has_url].astype(str), base_url)
+    return natural
+
+
+def item_ids(df: pd.DataFrame, base_url: str = JUSTWATCH_URL) -> pd.Series:
+    """Return the stable ID of every item.
+
+    The ID is the ``item_id`` of the relational export: a 63-bit hash of the
+    canonical detail URL, or of the lowercased title and release year for
+    items without one. Rows are grouped by their key fields first, so keys
+    are only built, with vectorized string operations, and hashed once per
+    distinct item.
+
+    Args:
+        df: Items with the scraper's field names.
+        base_url: Scheme and host relative detail URLs belong to.
+
+    Returns:
+        Column of integer IDs.
+    """
+    keys = pd.DataFrame(
+        {field: _column(df, field) for field in ITEM_KEY_FIELDS}, index=df.index
+    )
+    codes = (
+        keys.groupby(list(ITEM_KEY_FIELDS), dropna=False, sort=False)
+        .ngroup()
+        .to_numpy()
+    )
+    # Groups are numbered in order of first appearance
+    first = ~pd.Series(codes).duplicated().to_numpy()
+    natural = _natural_keys(keys[first], base_url)
+    ids = np.fromiter(
+        (stable_id("item", key) for key in natural),
+        dtype=np.int64,
+        count=len(natural),
+    )
+    return pd.Series(ids[codes], index=df.index, dtype="int64")
+
+
+def source_data_hashes(
+    df: pd.DataFrame, fields: Sequence[str] = SOURCE_HASH_FIELDS
+) -> pd.Series:
+    """Return a digest of the source fields of every item.
+
+    Args:
+        df: Items with the scraper's field names.
+        fields: Fields covered by the hash. Missing columns count as empty.
+
+    Returns:
+        Column of 16-character hex hashes.
+    """
+    columns = {}
+    for field in fields:
+        if field not in df:
+            columns[field] = ""
+            continue
+        # str() of the nested cast/genre lists is deterministic for a given
+        # extraction and much cheaper than json.dumps per row
+        column = df[field]
+        columns[field] = column.astype(str).where(column.notna(), "")
+    digests = pd.util.hash_pandas_object(
+        pd.DataFrame(columns, index=df.index), index=False, categorize=True
+    ).to_numpy()
+    return pd.Series(_to_hex(digests), index=df.index)
+
+
+def add_ids_and_hashes(
+    df: pd.DataFrame,
+    fields: Sequence[str] = SOURCE_HASH_FIELDS,
+    base_url: str = JUSTWATCH_URL,
+) -> pd.DataFrame:
+    """Add ``id`` and ``source_data_hash`` columns to a frame of items.
+
+    Args:
+        df: Items as returned by ``get_new_releases``.
+        fields: Fields covered by the source data hash.
+        base_url: Scheme and host relative detail URLs belong to.
+
+    Returns:
+        A copy of ``df`` with the two columns added.
+    """
+    df = df.copy()
+    df["id"] = item_ids(df, base_url)
+    df["source_data_hash"] = source_data_hashes(df, fields)
+    return df
+
+
+class HashIndex:
+    """Mapping of item ID to the source data hash it was last processed with.
+
+    Lookups are O(1) dict accesses; the index is persisted as a two-column
+    zstd-compressed Parquet file.
+    """
+
+    def __init__(self, hashes: Optional[Dict[int, str]] = None):
+        """Initialize the index.
+
+        Args:
+            hashes: Initial mapping of item ID to source data hash.
+        """
+        self._hashes: Dict[int, str] = dict(hashes or {})
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "HashIndex":
+        """Load an index saved with :meth:`save`; empty if the file is missing."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        df = pd.read_parquet(path)
+        return cls(dict(zip(df["id"], df["source_data_hash"])))
+
+    def save(self, path: Union[str, Path]):
+        """Write the index to ``path``, replacing it atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df = pd.DataFrame(
+            {"id": list(self._hashes), "source_data_hash": list(self._hashes.values())}
+        )
+        tmp_path = path.with_name(path.name + ".tmp")
+        df.to_parquet(tmp_path, index=False, compression="zstd")
+        tmp_path.replace(path)
+
+    def is_unchanged(self, item_id: int, source_data_hash: str) -> bool:
+        """Return whether an item was already seen with the same hash."""
+        return self._hashes.get(item_id) == source_data_hash
+
+    def changed_mask(self, df: pd.DataFrame) -> pd.Series:
+        """Return which rows are new or changed since they were indexed.
+
+        Args:
+            df: Items with ``id`` and ``source_data_hash`` columns.
+
+        Returns:
+            Boolean column, True for rows that need processing.
+        """
+        known = df["id"].map(self._hashes)
+        return known.isna() | (known != df["source_data_hash"])
+
+    def update(self, df: pd.DataFrame):
+        """Record the hashes of processed rows.
+
+        Args:
+            df: Items with ``id`` and ``source_data_hash`` columns.
+        """
+        self._hashes.update(zip(df["id"], df["source_data_hash"]))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Hash a scraper output file and report which records changed."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="JSONL output of the JustWatch scraper")
+    parser.add_argument(
+        "--index",
+        default=str(HASH_INDEX_PATH),
+        help="Path of the hash index (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the new or changed records, with id and source_data_hash, "
+        "to this JSONL file.",
+    )
+    args = parser.parse_args(argv)
+
+    df = add_ids_and_hashes(pd.read_json(args.path, lines=True, dtype=False))
+    index = HashIndex.load(args.index)
+    changed = df[index.changed_mask(df)]
+    logger.info(f"{len(changed)} of {len(df)} records are new or changed")
+
+    if args.output:
+        changed.to_json(args.output, orient="records", lines=True, force_ascii=False)
+        logger.info(f"Saved changed records to: {args.output}")
+    index.update(df)
+    index.save(args.index)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    main()
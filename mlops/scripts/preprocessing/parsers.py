@@ -0,0 +1,224 @@
+"""Vectorized parsers turning scraped free-text fields into typed columns.
+
+Every parser takes a whole column and works on its distinct values only:
+the column is factorized, the unique strings are parsed with pandas string
+operations, and the results are broadcast back through the codes. Scraped
+columns repeat the same few hundred spellings ("1h 30min", "7.8/10", "91%")
+across millions of rows, so the regex work is done once per spelling rather
+than once per row.
+"""
+
+import logging
+from typing import Callable, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Date formats tried in order; each one only sees values no earlier one parsed
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%B %Y",
+    "%b %Y",
+    "%Y",
+)
+
+LETTER_GRADES = {
+    "A+": 1.0,
+    "A": 0.95,
+    "A-": 0.9,
+    "B+": 0.85,
+    "B": 0.8,
+    "B-": 0.75,
+    "C+": 0.7,
+    "C": 0.65,
+    "C-": 0.6,
+    "D+": 0.55,
+    "D": 0.5,
+    "D-": 0.45,
+    "F": 0.3,
+}
+
+NUMBER = r"(\d+(?:[.,]\d+)?)"
+
+
+def _memoized(
+    values: Iterable, parse: Callable[[pd.Series], pd.Series], dtype: str
+) -> pd.Series:
+    """Apply ``parse`` to the distinct values of a column only.
+
+    Args:
+        values: Column to parse.
+        parse: Vectorized parser for a Series of unique stripped strings.
+        dtype: dtype of the parsed column.
+
+    Returns:
+        Parsed column, aligned with ``values``; missing values stay missing.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    codes, uniques = pd.factorize(series, sort=False)
+    uniques = pd.Series(uniques, dtype="object").astype("string").str.strip()
+    parsed = parse(uniques).to_numpy(dtype=dtype)
+    # Code -1 marks missing values and picks the appended missing marker
+    missing = np.datetime64("NaT") if np.dtype(dtype).kind == "M" else np.nan
+    result = np.append(parsed, np.array([missing], dtype=dtype))[codes]
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def _to_float(numbers: pd.Series) -> pd.Series:
+    numbers = numbers.str.replace(",", ".", regex=False)
+    return pd.to_numeric(numbers, errors="coerce").astype("float64")
+
+
+def _parse_duration(values: pd.Series) -> pd.Series:
+    parts = values.str.lower().str.extract(
+        r"^(?:(?P<h>\d+(?:\.\d+)?)\s*h(?:ours?|rs?)?)?\s*"
+        r"(?:(?P<m>\d+)\s*m(?:in(?:utes?|s)?)?)?$"
+    )
+    hours = _to_float(parts["h"])
+    minutes = _to_float(parts["m"])
+    total = hours.fillna(0) * 60 + minutes.fillna(0)
+    return total.where(hours.notna() | minutes.notna())
+
+
+def parse_duration(values: Iterable) -> pd.Series:
+    """Parse runtimes such as ``"1h 30min"``, ``"24min"`` or ``"2h"``.
+
+    Args:
+        values: Column of duration strings.
+
+    Returns:
+        Float column of minutes; unparseable values are NaN.
+    """
+    return _memoized(values, _parse_duration, "float64")
+
+
+def _parse_rating(values: pd.Series) -> pd.Series:
+    parts = values.str.extract(rf"^{NUMBER}\s*(?:/\s*{NUMBER})?$")
+    rating = _to_float(parts[0])
+    scale = _to_float(parts[1]).fillna(10)
+    return (rating * 10 / scale).where(rating <= scale)
+
+
+def parse_rating(values: Iterable) -> pd.Series:
+    """Parse ratings such as ``"7.8/10"``, ``"3.5/5"`` or ``"7.8"``.
+
+    Args:
+        values: Column of rating strings. Bare numbers are read as out of 10.
+
+    Returns:
+        Float column of ratings on a 0-10 scale; unparseable values are NaN.
+    """
+    return _memoized(values, _parse_rating, "float64")
+
+
+def _parse_percent(values: pd.Series) -> pd.Series:
+    percent = _to_float(values.str.extract(rf"^{NUMBER}\s*%?$")[0])
+    return percent.where(percent <= 100)
+
+
+def parse_percent(values: Iterable) -> pd.Series:
+    """Parse percentages such as ``"91%"``.
+
+    Args:
+        values: Column of percentage strings.
+
+    Returns:
+        Float column of percentages (0-100); unparseable values are NaN.
+    """
+    return _memoized(values, _parse_percent, "float64")
+
+
+def _parse_date(values: pd.Series) -> pd.Series:
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for date_format in DATE_FORMATS:
+        todo = parsed.isna() & values.notna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(values[todo], format=date_format, errors="coerce")
+    return parsed
+
+
+def parse_date(values: Iterable) -> pd.Series:
+    """Parse release dates written in any of :data:`DATE_FORMATS`.
+
+    Each format is applied to the whole remainder of unparsed values at once.
+
+    Args:
+        values: Column of date strings.
+
+    Returns:
+        ``datetime64[ns]`` column; unparseable values are NaT.
+    """
+    return _memoized(values, _parse_date, "datetime64[ns]")
+
+
+def _parse_review_score(values: pd.Series) -> pd.Series:
+    text = values.str.lower()
+    score = pd.Series(np.nan, index=values.index, dtype="float64")
+
+    # "8/10", "3.5 out of 5", "4/5 stars"
+    fraction = text.str.extract(rf"^{NUMBER}\s*(?:/|out of)\s*{NUMBER}")
+    score = score.fillna(_to_float(fraction[0]) / _to_float(fraction[1]))
+
+    # "4 stars", "3.5 star"
+    stars = text.str.extract(rf"^{NUMBER}\s*stars?$")[0]
+    score = score.fillna(_to_float(stars) / 5)
+
+    # "85%"
+    percent = text.str.extract(rf"^{NUMBER}\s*%$")[0]
+    score = score.fillna(_to_float(percent) / 100)
+
+    # "A-", "b+"
+    score = score.fillna(values.str.upper().map(LETTER_GRADES).astype("float64"))
+
+    # Bare numbers: out of 10 if they fit, else out of 100
+    bare = _to_float(text.str.extract(rf"^{NUMBER}$")[0])
+    score = score.fillna((bare / np.where(bare <= 10, 10, 100)).where(bare <= 100))
+
+    return score.where((score >= 0) & (score <= 1))
+
+
+def parse_review_score(values: Iterable) -> pd.Series:
+    """Parse review scores such as ``"8/10"``, ``"4 stars"`` or ``"A-"``.
+
+    Args:
+        values: Column of score strings as extracted from review pages.
+
+    Returns:
+        Float column of scores normalized to 0-1; unparseable values are NaN.
+    """
+    return _memoized(values, _parse_review_score, "float64")
+
+
+# Typed column produced from each scraped field
+ITEM_FIELD_PARSERS: Dict[str, tuple] = {
+    "duration": ("duration_minutes", parse_duration),
+    "imdbRating": ("imdb_rating", parse_rating),
+    "rottenTomatoesRating": ("rotten_tomatoes_pct", parse_percent),
+    "releaseDate": ("release_date", parse_date),
+}
+
+
+def parse_item_fields(df: pd.DataFrame) -> pd.DataFrame:
+    """Add typed columns parsed from the free-text item fields.
+
+    Args:
+        df: Items, one row each, with the scraper's field names.
+
+    Returns:
+        A copy of ``df`` with the columns of :data:`ITEM_FIELD_PARSERS` added
+        for each source field present.
+    """
+    df = df.copy()
+    for field, (column, parse) in ITEM_FIELD_PARSERS.items():
+        if field in df.columns:
+            df[column] = parse(df[field])
+    return df
@@ -0,0 +1,138 @@
+"""Unit tests for stable item IDs, source data hashes and the hash index."""
+
+import pandas as pd
+
+from mlops.scripts.preprocessing import hashing
+from mlops.scripts.preprocessing.hashing import (
+    HashIndex,
+    add_ids_and_hashes,
+    item_ids,
+    source_data_hashes,
+)
+from mlops.scripts.scraping.relational_export import build_tables, item_id
+
+
+def make_items():
+    return pd.DataFrame(
+        [
+            {
+                "title": "Movie A",
+                "detailUrl": "/us/movie/movie-a",
+                "genres": ["Drama"],
+                "cast": [{"name": "Jane Doe", "character": "Lead"}],
+            },
+            {"title": "Show B", "detailUrl": None, "yearReleased": "2024"},
+        ]
+    )
+
+
+def test_item_ids_are_stable_across_url_spellings():
+    """Test that IDs only depend on the canonical URL."""
+    df = pd.DataFrame(
+        {
+            "title": ["A", "A renamed", "B"],
+            "detailUrl": [
+                "/us/movie/a",
+                "https://www.justwatch.com/us/movie/a/?x=1",
+                "/us/movie/b",
+            ],
+        }
+    )
+    ids = item_ids(df)
+    assert ids[0] == ids[1] != ids[2]
+    assert (ids >= 0).all()
+    assert item_ids(df).equals(ids)
+
+
+def test_item_ids_match_relational_export():
+    """Test that IDs are the item_id of the relational export."""
+    items = make_items().to_dict("records")
+    items[1]["detailUrl"] = None
+    ids = item_ids(make_items())
+    assert ids.tolist() == [item_id(item) for item in items]
+    assert ids.tolist() == build_tables(items)["item"]["item_id"].tolist()
+
+
+def test_item_ids_match_relational_export_for_unusual_urls():
+    """Test URLs outside the string-operation fast path."""
+    df = pd.DataFrame(
+        {
+            "detailUrl": [
+                "HTTPS://Example.com/A/",
+                "us/movie/relative",
+                "/us/./movie/dotted/",
+                "//cdn.example.com/e",
+                "https://www.justwatch.com",
+                "",
+                "/us/movie/relative",
+            ],
+            "title": ["T"] * 7,
+        }
+    )
+    for base_url in ("https://www.justwatch.com", "https://www.justwatch.com/us/"):
+        expected = [item_id(item, base_url) for item in df.to_dict("records")]
+        assert item_ids(df, base_url).tolist() == expected
+
+
+def test_item_ids_fall_back_to_title_and_year():
+    """Test items without a detail URL."""
+    df = pd.DataFrame(
+        {
+            "title": ["Show B", "show b", "Show B"],
+            "detailUrl": [None, None, None],
+            "yearReleased": ["2024", "2024", "2023"],
+        }
+    )
+    ids = item_ids(df)
+    assert ids[0] == ids[1] != ids[2]
+
+
+def test_source_data_hashes_change_with_source_fields():
+    """Test that hashes follow edits to hashed fields only."""
+    df = make_items()
+    before = source_data_hashes(df)
+
+    edited = df.copy()
+    edited.at[0, "genres"] = ["Drama", "Crime"]
+    edited["imdbRating"] = "7.0/10"  # not a hashed field
+    after = source_data_hashes(edited)
+
+    assert after[0] != before[0]
+    assert after[1] == before[1]
+    assert source_data_hashes(df, fields=["title"])[0] != before[0]
+
+
+def test_hash_index_round_trip(tmp_path):
+    """Test changed_mask before and after saving and reloading the index."""
+    df = add_ids_and_hashes(make_items())
+    index = HashIndex()
+    assert index.changed_mask(df).tolist() == [True, True]
+
+    index.update(df)
+    path = tmp_path / "state" / "index.parquet"
+    index.save(path)
+    loaded = HashIndex.load(path)
+    assert len(loaded) == 2
+    assert loaded.changed_mask(df).tolist() == [False, False]
+    assert loaded.is_unchanged(df["id"][0], df["source_data_hash"][0])
+
+    df.at[1, "title"] = "Show B (Extended)"
+    df = add_ids_and_hashes(df.drop(columns=["id", "source_data_hash"]))
+    assert loaded.changed_mask(df).tolist() == [False, True]
+    assert len(HashIndex.load(tmp_path / "missing.parquet")) == 0
+
+
+def test_main_writes_changed_records(tmp_path):
+    """Test the CLI against a scraper output file, run twice."""
+    source = tmp_path / "justwatch_data_20240501_120000.jsonl"
+    make_items().to_json(source, orient="records", lines=True)
+    index_path = tmp_path / "index.parquet"
+    output = tmp_path / "changed.jsonl"
+
+    hashing.main([str(source), "--index", str(index_path), "--output", str(output)])
+    changed = pd.read_json(output, lines=True, dtype=False)
+    assert list(changed["title"]) == ["Movie A", "Show B"]
+    assert {"id", "source_data_hash"} <= set(changed.columns)
+
+    hashing.main([str(source), "--index", str(index_path), "--output", str(output)])
+    assert output.read_text().strip() == ""
@@ -0,0 +1,128 @@
+"""Unit tests for the vectorized field parsers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlops.scripts.preprocessing import benchmark_parsers
+from mlops.scripts.preprocessing.parsers import (
+    parse_date,
+    parse_duration,
+    parse_item_fields,
+    parse_percent,
+    parse_rating,
+    parse_review_score,
+)
+
+
+def assert_floats(result, expected):
+    np.testing.assert_allclose(result.to_numpy(), np.array(expected, dtype=float))
+
+
+def test_parse_duration():
+    """Test runtime spellings, including missing and garbage values."""
+    result = parse_duration(
+        ["1h 30min", "24min", "2h", " 90 min ", "1 hr 5 mins", "", None, "TBA"]
+    )
+    assert_floats(result, [90, 24, 120, 90, 65, np.nan, np.nan, np.nan])
+
+
+def test_parse_rating():
+    """Test ratings with and without a scale, and out-of-scale values."""
+    result = parse_rating(["7.8/10", "3.5/5", "7,8", 6.1, "11/10", "N/A", None])
+    assert_floats(result, [7.8, 7.0, 7.8, 6.1, np.nan, np.nan, np.nan])
+
+
+def test_parse_percent():
+    """Test percentages."""
+    assert_floats(
+        parse_percent(["91%", "100 %", "45", "120%", ""]), [91, 100, 45, np.nan, np.nan]
+    )
+
+
+def test_parse_date_mixed_formats():
+    """Test that each supported format is recognised."""
+    result = parse_date(
+        [
+            "2024-05-01",
+            "May 1, 2024",
+            "01 May 2024",
+            "05/01/2024",
+            "Sep 2023",
+            "2023",
+            "Soon",
+            None,
+        ]
+    )
+    assert result.dtype == "datetime64[ns]"
+    assert list(result[:6]) == [
+        pd.Timestamp("2024-05-01"),
+        pd.Timestamp("2024-05-01"),
+        pd.Timestamp("2024-05-01"),
+        pd.Timestamp("2024-05-01"),
+        pd.Timestamp("2023-09-01"),
+        pd.Timestamp("2023-01-01"),
+    ]
+    assert result[6:].isna().all()
+
+
+def test_parse_review_score():
+    """Test normalizing the score spellings found on review pages."""
+    result = parse_review_score(
+        [
+            "8/10",
+            "4 stars",
+            "A-",
+            "b+",
+            "85%",
+            "3.5 out of 5",
+            "4/5 stars",
+            "7",
+            "72",
+            "12/10",
+            "great",
+            None,
+        ]
+    )
+    assert_floats(
+        result, [0.8, 0.8, 0.9, 0.85, 0.85, 0.7, 0.8, 0.7, 0.72, np.nan, np.nan, np.nan]
+    )
+
+
+def test_results_align_with_input_index():
+    """Test that parsed values map back to rows through the memo."""
+    values = pd.Series(
+        ["24min", None, "24min", "1h"] * 3, index=range(100, 112), name="duration"
+    )
+    result = parse_duration(values)
+    assert result.index.equals(values.index)
+    assert result.name == "duration"
+    assert_floats(result, [24, np.nan, 24, 60] * 3)
+    assert parse_duration([]).empty
+
+
+def test_parse_item_fields():
+    """Test adding typed columns to a frame of scraped items."""
+    df = pd.DataFrame(
+        {
+            "title": ["A", "B"],
+            "duration": ["1h 30min", None],
+            "imdbRating": ["7.8/10", "6/10"],
+            "rottenTomatoesRating": ["91%", None],
+        }
+    )
+    parsed = parse_item_fields(df)
+
+    assert "release_date" not in parsed
+    assert_floats(parsed["duration_minutes"], [90, np.nan])
+    assert_floats(parsed["imdb_rating"], [7.8, 6.0])
+    assert_floats(parsed["rotten_tomatoes_pct"], [91, np.nan])
+    assert "duration_minutes" not in df
+
+
+@pytest.mark.parametrize("rows", [1000])
+def test_benchmark_runs(rows):
+    """Smoke test the benchmark on a small column."""
+    results = benchmark_parsers.run(rows)
+    assert {r["field"] for r in results} >= set(benchmark_parsers.PARSERS)
+    assert all(r["rows"] == rows for r in results)
@@ -0,0 +1,218 @@
+"""Content-addressed on-disk cache for Firecrawl responses."""
+
+import hashlib
+import json
+import logging
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from .storage import DAY, SharedStore, SqliteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {"scrape": DAY, "search": DAY}
+DEFAULT_TTL = DAY
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """Return the content address of a request.
+
+    The key hashes the endpoint and the canonical JSON of the whole payload,
+    so any change to the URL, prompt or schema produces a different key.
+
+    Args:
+        endpoint: Logical endpoint name, e.g. ``"scrape"``.
+        payload: JSON request body.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{endpoint}\n{canonical}".encode()).hexdigest()
+
+
+class ResponseCache(SqliteStore):
+    """Persistent Firecrawl response cache with TTLs and LRU eviction.
+
+    Entries live in a SQLite database in WAL mode, so several processes can
+    share one cache file. Each endpoint has its own TTL; once the stored
+    bodies exceed ``max_bytes`` the least recently used entries are evicted.
+    Hit and miss counters cover the lifetime of this instance.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open or create the cache.
+
+        Args:
+            path: SQLite database file.
+            ttls: Seconds to keep responses, per endpoint. Merged over
+                :data:`DEFAULT_TTLS`.
+            default_ttl: TTL for endpoints missing from ``ttls``.
+            max_bytes: Size cap for the stored (compressed) bodies.
+            clock: Wall clock, injectable for tests.
+        """
+        super().__init__(path, SCHEMA)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+
+    def get(self, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a request, if fresh.
+
+        Args:
+            endpoint: Logical endpoint name.
+            payload: JSON request body.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        key = cache_key(endpoint, payload)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        response: Dict[str, Any],
+        ttl: Optional[float] = None,
+    ):
+        """Store the response to a request.
+
+        Args:
+            endpoint: Logical endpoint name.
+            payload: JSON request body.
+            response: Decoded JSON response.
+            ttl: Seconds to keep this response. Defaults to the endpoint's TTL.
+        """
+        key = cache_key(endpoint, payload)
+        body = zlib.compress(json.dumps(response, separators=(",", ":")).encode())
+        now = self._clock()
+        if ttl is None:
+            ttl = self.ttls.get(endpoint, self.default_ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, created_at, expires_at, last_access, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, now, now + ttl, now, len(body), body),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones over the cap."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "  SELECT key FROM ("
+                "    SELECT key, SUM(size) OVER ("
+                "      ORDER BY last_access DESC, key"
+                "    ) AS running FROM responses"
+                "  ) WHERE running > ?"
+                ")",
+                (self.max_bytes,),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get_or_fetch(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        fetch: Callable[[], Dict[str, Any]],
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda response: True,
+        ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Return the cached response or fetch and cache it.
+
+        Args:
+            endpoint: Logical endpoint name.
+            payload: JSON request body.
+            fetch: Callable performing the request on a miss.
+            cacheable: Predicate deciding whether a fetched response is
+                stored. Use it to keep failed extractions out of the cache.
+            ttl: Seconds to keep a fetched response. Defaults to the
+                endpoint's TTL.
+
+        Returns:
+            The cached or freshly fetched response.
+        """
+        cached = self.get(endpoint, payload)
+        if cached is not None:
+            return cached
+        response = fetch()
+        if cacheable(response):
+            self.put(endpoint, payload, response, ttl)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current size of the cache."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_default_cache = SharedStore(
+    "FIRECRAWL_CACHE_PATH", ResponseCache, "Firecrawl response cache"
+)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, if enabled.
+
+    The cache is enabled by pointing ``FIRECRAWL_CACHE_PATH`` at a database
+    file and is opened on first use.
+
+    Returns:
+        The shared cache, or None if caching is disabled.
+    """
+    return _default_cache.get()
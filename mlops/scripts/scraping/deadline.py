@@ -0,0 +1,106 @@
+"""Deadlines bounding the time spent on an item or a whole run.
+
+A deadline is entered with :func:`deadline_scope` on the thread doing the
+work. Every Firecrawl call made inside the scope caps its timeouts to the
+time left and fails with :class:`DeadlineExceeded` once none is left, so a
+single stuck request cannot hold up an item or a run past its budget.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from .retry import FirecrawlError
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Shortest timeout handed to requests, which rejects 0
+MIN_TIMEOUT = 0.001
+
+
+class DeadlineExceeded(FirecrawlError):
+    """The item or run budget ran out before the call could be made."""
+
+
+class Deadline:
+    """Point in time after which no further calls should be made."""
+
+    def __init__(
+        self,
+        seconds: Optional[float],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Start the deadline.
+
+        Args:
+            seconds: Budget from now on. None means no limit.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self._clock = clock
+        self.expires_at = math.inf if seconds is None else clock() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative; infinite for an unlimited deadline."""
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        """Return whether the budget has run out."""
+        return self.remaining() <= 0
+
+    def check(self, description: str = "call"):
+        """Raise :class:`DeadlineExceeded` if the budget has run out."""
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline exceeded before {description}")
+
+    def cap(self, timeout: Timeout) -> Timeout:
+        """Shorten a requests timeout so it ends by the deadline.
+
+        Args:
+            timeout: Single timeout or (connect, read) pair in seconds.
+
+        Returns:
+            The timeout with every part capped to the time left.
+        """
+        remaining = max(MIN_TIMEOUT, self.remaining())
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def earliest(self, other: Optional["Deadline"]) -> "Deadline":
+        """Return whichever of this deadline and ``other`` expires first."""
+        if other is None or self.expires_at <= other.expires_at:
+            return self
+        return other
+
+
+_local = threading.local()
+
+
+def current_deadline() -> Optional["Deadline"]:
+    """Return the deadline of the innermost scope on this thread, if any."""
+    return getattr(_local, "deadline", None)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Apply a deadline to the Firecrawl calls made on this thread.
+
+    Scopes nest; the innermost scope is bounded by the enclosing ones, so an
+    item budget never outlives the run budget. ``None`` leaves the current
+    deadline in place.
+
+    Args:
+        deadline: Deadline for the calls made inside the scope.
+
+    Yields:
+        The deadline in effect inside the scope.
+    """
+    outer = current_deadline()
+    effective = deadline.earliest(outer) if deadline is not None else outer
+    _local.deadline = effective
+    try:
+        yield effective
+    finally:
+        _local.deadline = outer
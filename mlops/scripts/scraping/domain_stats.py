@@ -0,0 +1,199 @@
+"""Per-domain review yield statistics used to rank review candidates.
+
+Some review sites reliably yield clean reviews from a quick scrape, others
+rarely yield any or take much longer. Every completed review page scrape is
+recorded with the number of reviews it yielded and how long it took. Search
+results are then scraped in order of their domain's expected reviews per
+second, and domains that almost never yield reviews are dropped.
+"""
+
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .storage import DAY, SharedStore, SqliteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 50
+DEFAULT_MAX_AGE = 30 * DAY
+DEFAULT_MIN_SCRAPES = 5
+DEFAULT_MIN_SUCCESS_RATE = 0.1
+
+# Domains without history are assumed to yield one review per scrape, as if
+# that had been seen on two scrapes, so they are tried before weak domains
+PRIOR_REVIEWS_PER_SCRAPE = 1.0
+PRIOR_WEIGHT = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS domain_scrapes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    domain TEXT NOT NULL,
+    reviews INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS domain_scrapes_domain ON domain_scrapes (domain, id);
+"""
+
+
+class DomainStats(SqliteStore):
+    """Persistent record of recent review page scrapes per domain.
+
+    Only the last ``window`` scrapes of a domain from the past ``max_age``
+    seconds count, so the ranking follows sites that change, and domains
+    dropped for a poor record are tried again once it has aged out.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        window: int = DEFAULT_WINDOW,
+        max_age: float = DEFAULT_MAX_AGE,
+        min_scrapes: int = DEFAULT_MIN_SCRAPES,
+        min_success_rate: float = DEFAULT_MIN_SUCCESS_RATE,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open or create the statistics database.
+
+        Args:
+            path: SQLite database file.
+            window: Recent scrapes kept per domain.
+            max_age: Seconds after which a scrape no longer counts.
+            min_scrapes: Scrapes needed before a domain can be dropped.
+            min_success_rate: Share of scrapes yielding reviews below which
+                a domain with enough scrapes is dropped.
+            clock: Wall clock, injectable for tests.
+        """
+        super().__init__(path, SCHEMA)
+        self.window = window
+        self.max_age = max_age
+        self.min_scrapes = min_scrapes
+        self.min_success_rate = min_success_rate
+        self._clock = clock
+
+    def record(self, domain: str, reviews: int, seconds: float):
+        """Record one completed scrape of a review page.
+
+        Args:
+            domain: Domain of the scraped page.
+            reviews: Valid reviews the page yielded.
+            seconds: Time the scrape took.
+        """
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO domain_scrapes (domain, reviews, seconds, scraped_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (domain, reviews, seconds, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM domain_scrapes WHERE domain = ? AND (scraped_at < ? "
+                    "OR id <= (SELECT id FROM domain_scrapes WHERE domain = ? "
+                    "ORDER BY id DESC LIMIT 1 OFFSET ?))",
+                    (domain, now - self.max_age, domain, self.window),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def summaries(self, domains: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Return the recent record of each domain that has one.
+
+        Args:
+            domains: Domains to summarize.
+
+        Returns:
+            Mapping of domain to its ``scrapes``, ``success_rate``,
+            ``reviews_per_scrape`` and ``median_seconds``. Domains without
+            recent scrapes are left out.
+        """
+        domains = sorted(set(domains))
+        if not domains:
+            return {}
+        placeholders = ", ".join("?" * len(domains))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT domain, reviews, seconds FROM domain_scrapes "
+                f"WHERE domain IN ({placeholders}) AND scraped_at >= ?",
+                (*domains, self._clock() - self.max_age),
+            ).fetchall()
+
+        scrapes: Dict[str, List] = {}
+        for domain, reviews, seconds in rows:
+            scrapes.setdefault(domain, []).append((reviews, seconds))
+        return {
+            domain: {
+                "scrapes": len(record),
+                "success_rate": sum(1 for r, _ in record if r > 0) / len(record),
+                "reviews_per_scrape": sum(r for r, _ in record) / len(record),
+                "median_seconds": statistics.median(s for _, s in record),
+            }
+            for domain, record in scrapes.items()
+        }
+
+    def is_unproductive(self, summary: Dict[str, float]) -> bool:
+        """Return whether a domain's record says it is not worth scraping."""
+        return (
+            summary["scrapes"] >= self.min_scrapes
+            and summary["success_rate"] < self.min_success_rate
+        )
+
+    def rank(self, domains: Sequence[str]) -> List[int]:
+        """Order candidate pages by the expected yield of their domains.
+
+        The expected reviews per scrape are smoothed towards
+        ``PRIOR_REVIEWS_PER_SCRAPE``, and divided by the domain's median
+        scrape time. Domains without history are assumed to take the median
+        time of the other candidates.
+
+        Args:
+            domains: Domain of each candidate page, best search rank first.
+
+        Returns:
+            Positions of the candidates worth scraping, highest expected
+            reviews per second first. Ties keep the search rank order and
+            candidates of unproductive domains are left out.
+        """
+        summaries = self.summaries(domains)
+        known_seconds = [s["median_seconds"] for s in summaries.values()]
+        default_seconds = statistics.median(known_seconds) if known_seconds else 1.0
+
+        def expected_yield(domain: str) -> float:
+            summary = summaries.get(domain)
+            if summary is None:
+                return PRIOR_REVIEWS_PER_SCRAPE / max(default_seconds, 1e-3)
+            reviews = (
+                summary["reviews_per_scrape"] * summary["scrapes"]
+                + PRIOR_REVIEWS_PER_SCRAPE * PRIOR_WEIGHT
+            ) / (summary["scrapes"] + PRIOR_WEIGHT)
+            return reviews / max(summary["median_seconds"], 1e-3)
+
+        kept = [
+            position
+            for position, domain in enumerate(domains)
+            if domain not in summaries or not self.is_unproductive(summaries[domain])
+        ]
+        return sorted(kept, key=lambda position: -expected_yield(domains[position]))
+
+
+_default_stats = SharedStore(
+    "REVIEW_DOMAIN_STATS_PATH", DomainStats, "review domain statistics"
+)
+
+
+def get_domain_stats() -> Optional[DomainStats]:
+    """Return the process-wide domain statistics, if enabled.
+
+    The statistics are enabled by pointing ``REVIEW_DOMAIN_STATS_PATH`` at a
+    database file and are opened on first use.
+
+    Returns:
+        The shared statistics, or None if they are disabled.
+    """
+    return _default_stats.get()
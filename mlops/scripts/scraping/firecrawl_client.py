@@ -0,0 +1,295 @@
+"""Firecrawl API client shared by the JustWatch and review scrapers."""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..utils.config_loader import get_secret
+from .deadline import Timeout, current_deadline, deadline_scope
+from .hedging import DEFAULT_MAX_EXTRA, DEFAULT_PERCENTILE, HedgePolicy
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .retry import RetryPolicy, get_retry_policy
+
+logger = logging.getLogger(__name__)
+
+FIRECRAWL_API_URL = "https://api.firecrawl.dev"
+
+# requests' own default; raise it when more workers than this share a client
+DEFAULT_POOL_MAXSIZE = 10
+
+# (connect, read) seconds; scrapes with LLM extraction take tens of seconds
+DEFAULT_TIMEOUT: Tuple[float, float] = (10.0, 180.0)
+
+
+def load_api_key() -> str:
+    """Return the Firecrawl API key.
+
+    ``FIRECRAWL_API_KEY`` is looked up with
+    :func:`~mlops.scripts.utils.config_loader.get_secret`: from the
+    environment, or else from a ``.env`` file at the repository root or in
+    ``mlops/``, or the local secrets file.
+
+    Returns:
+        str: The Firecrawl API key.
+
+    Raises:
+        ValueError: If FIRECRAWL_API_KEY is not set anywhere.
+    """
+    api_key = get_secret("FIRECRAWL_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "FIRECRAWL_API_KEY is not set. Export it or add "
+            "FIRECRAWL_API_KEY=your-api-key to a .env file"
+        )
+    return api_key
+
+
+class FirecrawlClient:
+    """Connection pool, authentication and endpoint helpers for Firecrawl.
+
+    Every call goes through the rate limiter and retry policy, which default
+    to the process-wide ones, and has a connect and read timeout. Calls made
+    inside a :func:`~.deadline.deadline_scope` are also bounded by its
+    deadline. With a hedge policy, slow scrapes and searches are hedged
+    with a duplicate request. The client is thread-safe; one instance shared
+    by all workers keeps their connections warm in a single pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = FIRECRAWL_API_URL,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        session: Optional[requests.Session] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            api_key: Firecrawl API key for authentication.
+            api_url: Base URL of the Firecrawl API.
+            pool_maxsize: Connections kept alive for reuse. Should be at least
+                the number of threads sharing the client.
+            timeout: Default request timeout in seconds, either one value or
+                a (connect, read) pair.
+            rate_limiter: Limiter all calls go through.
+            retry_policy: Retry schedule and budget for all calls.
+            session: Session to send requests with, e.g. a test double.
+                Defaults to a new session with a pooled adapter.
+            hedge_policy: Policy hedging slow idempotent calls. None
+                disables hedging.
+        """
+        self.api_url = api_url.rstrip("/")
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or get_retry_policy()
+        self.hedge_policy = hedge_policy
+
+        if session is None:
+            session = requests.Session()
+            # All retries are left to the retry policy, which honours the
+            # deadline, the rate limiter and the retry budget
+            adapter = HTTPAdapter(max_retries=Retry(total=0), pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.update(
+            {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        )
+        self.session = session
+
+    def url(self, path: str) -> str:
+        """Return the absolute URL of an API path such as ``/v1/scrape``."""
+        return f"{self.api_url}{path}"
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        """Send one request through the rate limiter, without retries.
+
+        Raises:
+            DeadlineExceeded: If the current deadline has already passed.
+        """
+        timeout = timeout or self.timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check(f"{method} {url}")
+        with self.rate_limiter.slot():
+            if deadline is not None:
+                # Waiting for a slot may have used up part of the budget
+                timeout = deadline.cap(timeout)
+            if method == "GET":
+                response = self.session.get(url, timeout=timeout)
+            else:
+                response = self.session.post(url, json=payload, timeout=timeout)
+        self.rate_limiter.record_response(response.status_code)
+        return response
+
+    def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        deadline = current_deadline()
+
+        def send() -> requests.Response:
+            # Hedge threads do not inherit the caller's deadline scope
+            with deadline_scope(deadline):
+                return self.send(method, url, payload, timeout)
+
+        return self.hedge_policy.call(f"{method} {urlsplit(url).path}", send)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+        timeout: Optional[Timeout] = None,
+        hedge: bool = False,
+    ) -> Dict[str, Any]:
+        """Send a request, retrying transient failures.
+
+        Retries stop early when the current deadline leaves no time for the
+        backoff.
+
+        Args:
+            method: HTTP method, ``"GET"`` or ``"POST"``.
+            url: Full endpoint URL.
+            payload: JSON body for POST requests.
+            description: Short label used in retry log messages.
+            timeout: Timeout of each attempt. Defaults to the client's.
+            hedge: Whether attempts may be hedged. Only for idempotent calls.
+
+        Returns:
+            The decoded JSON response.
+
+        Raises:
+            FirecrawlError: If the call failed after retries.
+            DeadlineExceeded: If the current deadline passed before a try.
+        """
+        send = self._send_hedged if hedge and self.hedge_policy else self.send
+        return self.retry_policy.call(
+            lambda: send(method, url, payload, timeout),
+            description=description or f"{method} {url}",
+            deadline=current_deadline(),
+        )
+
+    def scrape(self, payload: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Scrape one page with ``/v1/scrape``."""
+        kwargs.setdefault("hedge", True)
+        return self.request(
+            "POST",
+            self.url("/v1/scrape"),
+            payload,
+            description=f"scrape of {payload.get('url')}",
+            **kwargs,
+        )
+
+    def search(self, payload: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Run a web search with ``/v1/search``."""
+        kwargs.setdefault("hedge", True)
+        return self.request(
+            "POST",
+            self.url("/v1/search"),
+            payload,
+            description=f"search for {payload.get('query')!r}",
+            **kwargs,
+        )
+
+    def start_batch_scrape(self, payload: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Start a batch scrape job with ``/v1/batch/scrape``."""
+        return self.request(
+            "POST",
+            self.url("/v1/batch/scrape"),
+            payload,
+            description=f"batch scrape of {len(payload.get('urls', []))} pages",
+            **kwargs,
+        )
+
+    def batch_scrape_status(
+        self, job_id: str, skip: int = 0, **kwargs
+    ) -> Dict[str, Any]:
+        """Return the status and first results of a batch scrape job.
+
+        Args:
+            job_id: ID returned when the job was started.
+            skip: Number of result documents to leave out, e.g. the ones an
+                earlier poll already returned.
+            **kwargs: Passed on to :meth:`request`.
+        """
+        path = f"/v1/batch/scrape/{job_id}" + (f"?skip={skip}" if skip else "")
+        return self.request("GET", self.url(path), **kwargs)
+
+    def get(self, url: str, **kwargs) -> Dict[str, Any]:
+        """GET an absolute URL returned by the API, e.g. a ``next`` page."""
+        return self.request("GET", url, **kwargs)
+
+    def close(self):
+        """Close the pooled connections and stop the hedge threads."""
+        if self.hedge_policy is not None:
+            self.hedge_policy.shutdown()
+        self.session.close()
+
+
+def _hedge_policy_from_env(pool_maxsize: int) -> Optional[HedgePolicy]:
+    if os.getenv("FIRECRAWL_HEDGE", "false").lower() != "true":
+        return None
+    return HedgePolicy(
+        percentile=float(os.getenv("FIRECRAWL_HEDGE_PERCENTILE", DEFAULT_PERCENTILE)),
+        max_extra=float(os.getenv("FIRECRAWL_HEDGE_MAX_EXTRA", DEFAULT_MAX_EXTRA)),
+        # Room for a primary and a hedge per pooled connection
+        max_workers=2 * pool_maxsize,
+    )
+
+
+_default_client: Optional[FirecrawlClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_firecrawl_client() -> FirecrawlClient:
+    """Return the process-wide Firecrawl client.
+
+    The client is created on first use, with the key from
+    :func:`load_api_key`, ``FIRECRAWL_API_URL`` if set, a pool of
+    ``FIRECRAWL_POOL_MAXSIZE`` connections and the timeouts from
+    ``FIRECRAWL_CONNECT_TIMEOUT`` and ``FIRECRAWL_READ_TIMEOUT``. Setting
+    ``FIRECRAWL_HEDGE=true`` hedges scrapes and searches slower than the
+    ``FIRECRAWL_HEDGE_PERCENTILE`` latency (default 0.95), with at most a
+    ``FIRECRAWL_HEDGE_MAX_EXTRA`` fraction (default 0.05) of extra requests.
+
+    Returns:
+        FirecrawlClient: The shared client instance.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            pool_maxsize = int(
+                os.getenv("FIRECRAWL_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)
+            )
+            _default_client = FirecrawlClient(
+                load_api_key(),
+                api_url=os.getenv("FIRECRAWL_API_URL", FIRECRAWL_API_URL),
+                pool_maxsize=pool_maxsize,
+                timeout=(
+                    float(os.getenv("FIRECRAWL_CONNECT_TIMEOUT", DEFAULT_TIMEOUT[0])),
+                    float(os.getenv("FIRECRAWL_READ_TIMEOUT", DEFAULT_TIMEOUT[1])),
+                ),
+                hedge_policy=_hedge_policy_from_env(pool_maxsize),
+            )
+        return _default_client
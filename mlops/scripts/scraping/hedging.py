@@ -0,0 +1,175 @@
+"""Hedged requests cutting the slow tail of Firecrawl scrapes.
+
+A hedged call sends a request and, if it has not answered once the
+endpoint's recent p95 latency has passed, sends an identical second one.
+Whichever answers first is used and the other is abandoned. Only calls
+slower than the p95 are hedged, and the number of extra requests is capped
+to a fraction of all requests, so normal traffic is not doubled.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PERCENTILE = 0.95
+DEFAULT_MAX_EXTRA = 0.05
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 200
+
+
+class LatencyTracker:
+    """Recent latencies of each endpoint and their percentiles."""
+
+    def __init__(
+        self, window: int = DEFAULT_WINDOW, min_samples: int = DEFAULT_MIN_SAMPLES
+    ):
+        """Initialize the tracker.
+
+        Args:
+            window: Latencies kept per endpoint; older ones are dropped.
+            min_samples: Latencies needed before a percentile is reported.
+        """
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        """Record the latency of one completed request to ``key``."""
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """Return the ``q`` quantile of the recent latencies of ``key``.
+
+        Args:
+            key: Endpoint the latencies were recorded for.
+            q: Quantile between 0 and 1, e.g. 0.95.
+
+        Returns:
+            The latency in seconds, or None while fewer than ``min_samples``
+            were recorded.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+
+class HedgePolicy:
+    """When to send a hedge request and how many of them are allowed."""
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_PERCENTILE,
+        max_extra: float = DEFAULT_MAX_EXTRA,
+        tracker: Optional[LatencyTracker] = None,
+        max_workers: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the policy.
+
+        Args:
+            percentile: Latency quantile after which a call is hedged.
+            max_extra: Hedges allowed as a fraction of all requests sent,
+                e.g. 0.05 for at most 5% extra load.
+            tracker: Latency history hedge delays are taken from.
+            max_workers: Threads available to run requests and hedges.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.tracker = tracker or LatencyTracker()
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Return how long to wait before hedging a call to ``key``, if at all."""
+        return self.tracker.percentile(key, self.percentile)
+
+    def _try_spend_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges >= self.max_extra * self.requests:
+                return False
+            self.hedges += 1
+            self.requests += 1
+            return True
+
+    def _submit(self, key: str, send: Callable[[], T]) -> Future:
+        start = self._clock()
+
+        def record(future: Future):
+            # Abandoned requests still report their latency when they finish,
+            # so the percentile reflects the real tail
+            if not future.cancelled() and future.exception() is None:
+                self.tracker.record(key, self._clock() - start)
+
+        future = self._executor.submit(send)
+        future.add_done_callback(record)
+        return future
+
+    def call(self, key: str, send: Callable[[], T]) -> T:
+        """Run ``send``, hedging it with a second call if it is slow.
+
+        Args:
+            key: Endpoint the call goes to; latencies are tracked per key.
+            send: Idempotent callable performing one request.
+
+        Returns:
+            The result of whichever call succeeded first.
+
+        Raises:
+            Exception: The primary call's error if no call succeeded.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.hedge_delay(key)
+        if delay is None:
+            # Too few latencies yet to tell what is slow
+            start = self._clock()
+            result = send()
+            self.tracker.record(key, self._clock() - start)
+            return result
+
+        primary = self._submit(key, send)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._try_spend_hedge():
+            return primary.result()
+
+        logger.debug("Hedging request to %s after %.1fs", key, delay)
+        hedge = self._submit(key, send)
+        return self._first_success(primary, hedge)
+
+    def _first_success(self, primary: Future, hedge: Future):
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def shutdown(self):
+        """Stop the worker threads once running requests have finished."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,165 @@
+"""Persistent progress journal for resumable scraping runs."""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .storage import SqliteStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    listing TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, kind, key)
+);
+"""
+
+DONE = "done"
+FAILED = "failed"
+
+
+class RunJournal(SqliteStore):
+    """SQLite journal recording the listing and completed work of each run.
+
+    A run stores the listing snapshot it worked from and one task row per
+    detail or review fetch, keyed by ``(kind, key)``. Resuming a run reuses
+    the listing snapshot and the results of tasks marked done, so only
+    failed or missing tasks cost API calls again.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open or create the journal.
+
+        Args:
+            path: SQLite database file.
+        """
+        super().__init__(path, SCHEMA)
+
+    def start_run(self) -> int:
+        """Start a new run.
+
+        Returns:
+            The new run ID.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at) VALUES (?)", (time.time(),)
+            )
+        logger.info(f"Started run {cursor.lastrowid} in journal {self.path}")
+        return cursor.lastrowid
+
+    def latest_unfinished_run(self) -> Optional[int]:
+        """Return the most recent run that never finished, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM runs WHERE finished_at IS NULL "
+                "ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def finish_run(self, run_id: int):
+        """Mark a run as finished so it is no longer resumed."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                (time.time(), run_id),
+            )
+
+    def save_listing(self, run_id: int, items: List[Dict]):
+        """Store the listing snapshot a run works from."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET listing = ? WHERE run_id = ?",
+                (json.dumps(items), run_id),
+            )
+
+    def load_listing(self, run_id: int) -> Optional[List[Dict]]:
+        """Return the listing snapshot of a run, or None if none was stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT listing FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def record_done(self, run_id: int, kind: str, key: str, result: Any):
+        """Record a completed task and its JSON-serializable result."""
+        self._record(run_id, kind, key, DONE, json.dumps(result), None)
+
+    def record_failed(self, run_id: int, kind: str, key: str, error: str):
+        """Record a failed task so that a resumed run retries it."""
+        self._record(run_id, kind, key, FAILED, None, error)
+
+    def _record(self, run_id, kind, key, status, result, error):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks "
+                "(run_id, kind, key, status, result, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, kind, key, status, result, error, time.time()),
+            )
+
+    def completed(self, run_id: int, kind: str) -> Dict[str, Any]:
+        """Return the results of a run's completed tasks of one kind.
+
+        Returns:
+            Mapping of task key to stored result.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, result FROM tasks "
+                "WHERE run_id = ? AND kind = ? AND status = ?",
+                (run_id, kind, DONE),
+            ).fetchall()
+        return {key: json.loads(result) for key, result in rows}
+
+    def counts(self, run_id: int) -> Dict[str, int]:
+        """Return the number of tasks per status for a run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status",
+                (run_id,),
+            ).fetchall()
+        return dict(rows)
+
+    def run_task(self, run_id: int, kind: str, key: str, fetch: Callable[[], Any]):
+        """Return a task's journaled result, or run and journal it.
+
+        Args:
+            run_id: Run the task belongs to.
+            kind: Task kind, e.g. ``"review"``.
+            key: Task key, unique within the kind.
+            fetch: Callable producing the result.
+
+        Returns:
+            The stored or freshly fetched result.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM tasks "
+                "WHERE run_id = ? AND kind = ? AND key = ? AND status = ?",
+                (run_id, kind, key, DONE),
+            ).fetchone()
+        if row:
+            return json.loads(row[0])
+        try:
+            result = fetch()
+        except Exception as e:
+            self.record_failed(run_id, kind, key, str(e))
+            raise
+        self.record_done(run_id, kind, key, result)
+        return result
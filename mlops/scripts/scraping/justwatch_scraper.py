@@ -1,118 +1,464 @@
 """Script to scrape and collect movie and TV show data from JustWatch."""
 
+import argparse
 import json
 import logging
 import os
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
-from urllib.parse import urljoin
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 import pandas as pd
-import requests
-from dotenv import load_dotenv
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+from ..utils.config_loader import get_secret
+from .cache import ResponseCache, get_response_cache
+from .deadline import Deadline, DeadlineExceeded, deadline_scope
+from .firecrawl_client import (
+    DEFAULT_POOL_MAXSIZE,
+    FIRECRAWL_API_URL,
+    FirecrawlClient,
+    get_firecrawl_client,
+)
+from .journal import RunJournal
+from .known_items import (
+    JUSTWATCH_URL,
+    LISTING_HASH_FIELD,
+    SCRAPED_AT_FIELD,
+    KnownItemsIndex,
+    canonical_url,
+    listing_hash,
+)
+from .logging_setup import payload_summary, setup_logging
+from .parquet_writer import write_parquet_dataset
+from .rate_limiter import RateLimiter
+from .relational_export import build_tables, write_tables
+from .retry import RetryPolicy, get_retry_policy
+from .sinks import JsonlSink, jsonl_to_json, read_jsonl
 
-def load_env_vars():
-    """Load environment variables from .env file in project root.
+logger = logging.getLogger(__name__)
 
-    Returns:
-        str: The Firecrawl API key from environment variables.
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+JOURNAL_PATH = DATA_DIR / "state" / "run_journal.sqlite"
+
+# Enhanced genre extraction by looking for specific HTML elements
+DETAIL_PROMPT = (
+    "Extract detailed information about this movie/TV show. "
+    "Include:\n"
+    "- Title\n"
+    "- Content type (movie/TV show)\n"
+    "- All available streaming platforms\n"
+    "- Release date\n"
+    "- Genres(CRITICAL: Look for genre tags in these locations:\n"
+    "  1. Genre section/tags near the top of the page\n"
+    "  2. Genre links in the movie/show details\n"
+    "  3. Genre information in the metadata section\n"
+    "  4. Any additional genre classifications in the page)\n"
+    "- Rating (IMDb, Rotten Tomatoes if available)\n"
+    "- Full synopsis/description\n"
+    "- Cast members with character names\n"
+    "- Director(s)\n"
+    "- Duration/runtime\n"
+    "- Maturity rating\n"
+    "- Original language\n"
+    "- Production country\n\n"
+    "For genres specifically:\n"
+    "1. Check all sections of the page\n"
+    "2. Include both primary and secondary genre classifications\n"
+    "3. Look for genre-related keywords in the synopsis\n"
+    "4. Check for genre tags in recommendations section"
+)
+
+DETAIL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "contentType": {"type": "string"},
+        "streamingPlatforms": {
+            "type": "array",
+            "items": {"type": "string"},
+        },
+        "releaseDate": {"type": "string"},
+        "genres": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Genre",
+        },
+        "imdbRating": {"type": "string"},
+        "rottenTomatoesRating": {"type": "string"},
+        "synopsis": {"type": "string"},
+        "cast": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "character": {"type": "string"},
+                },
+            },
+        },
+        "directors": {
+            "type": "array",
+            "items": {"type": "string"},
+        },
+        "duration": {"type": "string"},
+        "maturityRating": {"type": "string"},
+        "language": {"type": "string"},
+        "country": {"type": "string"},
+        "yearReleased": {"type": "string"},
+    },
+    "required": ["title", "genres"],
+}
+
+DETAIL_SCRAPE_OPTIONS = {
+    "formats": ["json"],
+    "waitFor": 5000,
+    "jsonOptions": {"prompt": DETAIL_PROMPT, "schema": DETAIL_SCHEMA},
+}
+
+# Fields that differ between JustWatch regions; everything else is shared
+REGION_FIELDS = ("streamingPlatforms", "releaseDate")
+
+REGION_SCRAPE_OPTIONS = {
+    "formats": ["json"],
+    "waitFor": 5000,
+    "jsonOptions": {
+        "prompt": (
+            "Extract the streaming platforms this movie/TV show is available "
+            "on and its release date in the country of this page."
+        ),
+        "schema": {
+            "type": "object",
+            "properties": {
+                "streamingPlatforms": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                },
+                "releaseDate": {"type": "string"},
+            },
+        },
+    },
+}
+
+
+def _detail_payload(url: str, options: Dict = DETAIL_SCRAPE_OPTIONS) -> Dict:
+    """Return the ``/v1/scrape`` request body for a detail page."""
+    return {"url": url, **options}
+
+
+def _has_detail_json(result: Dict) -> bool:
+    """Return whether a scrape response carries extracted detail data."""
+    return bool(result.get("success") and (result.get("data") or {}).get("json"))
+
+
+DEFAULT_COUNTRY = "us"
+DEFAULT_LISTING = "new"
+JUSTWATCH_BASE_URL = f"{JUSTWATCH_URL}/{DEFAULT_COUNTRY}"
 
-    Raises:
-        FileNotFoundError: If .env file is not found.
-        ValueError: If FIRECRAWL_API_KEY is not set in .env file.
-    """
-    # Get the project root directory (3 levels up from this script)
-    project_root = Path(__file__).resolve().parent.parent.parent
-    env_path = project_root / ".env"
-
-    if not env_path.exists():
-        msg = (
-            f".env file not found at {env_path}. "
-            "Please create one with FIRECRAWL_API_KEY=your-api-key"
-        )
-        raise FileNotFoundError(msg)
 
-    load_dotenv(env_path)
+def _title_key(item: Dict, country: str) -> str:
+    """Return a key identifying a listing item's title across regions.
+
+    Detail URLs only differ between regions in their country prefix, e.g.
+    ``/us/movie/dune`` and ``/uk/movie/dune``.
+    """
+    if not item.get("detailUrl"):
+        return f"title:{item.get('title', '').lower()}"
+    parts = urlsplit(item["detailUrl"]).path.strip("/").split("/")
+    if parts[0].lower() == country:
+        parts = parts[1:]
+    return "/".join(parts).lower()
 
-    api_key = os.getenv("FIRECRAWL_API_KEY")
-    if not api_key:
-        raise ValueError("FIRECRAWL_API_KEY not found in environment variables")
 
-    return api_key
+def dedupe_listing_items(pages: List[List[Dict]], base_url: str) -> List[Dict]:
+    """Merge the items of several listing pages of one region.
 
+    Items are keyed by canonical detail URL, or by title if they have none.
+    The first occurrence of a title is kept, with fields it lacks filled in
+    from later occurrences.
 
-def setup_logging():
-    """Set up logging configuration with file and console handlers.
+    Args:
+        pages: Listing items per page, in priority order.
+        base_url: JustWatch base URL of the region.
 
     Returns:
-        logging.Logger: Configured logger instance.
+        The deduplicated items, in order of first occurrence.
     """
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    merged: Dict[str, Dict] = {}
+    for items in pages:
+        for item in items:
+            if item.get("detailUrl"):
+                key = canonical_url(urljoin(base_url, item["detailUrl"]))
+            else:
+                key = f"title:{item.get('title', '').lower()}"
+            if key not in merged:
+                merged[key] = dict(item)
+                continue
+            kept = merged[key]
+            for field, value in item.items():
+                if not kept.get(field):
+                    kept[field] = value
+    return list(merged.values())
+
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = log_dir / f"scraper_{timestamp}.log"
+def merge_regional_listings(listings: Dict[str, List[Dict]]) -> List[Dict]:
+    """Merge the listings of several regions into one list of titles.
 
-    # File handler setup
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-    file_fmt = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    file_formatter = logging.Formatter(file_fmt)
-    file_handler.setFormatter(file_formatter)
+    Each title appears once, with the listing fields of the first region
+    that lists it and a ``regions`` mapping of country code to that region's
+    detail URL, streaming platforms and release date.
 
-    # Console handler setup
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_fmt = "%(levelname)s: %(message)s"
-    console_formatter = logging.Formatter(console_fmt)
-    console_handler.setFormatter(console_formatter)
+    Args:
+        listings: Listing items per country code, in priority order, with
+            absolute detail URLs.
 
-    # Root logger setup
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    Returns:
+        The deduplicated titles.
+    """
+    merged: Dict[str, Dict] = {}
+    for country, items in listings.items():
+        for item in items:
+            key = _title_key(item, country)
+            if key not in merged:
+                merged[key] = {**item, "regions": {}}
+            merged[key]["regions"][country] = {
+                field: item[field]
+                for field in ("detailUrl",) + REGION_FIELDS
+                if field in item
+            }
+    return list(merged.values())
 
-    return logger
 
+def _in_listing_order(merged: Iterable[Tuple[int, Dict]]) -> Iterator[Tuple[int, Dict]]:
+    """Reorder (listing index, item) pairs into listing order.
 
-logger = setup_logging()
+    Items are held back only until every item before them has arrived.
+    """
+    held = {}
+    next_idx = 0
+    for idx, item in merged:
+        held[idx] = item
+        while next_idx in held:
+            yield next_idx, held.pop(next_idx)
+            next_idx += 1
 
 
 class JustWatchScraper:
     """Scraper class for extracting movie and TV show data from JustWatch."""
 
-    def __init__(self, api_key: str, test_mode: bool = False, max_retries: int = 3):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        test_mode: bool = False,
+        max_retries: int = 3,
+        max_workers: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        use_batch_scrape: bool = False,
+        batch_poll_interval: float = 2.0,
+        batch_timeout: float = 900.0,
+        api_url: str = FIRECRAWL_API_URL,
+        journal: Optional[RunJournal] = None,
+        run_id: Optional[int] = None,
+        cache: Optional[ResponseCache] = None,
+        known_items: Optional[KnownItemsIndex] = None,
+        countries: Optional[List[str]] = None,
+        listing_paths: Optional[List[str]] = None,
+        listing_scrolls: int = 0,
+        client: Optional[FirecrawlClient] = None,
+        item_budget: Optional[float] = None,
+        run_budget: Optional[float] = None,
+    ):
         """Initialize the JustWatch scraper.
 
         Args:
-            api_key: Firecrawl API key for authentication.
+            api_key: Firecrawl API key for a client of this scraper's own.
+                Without it, and without ``client``, the process-wide client
+                shared with the review scraper is used.
             test_mode: If True, only process 2 items for testing.
-            max_retries: Maximum number of retry attempts for failed requests.
+            max_retries: Maximum number of retries of a failed Firecrawl call
+                made with a client of this scraper's own, unless
+                ``retry_policy`` is given.
+            max_workers: Number of detail pages fetched concurrently. 1 keeps
+                the sequential behaviour.
+            rate_limiter: Limiter all Firecrawl calls go through. Defaults to
+                the process-wide limiter shared with the review scraper.
+            retry_policy: Retry schedule and budget for Firecrawl calls.
+                Defaults to the process-wide policy, or for a client of this
+                scraper's own to ``max_retries`` retries drawing on its budget.
+            use_batch_scrape: If True, scrape all detail pages in one Firecrawl
+                batch scrape job instead of one request per page.
+            batch_poll_interval: Seconds between batch job status polls.
+            batch_timeout: Seconds to wait for a batch job before giving up on
+                the pages it has not returned yet.
+            api_url: Base URL of the Firecrawl API.
+            journal: Progress journal recording the listing and every detail
+                fetch. If ``run_id`` already has journaled work, the listing
+                snapshot and completed details are reused instead of fetched.
+            run_id: Journal run to record into or resume. Required with
+                ``journal``.
+            cache: Response cache for detail page scrapes. Defaults to the
+                process-wide cache, which is disabled unless
+                ``FIRECRAWL_CACHE_PATH`` is set.
+            known_items: Titles scraped by earlier runs. Listing items whose
+                detail URL and listing fields match a known title reuse its
+                stored record instead of fetching the detail page.
+            countries: JustWatch country codes to scrape, in priority order.
+                Their listings are scraped concurrently and titles listed in
+                several regions are fetched once; each item then carries a
+                ``regions`` mapping with the per-country platforms and release
+                date. Defaults to the US only.
+            listing_paths: JustWatch listings to discover titles from, as
+                paths below the country, e.g. ``"upcoming"`` or
+                ``"provider/netflix/new"``. All are scraped concurrently and
+                titles found in several are fetched once. Defaults to
+                ``["new"]``.
+            listing_scrolls: Times each listing page is scrolled before
+                extraction, to load titles beyond the first render.
+            client: Firecrawl client to send all calls with. ``api_url``,
+                ``max_retries``, ``rate_limiter`` and ``retry_policy`` only
+                apply to a client created from ``api_key``.
+            item_budget: Seconds one item's detail and region fetches may
+                take in total. An item that runs out keeps its listing info.
+            run_budget: Seconds a call to :meth:`iter_new_releases` may spend
+                on Firecrawl calls. Once it runs out, in-flight calls are cut
+                short, no further items are fetched, the remaining items are
+                yielded with their listing info only and ``cut_short`` is set.
         """
-        self.api_key = api_key
-        self.base_url = "https://www.justwatch.com/us"
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        self.countries = [c.lower() for c in countries or [DEFAULT_COUNTRY]]
+        self.base_url = f"{JUSTWATCH_URL}/{self.countries[0]}"
+        self.listing_paths = listing_paths or [DEFAULT_LISTING]
+        self.listing_scrolls = listing_scrolls
         self.test_mode = test_mode
+        self.max_workers = max(1, max_workers)
+        self.use_batch_scrape = use_batch_scrape
+        self.batch_poll_interval = batch_poll_interval
+        self.batch_timeout = batch_timeout
+        if journal is not None and run_id is None:
+            raise ValueError("run_id is required when a journal is given")
+        self.journal = journal
+        self.run_id = run_id
+        self.cache = cache if cache is not None else get_response_cache()
+        self.known_items = known_items
 
-        # Setup session with retries
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+        if client is None and api_key is None:
+            client = get_firecrawl_client()
+        elif client is None:
+            # Sized so every worker gets a pooled connection
+            client = FirecrawlClient(
+                api_key,
+                api_url=api_url,
+                pool_maxsize=max(self.max_workers, DEFAULT_POOL_MAXSIZE),
+                rate_limiter=rate_limiter,
+                retry_policy=retry_policy
+                or RetryPolicy(
+                    max_attempts=max_retries + 1, budget=get_retry_policy().budget
+                ),
+            )
+        if client.pool_maxsize < self.max_workers:
+            logger.warning(
+                f"{self.max_workers} workers share {client.pool_maxsize} pooled "
+                "connections; raise FIRECRAWL_POOL_MAXSIZE to reuse them all"
+            )
+        self.client = client
+        self.item_budget = item_budget
+        self.run_budget = run_budget
+        self._run_deadline: Optional[Deadline] = None
+        self.cut_short = False
+
+    def _scrape(self, payload: Dict) -> Dict:
+        """Send a request to the ``/v1/scrape`` endpoint.
+
+        Args:
+            payload: JSON body for the endpoint.
+
+        Returns:
+            The decoded JSON response.
+        """
+        with deadline_scope(self._run_deadline):
+            return self.client.scrape(payload)
+
+    def _scrape_detail(self, url: str, options: Dict = DETAIL_SCRAPE_OPTIONS) -> Dict:
+        """Scrape a detail page, answering from the response cache if possible.
+
+        Only responses with extracted data are cached, so failed extractions
+        are retried on the next run.
+
+        Args:
+            url: URL of the content detail page.
+            options: Scrape options, defaulting to the full detail extraction.
+
+        Returns:
+            The decoded JSON response.
+        """
+        payload = _detail_payload(url, options)
+        if self.cache is None:
+            return self._scrape(payload)
+        return self.cache.get_or_fetch(
+            "scrape", payload, lambda: self._scrape(payload), _has_detail_json
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+
+    def _iter_cached_details(self, urls: List[str]) -> Iterator[Tuple[str, Dict]]:
+        """Yield detail pages found in the response cache.
+
+        Args:
+            urls: Absolute detail page URLs.
+
+        Yields:
+            Tuples of (URL, extracted data) for cached pages.
+
+        Returns:
+            The URLs that still have to be scraped.
+        """
+        if self.cache is None:
+            return urls
+        missing = []
+        for url in urls:
+            cached = self.cache.get("scrape", _detail_payload(url))
+            if cached is None:
+                missing.append(url)
+            else:
+                yield url, cached["data"]["json"]
+        return missing
+
+    def _cache_batch_document(self, url: str, detailed_info: Dict):
+        """Store a page returned by a batch job as a single-page scrape."""
+        if self.cache is not None and detailed_info:
+            self.cache.put(
+                "scrape",
+                _detail_payload(url),
+                {"success": True, "data": {"json": detailed_info}},
+            )
+
+    def _check_detail(self, extracted_data: Dict) -> Dict:
+        """Log and sanity-check the data extracted from a detail page.
+
+        Args:
+            extracted_data: Data extracted by Firecrawl from a detail page.
+
+        Returns:
+            The same data, unchanged.
+        """
+        # Serializing the whole extraction is only worth it if it is written
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Extracted data for %s:\n%s",
+                extracted_data.get("title", "Unknown"),
+                json.dumps(extracted_data, indent=2),
+            )
+
+        # Validate genre extraction
+        if not extracted_data.get("genres"):
+            title = extracted_data.get("title", "Unknown")
+            logger.warning(
+                f"No genres found for {title}. " "Attempting secondary extraction..."
+            )
+            # Could implement additional genre extraction methods here
+
+        return extracted_data
 
     def _get_detailed_content(self, url: str) -> Dict:
         """Get detailed information about a specific content item.
@@ -124,242 +470,686 @@ class JustWatchScraper:
             Dict containing detailed information about the content item.
         """
         try:
-            # Enhanced genre extraction by looking for specific HTML elements
-            prompt = (
-                "Extract detailed information about this movie/TV show. "
-                "Include:\n"
-                "- Title\n"
-                "- Content type (movie/TV show)\n"
-                "- All available streaming platforms\n"
-                "- Release date\n"
-                "- Genres(CRITICAL: Look for genre tags in these locations:\n"
-                "  1. Genre section/tags near the top of the page\n"
-                "  2. Genre links in the movie/show details\n"
-                "  3. Genre information in the metadata section\n"
-                "  4. Any additional genre classifications in the page)\n"
-                "- Rating (IMDb, Rotten Tomatoes if available)\n"
-                "- Full synopsis/description\n"
-                "- Cast members with character names\n"
-                "- Director(s)\n"
-                "- Duration/runtime\n"
-                "- Maturity rating\n"
-                "- Original language\n"
-                "- Production country\n\n"
-                "For genres specifically:\n"
-                "1. Check all sections of the page\n"
-                "2. Include both primary and secondary genre classifications\n"
-                "3. Look for genre-related keywords in the synopsis\n"
-                "4. Check for genre tags in recommendations section"
-            )
+            result = self._scrape_detail(url)
 
-            response = self.session.post(
-                "https://api.firecrawl.dev/v1/scrape",
-                headers=self.headers,
-                json={
-                    "url": url,
-                    "formats": ["json"],
-                    "waitFor": 5000,
-                    "jsonOptions": {
-                        "prompt": prompt,
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "title": {"type": "string"},
-                                "contentType": {"type": "string"},
-                                "streamingPlatforms": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                },
-                                "releaseDate": {"type": "string"},
-                                "genres": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "Genre",
-                                },
-                                "imdbRating": {"type": "string"},
-                                "rottenTomatoesRating": {"type": "string"},
-                                "synopsis": {"type": "string"},
-                                "cast": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "name": {"type": "string"},
-                                            "character": {"type": "string"},
-                                        },
-                                    },
-                                },
-                                "directors": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                },
-                                "duration": {"type": "string"},
-                                "maturityRating": {"type": "string"},
-                                "language": {"type": "string"},
-                                "country": {"type": "string"},
-                                "yearReleased": {"type": "string"},
-                            },
-                            "required": ["title", "genres"],
-                        },
-                    },
-                },
-            )
-
-            result = response.json()
-            if result.get("success") and result.get("data", {}).get("json"):
-                extracted_data = result["data"]["json"]
-                debug_msg = (
-                    f"Extracted data for "
-                    f"{extracted_data.get('title', 'Unknown')}:"
-                    f"\n{json.dumps(extracted_data, indent=2)}"
-                )
-                logger.debug(debug_msg)
-
-                # Validate genre extraction
-                if not extracted_data.get("genres"):
-                    title = extracted_data.get("title", "Unknown")
-                    logger.warning(
-                        f"No genres found for {title}. "
-                        "Attempting secondary extraction..."
-                    )
-                    # Could implement additional genre extraction methods here
-
-                return extracted_data
+            if _has_detail_json(result):
+                return self._check_detail(result["data"]["json"])
 
             logger.warning(f"No data extracted from {url}")
             return {}
 
+        except DeadlineExceeded as e:
+            logger.warning(f"Gave up on detailed content for {url}: {e}")
+            return {}
+
         except Exception as e:
             error_msg = "Error getting detailed content for " f"{url}: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return {}
 
-    def get_new_releases(self) -> List[Dict]:
-        """Get list of new releases from JustWatch.
+    def _resolve_detail_url(self, item: Dict) -> str:
+        """Return the absolute detail page URL of a listing item."""
+        return (
+            item["detailUrl"]
+            if item["detailUrl"].startswith("http")
+            else urljoin(self.base_url, item["detailUrl"])
+        )
+
+    def _process_item(self, idx: int, total: int, item: Dict) -> Dict:
+        """Fetch details for one listing item and merge them into it.
+
+        Args:
+            idx: 1-based position of the item in the listing.
+            total: Number of items being processed.
+            item: Listing item as extracted from the new releases page.
 
         Returns:
-            List of dictionaries containing movie/show information.
+            The listing item merged with its detailed information, or the
+            listing item alone if no details could be fetched.
+        """
+        item_deadline = Deadline(self.item_budget) if self.item_budget else None
+        with deadline_scope(item_deadline):
+            logger.info(f"Processing item {idx}/{total}: " f"{item['title']}")
+            if "detailUrl" not in item:
+                logger.warning("No detail URL found for " f"{item['title']}")
+                return item
+
+            detail_url = self._resolve_detail_url(item)
+            logger.debug("Fetching details from: %s", detail_url)
+            detailed_info = self._get_detailed_content(detail_url)
+            if not detailed_info:
+                msg = (
+                    f"Could not get detailed info for "
+                    f"{item['title']}, using basic info only"
+                )
+                logger.warning(msg)
+                return item
+
+            return self._merge_detail(item, detailed_info)
+
+    def _merge_detail(self, item: Dict, detailed_info: Dict) -> Dict:
+        """Merge detail page data over a listing item."""
+        logger.info(f"Successfully processed {item['title']}")
+        merged = {
+            **item,
+            **detailed_info,
+            LISTING_HASH_FIELD: listing_hash(item),
+            SCRAPED_AT_FIELD: time.time(),
+        }
+        if "regions" in item:
+            merged["regions"] = self._complete_regions(item, detailed_info)
+        return merged
+
+    def _get_region_info(self, url: str) -> Dict:
+        """Extract only the region-specific fields from a detail page.
+
+        Args:
+            url: URL of the content detail page in one region.
+
+        Returns:
+            Dict with the region's streaming platforms and release date, or
+            empty if they could not be extracted.
         """
         try:
-            logger.info("Starting new releases extraction")
-            prompt = (
-                "Extract information about all movies and TV shows listed on "
-                "this page. For each item include:\n"
-                "- Title\n"
-                "- Content type (movie/TV show)\n"
-                "- Streaming platforms where it's available\n"
-                "- Release date or episode information\n"
-                "- The URL to its detail page\n"
-                "- Any genre information visible on the main page"
+            result = self._scrape_detail(url, REGION_SCRAPE_OPTIONS)
+        except Exception as e:
+            logger.error(f"Error getting region info for {url}: {str(e)}")
+            return {}
+        if not _has_detail_json(result):
+            logger.warning(f"No region info extracted from {url}")
+            return {}
+        return result["data"]["json"]
+
+    def _complete_regions(self, item: Dict, detailed_info: Dict) -> Dict[str, Dict]:
+        """Fill in the region-specific fields of every region of a title.
+
+        The region the detail page was fetched from takes them from the
+        detail data. Other regions keep what their listing showed, and only
+        regions whose listing lacked a field get a region-only extraction of
+        their own detail page.
+
+        Args:
+            item: Listing item with a ``regions`` mapping.
+            detailed_info: Detail data fetched from ``item["detailUrl"]``.
+
+        Returns:
+            The completed ``regions`` mapping.
+        """
+        regions = {}
+        for country, region in item["regions"].items():
+            region = dict(region)
+            if region.get("detailUrl") == item.get("detailUrl"):
+                region.update(
+                    {f: detailed_info[f] for f in REGION_FIELDS if f in detailed_info}
+                )
+            elif region.get("detailUrl") and not all(
+                region.get(f) for f in REGION_FIELDS
+            ):
+                fetched = self._get_region_info(region["detailUrl"])
+                for field in REGION_FIELDS:
+                    if not region.get(field) and field in fetched:
+                        region[field] = fetched[field]
+            regions[country] = region
+        return regions
+
+    def _iter_details_sequentially(
+        self, items: List[Dict]
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Fetch details for listing items one at a time, in listing order."""
+        total = len(items)
+        for idx, item in enumerate(items):
+            if self._run_expired(total - idx):
+                yield from enumerate(items[idx:], start=idx)
+                return
+            yield idx, self._process_item(idx + 1, total, item)
+
+    def _iter_details(self, items: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """Fetch details for listing items, yielding each as soon as it is done.
+
+        With ``max_workers > 1`` detail pages are fetched on a bounded thread
+        pool so that the slow page renders overlap. At most two fetches per
+        worker are queued at a time, so unconsumed results stay bounded.
+        Once the run deadline has passed no further items are started; the
+        items already in progress are still yielded, and the rest are yielded
+        last with their listing info only.
+
+        Args:
+            items: Listing items as extracted from the new releases page.
+
+        Yields:
+            Tuples of (0-based listing index, merged item) in completion order.
+        """
+        total = len(items)
+        if self.max_workers == 1 or total <= 1:
+            yield from self._iter_details_sequentially(items)
+            return
+
+        workers = min(self.max_workers, total)
+        logger.info(f"Fetching details with {workers} concurrent workers")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detail")
+        queued = deque(enumerate(items))
+        futures = {}
+        skipped: List[Tuple[int, Dict]] = []
+
+        def submit_next():
+            if not queued:
+                return
+            if self._run_expired(len(queued)):
+                skipped.extend(queued)
+                queued.clear()
+                return
+            idx, item = queued.popleft()
+            future = executor.submit(self._process_item, idx + 1, total, item)
+            futures[future] = idx
+
+        try:
+            for _ in range(2 * workers):
+                submit_next()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = futures.pop(future)
+                    submit_next()
+                    yield idx, future.result()
+            yield from skipped
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_expired(self, remaining: int) -> bool:
+        """Return whether the run deadline has passed, logging skipped items.
+
+        Sets ``cut_short`` if it has.
+
+        Args:
+            remaining: Number of items that will not be fetched if it has.
+        """
+        if self._run_deadline is None or not self._run_deadline.expired():
+            return False
+        logger.warning(
+            f"Run deadline reached, keeping {remaining} remaining items "
+            "with basic info only"
+        )
+        self.cut_short = True
+        return True
+
+    def _iter_batch_documents(self, status: Dict) -> Iterator[Dict]:
+        """Yield the documents of a batch job status, following pagination."""
+        page = status
+        while True:
+            yield from page.get("data") or []
+            if not page.get("next"):
+                return
+            with deadline_scope(self._run_deadline):
+                page = self.client.get(page["next"])
+
+    def _iter_batch_details(self, urls: List[str]) -> Iterator[Tuple[str, Dict]]:
+        """Scrape detail pages in one Firecrawl batch job.
+
+        Starts a batch scrape job for all ``urls`` and polls it, yielding each
+        page as soon as the job reports it, until the job completes, fails or
+        ``batch_timeout`` or the run deadline runs out. Each poll skips the
+        documents earlier polls returned, so every page is downloaded once.
+
+        Args:
+            urls: Absolute detail page URLs.
+
+        Yields:
+            Tuples of (source URL, extracted data). The data is empty if the
+            page could not be extracted.
+        """
+        urls = yield from self._iter_cached_details(urls)
+        if not urls:
+            return
+
+        with deadline_scope(self._run_deadline):
+            job = self.client.start_batch_scrape(
+                {"urls": urls, **DETAIL_SCRAPE_OPTIONS}
+            )
+        if not job.get("success") or not job.get("id"):
+            logger.warning("Batch scrape job was not started: %s", payload_summary(job))
+            return
+
+        logger.info(f"Started batch scrape job {job['id']} for {len(urls)} pages")
+        deadline = Deadline(self.batch_timeout).earliest(self._run_deadline)
+        # Firecrawl may report the source URL with or without a trailing slash
+        requested = {url.rstrip("/"): url for url in urls}
+        seen = set()
+        received = 0
+        while True:
+            with deadline_scope(self._run_deadline):
+                status = self.client.batch_scrape_status(job["id"], skip=received)
+            for doc in self._iter_batch_documents(status):
+                received += 1
+                source_url = (doc.get("metadata") or {}).get("sourceURL")
+                if source_url and source_url not in seen:
+                    seen.add(source_url)
+                    self._cache_batch_document(
+                        requested.get(source_url.rstrip("/"), source_url),
+                        doc.get("json"),
+                    )
+                    yield source_url, doc.get("json") or {}
+
+            state = status.get("status")
+            logger.debug(
+                "Batch scrape job %s %s: %s/%s pages",
+                job["id"],
+                state,
+                status.get("completed"),
+                status.get("total"),
             )
+            if state == "completed":
+                return
+            if state == "failed":
+                logger.warning(f"Batch scrape job {job['id']} failed")
+                return
+            if deadline.expired():
+                logger.warning(
+                    f"Batch scrape job {job['id']} timed out "
+                    f"with {len(seen)}/{len(urls)} pages"
+                )
+                return
+            time.sleep(self.batch_poll_interval)
+
+    def _iter_batch_merged(self, items: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """Fetch details for listing items with one batch scrape job.
+
+        Args:
+            items: Listing items as extracted from the new releases page.
+
+        Yields:
+            Tuples of (0-based listing index, merged item) as the job returns
+            pages. Items without details are yielded last, with basic info.
+        """
+        pending: Dict[str, List[int]] = {}
+        for idx, item in enumerate(items):
+            if "detailUrl" in item:
+                url = self._resolve_detail_url(item)
+                pending.setdefault(url, []).append(idx)
+            else:
+                logger.warning("No detail URL found for " f"{item['title']}")
+                yield idx, item
+        urls = list(pending)
+        pending = {url.rstrip("/"): indices for url, indices in pending.items()}
 
-            response = self.session.post(
-                "https://api.firecrawl.dev/v1/scrape",
-                headers=self.headers,
-                json={
-                    "url": f"{self.base_url}/new",
-                    "formats": ["json"],
-                    "waitFor": 5000,
-                    "jsonOptions": {
-                        "prompt": prompt,
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "items": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "title": {"type": "string"},
-                                            "contentType": {"type": "string"},
-                                            "streamingPlatforms": {
-                                                "type": "array",
-                                                "items": {"type": "string"},
-                                            },
-                                            "releaseDate": {"type": "string"},
-                                            "detailUrl": {"type": "string"},
-                                            "genres": {
-                                                "type": "array",
-                                                "items": {"type": "string"},
-                                            },
-                                        },
+        yield from self._iter_batch_found(items, urls, pending)
+
+        if pending:
+            self._run_expired(sum(len(indices) for indices in pending.values()))
+        for indices in pending.values():
+            for idx in indices:
+                msg = (
+                    f"Could not get detailed info for "
+                    f"{items[idx]['title']}, using basic info only"
+                )
+                logger.warning(msg)
+                yield idx, items[idx]
+
+    def _iter_batch_found(
+        self, items: List[Dict], urls: List[str], pending: Dict[str, List[int]]
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Merge the pages a batch job returns into their listing items.
+
+        Args:
+            items: Listing items as extracted from the new releases page.
+            urls: Detail page URLs to scrape.
+            pending: Listing indices per detail URL without trailing slash.
+                Entries are removed as their pages are merged.
+
+        Yields:
+            Tuples of (0-based listing index, merged item).
+        """
+        try:
+            for source_url, detailed_info in self._iter_batch_details(urls):
+                if not detailed_info:
+                    continue  # Left pending for the caller
+                for idx in pending.pop(source_url.rstrip("/"), []):
+                    yield idx, self._merge_detail(
+                        items[idx], self._check_detail(detailed_info)
+                    )
+        except DeadlineExceeded as e:
+            logger.warning(f"Stopped waiting for batch scrape: {e}")
+        except Exception as e:
+            logger.error(f"Error during batch scrape: {str(e)}", exc_info=True)
+
+    def _fetch_listing_page(self, url: str) -> List[Dict]:
+        """Scrape one listing page.
+
+        With ``listing_scrolls`` set, the page is scrolled that many times
+        before extraction so that lazily loaded titles are included.
+
+        Args:
+            url: Absolute URL of the listing page.
+
+        Returns:
+            Listing items. Empty if the page yielded no items.
+        """
+        logger.info(f"Starting listing extraction for {url}")
+        prompt = (
+            "Extract information about all movies and TV shows listed on "
+            "this page. For each item include:\n"
+            "- Title\n"
+            "- Content type (movie/TV show)\n"
+            "- Streaming platforms where it's available\n"
+            "- Release date or episode information\n"
+            "- The URL to its detail page\n"
+            "- Any genre information visible on the main page"
+        )
+
+        payload = {
+            "url": url,
+            "formats": ["json"],
+            "waitFor": 5000,
+            "jsonOptions": {
+                "prompt": prompt,
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "items": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "title": {"type": "string"},
+                                    "contentType": {"type": "string"},
+                                    "streamingPlatforms": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
+                                    },
+                                    "releaseDate": {"type": "string"},
+                                    "detailUrl": {"type": "string"},
+                                    "genres": {
+                                        "type": "array",
+                                        "items": {"type": "string"},
                                     },
-                                }
+                                },
                             },
-                        },
+                        }
                     },
                 },
+            },
+        }
+        if self.listing_scrolls:
+            # JustWatch listings load further titles on scroll
+            payload["actions"] = [
+                {"type": "scroll", "direction": "down"},
+                {"type": "wait", "milliseconds": 1500},
+            ] * self.listing_scrolls
+        result = self._scrape(payload)
+
+        has_items = result.get("success") and result.get("data", {}).get(
+            "json", {}
+        ).get("items")
+        if not has_items:
+            logger.warning(f"No items found in listing {url}")
+            return []
+
+        items = result["data"]["json"]["items"]
+        logger.info(f"Found {len(items)} items in listing {url}")
+        return items
+
+    def _discover(self) -> Dict[str, List[Dict]]:
+        """Scrape every listing of every region concurrently.
+
+        A listing page that fails is logged and left out.
+
+        Returns:
+            Deduplicated listing items per country code, for the countries
+            with at least one listing scraped.
+        """
+        pages = [
+            (country, f"{JUSTWATCH_URL}/{country}/{path.strip('/')}")
+            for country in self.countries
+            for path in self.listing_paths
+        ]
+        fetched: Dict[str, List[List[Dict]]] = {}
+        with ThreadPoolExecutor(max_workers=min(len(pages), self.max_workers)) as ex:
+            futures = [
+                (country, url, ex.submit(self._fetch_listing_page, url))
+                for country, url in pages
+            ]
+            for country, url, future in futures:
+                try:
+                    fetched.setdefault(country, []).append(future.result())
+                except Exception as e:
+                    logger.error(f"Error getting listing {url}: {str(e)}")
+
+        listings = {}
+        for country, country_pages in fetched.items():
+            listings[country] = dedupe_listing_items(
+                country_pages, f"{JUSTWATCH_URL}/{country}"
+            )
+            total = sum(len(items) for items in country_pages)
+            logger.info(
+                f"Discovered {len(listings[country])} titles in {total} "
+                f"{country} listing items"
             )
+        return listings
 
-            result = response.json()
-            has_items = result.get("success") and result.get("data", {}).get(
-                "json", {}
-            ).get("items")
-            if not has_items:
-                logger.warning("No items found in new releases")
-                return []
-
-            items = result["data"]["json"]["items"]
-            total_items = len(items)
-            logger.info(f"Found {total_items} items in new releases")
-
-            if self.test_mode:
-                items = items[:2]
-                test_msg = (
-                    "Test mode: Processing only first 2 items " f"out of {total_items}"
-                )
-                logger.info(test_msg)
+    def _merge_regions(self, listings: Dict[str, List[Dict]]) -> List[Dict]:
+        """Merge the listings of several regions into one list of titles.
 
-            detailed_items = []
+        Args:
+            listings: Deduplicated listing items per country code.
 
-            for idx, item in enumerate(items, 1):
-                logger.info(f"Processing item {idx}/{len(items)}: " f"{item['title']}")
-                if "detailUrl" in item:
-                    detail_url = (
-                        item["detailUrl"]
-                        if item["detailUrl"].startswith("http")
-                        else urljoin(self.base_url, item["detailUrl"])
+        Returns:
+            Titles as built by :func:`merge_regional_listings`.
+        """
+        for country, items in listings.items():
+            for item in items:
+                if item.get("detailUrl"):
+                    item["detailUrl"] = urljoin(
+                        f"{JUSTWATCH_URL}/{country}", item["detailUrl"]
                     )
-                    logger.debug(f"Fetching details from: {detail_url}")
-                    detailed_info = self._get_detailed_content(detail_url)
-                    if detailed_info:
-                        merged_item = {**item, **detailed_info}
-                        detailed_items.append(merged_item)
-                        logger.info(f"Successfully processed {item['title']}")
-                    else:
-                        msg = (
-                            f"Could not get detailed info for "
-                            f"{item['title']}, using basic info only"
-                        )
-                        logger.warning(msg)
-                        detailed_items.append(item)
-                else:
-                    logger.warning("No detail URL found for " f"{item['title']}")
-                    detailed_items.append(item)
-                time.sleep(1)  # Rate limiting
-
-            logger.info(f"Completed processing {len(detailed_items)} items")
-            return detailed_items
 
+        titles = merge_regional_listings(listings)
+        total = sum(len(items) for items in listings.values())
+        logger.info(
+            f"Merged {total} listing items from {len(listings)} regions "
+            f"into {len(titles)} titles"
+        )
+        return titles
+
+    def _fetch_listing(self) -> List[Dict]:
+        """Discover the titles in every configured listing and region.
+
+        Returns:
+            Listing items, truncated to 2 in test mode. Empty if no page
+            yielded items.
+        """
+        listings = self._discover()
+        if len(self.countries) == 1:
+            items = listings.get(self.countries[0], [])
+        else:
+            items = self._merge_regions(listings)
+
+        total_items = len(items)
+        if self.test_mode:
+            items = items[:2]
+            test_msg = (
+                "Test mode: Processing only first 2 items " f"out of {total_items}"
+            )
+            logger.info(test_msg)
+
+        return items
+
+    def _load_listing(self) -> List[Dict]:
+        """Return the journaled listing snapshot, or scrape and journal it."""
+        if self.journal is not None:
+            items = self.journal.load_listing(self.run_id)
+            if items is not None:
+                logger.info(
+                    f"Resuming run {self.run_id} with {len(items)} journaled "
+                    "listing items"
+                )
+                return items
+
+        items = self._fetch_listing()
+        if self.journal is not None and items:
+            self.journal.save_listing(self.run_id, items)
+        return items
+
+    def _journal_key(self, item: Dict) -> str:
+        """Return the key identifying an item's detail fetch in the journal."""
+        if "detailUrl" in item:
+            return self._resolve_detail_url(item)
+        return item["title"]
+
+    def _record_detail(self, item: Dict, merged: Dict):
+        """Journal the outcome of an item's detail fetch."""
+        key = self._journal_key(item)
+        # Failed and skipped fetches hand back the listing item itself
+        if merged is item and "detailUrl" in item:
+            error = "run deadline reached" if self.cut_short else "no detail data"
+            self.journal.record_failed(self.run_id, "detail", key, error)
+        else:
+            self.journal.record_done(self.run_id, "detail", key, merged)
+
+    def _known_detail(self, item: Dict) -> Optional[Dict]:
+        """Return the stored record of an unchanged title from earlier runs."""
+        if self.known_items is None or "detailUrl" not in item:
+            return None
+        return self.known_items.lookup(
+            self._resolve_detail_url(item), listing_hash(item)
+        )
+
+    def _iter_reused_details(
+        self, items: List[Dict], todo: List[int]
+    ) -> Iterator[Tuple[int, Dict]]:
+        """Yield items whose details need no fetch in this run.
+
+        Items completed in the journaled run come from the journal, unchanged
+        titles from the known-items index. The indices of all other items are
+        appended to ``todo``.
+
+        Args:
+            items: Listing items as extracted from the new releases page.
+            todo: List collecting the indices of items still to fetch.
+
+        Yields:
+            Tuples of (0-based listing index, merged item).
+        """
+        done = self.journal.completed(self.run_id, "detail") if self.journal else {}
+        journaled = known = 0
+        for idx, item in enumerate(items):
+            key = self._journal_key(item)
+            if key in done:
+                journaled += 1
+                yield idx, done[key]
+                continue
+            record = self._known_detail(item)
+            if record is None:
+                todo.append(idx)
+                continue
+            known += 1
+            if self.journal is not None:
+                self.journal.record_done(self.run_id, "detail", key, record)
+            yield idx, record
+        if journaled:
+            logger.info(f"Skipping {journaled} items already fetched in this run")
+        if known:
+            logger.info(f"Reusing details of {known} unchanged items from earlier runs")
+
+    def _iter_pending_details(self, items: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """Fetch details for the items no earlier work can be reused for.
+
+        Items already completed in the journaled run or known unchanged from
+        earlier runs are yielded first; the rest are fetched with the
+        configured mode and their outcome journaled.
+
+        Args:
+            items: Listing items as extracted from the new releases page.
+
+        Yields:
+            Tuples of (0-based listing index, merged item).
+        """
+        todo: List[int] = []
+        yield from self._iter_reused_details(items, todo)
+
+        todo_items = [items[idx] for idx in todo]
+        if self.use_batch_scrape:
+            fetched = self._iter_batch_merged(todo_items)
+        else:
+            fetched = self._iter_details(todo_items)
+        for todo_idx, merged in fetched:
+            idx = todo[todo_idx]
+            if self.journal is not None:
+                self._record_detail(items[idx], merged)
+            yield idx, merged
+
+    def iter_new_releases(self, ordered: bool = False) -> Iterator[Dict]:
+        """Yield new releases from JustWatch as their details are fetched.
+
+        Downstream stages can consume items while later detail pages are still
+        being scraped.
+
+        Args:
+            ordered: If True, yield items in listing order, each as soon as it
+                and every item before it are done. Otherwise yield each item
+                as soon as its own detail fetch completes.
+
+        Yields:
+            Dictionaries containing movie/show information.
+        """
+        self._run_deadline = Deadline(self.run_budget) if self.run_budget else None
+        self.cut_short = False
+        try:
+            items = self._load_listing()
+        except Exception as e:
+            error_msg = "Error getting new releases: " f"{str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return
+
+        merged = self._iter_pending_details(items)
+        if ordered:
+            merged = _in_listing_order(merged)
+
+        count = 0
+        for _, item in merged:
+            count += 1
+            yield item
+        logger.info(f"Completed processing {count} items")
+
+    def get_new_releases(self) -> List[Dict]:
+        """Get list of new releases from JustWatch.
+
+        Returns:
+            List of dictionaries containing movie/show information.
+        """
+        try:
+            return list(self.iter_new_releases(ordered=True))
         except Exception as e:
             error_msg = "Error getting new releases: " f"{str(e)}"
             logger.error(error_msg, exc_info=True)
             return []
 
-    def save_data(self, data: List[Dict], output_dir: str = None):
-        """Save scraped data to JSON and CSV files.
+    def save_data(
+        self, data: Iterable[Dict], output_dir: str = None, relational: bool = False
+    ) -> int:
+        """Save scraped data to JSONL, JSON, CSV and Parquet files.
+
+        Items are appended to a JSONL file as they arrive, so ``data`` can be
+        the stream from :meth:`iter_new_releases`. The file is published by an
+        atomic rename once the stream is exhausted; if the run dies first the
+        items so far remain in ``<name>.jsonl.part``. The JSON and CSV
+        snapshots and the typed Parquet dataset under ``parquet/``,
+        partitioned by scrape date and content type, are then built from the
+        JSONL file.
 
         Args:
-            data: List of dictionaries containing movie/show information.
+            data: Dictionaries containing movie/show information.
             output_dir: Optional directory path to save the files.
                        If None, saves to project's data/raw directory.
+            relational: If True, also export normalized ``item``,
+                ``item_cast``, ``item_platform``, ``item_genre`` and
+                ``review`` tables to ``<name>_tables/``.
+
+        Returns:
+            Number of items saved.
         """
         try:
             if output_dir is None:
                 # Use the root data directory
-                output_dir = (
-                    Path(__file__).resolve().parent.parent.parent / "data" / "raw"
-                )
+                output_dir = DATA_DIR / "raw"
             else:
                 output_dir = Path(output_dir).resolve()
 
@@ -367,49 +1157,152 @@ class JustWatchScraper:
             logger.info(f"Saving data to: {output_dir}")
 
             # Generate timestamp for filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+
+            # Stream items to JSONL as they arrive
+            jsonl_path = output_dir / f"justwatch_data_{timestamp}.jsonl"
+            fields: List[str] = []
+            genres_found = 0
+            with JsonlSink(jsonl_path) as sink:
+                for item in data:
+                    sink.write(item)
+                    fields.extend(k for k in item if k not in fields)
+                    genres_found += bool(item.get("genres"))
+                if sink.count == 0:
+                    sink.abort()
+                    logger.warning("No items to save")
+                    return 0
+            count = sink.count
+            logger.info(f"Saved JSONL data to: {jsonl_path}")
 
-            # Save raw JSON
+            # Build the JSON snapshot from the JSONL file
             json_path = output_dir / f"justwatch_data_{timestamp}.json"
-            with open(json_path, "w") as f:
-                json.dump(data, f, indent=2)
+            jsonl_to_json(jsonl_path, json_path)
             logger.info(f"Saved JSON data to: {json_path}")
 
             # Convert to DataFrame and save as CSV
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(list(read_jsonl(jsonl_path)))
             csv_path = output_dir / f"justwatch_data_{timestamp}.csv"
             df.to_csv(csv_path, index=False)
             logger.info(f"Saved CSV data to: {csv_path}")
 
+            # Typed Parquet dataset with nested columns kept as lists/structs
+            parquet_dir = output_dir / "parquet"
+            write_parquet_dataset(
+                read_jsonl(jsonl_path),
+                parquet_dir,
+                scrape_date=now.date().isoformat(),
+                basename=f"justwatch_data_{timestamp}",
+            )
+            logger.info(f"Saved Parquet data to: {parquet_dir}")
+
+            if relational:
+                tables_dir = output_dir / f"justwatch_data_{timestamp}_tables"
+                write_tables(build_tables(read_jsonl(jsonl_path)), tables_dir)
+                logger.info(f"Saved relational tables to: {tables_dir}")
+
             # Log data statistics
-            logger.info(f"Saved {len(data)} items")
-            if len(data) > 0:
-                logger.info("Fields captured: " f"{', '.join(data[0].keys())}")
-                genres_found = sum(1 for item in data if item.get("genres"))
-                logger.info(f"Items with genres: {genres_found}/{len(data)}")
+            logger.info(f"Saved {count} items")
+            logger.info("Fields captured: " f"{', '.join(fields)}")
+            logger.info(f"Items with genres: {genres_found}/{count}")
+            return count
 
         except Exception as e:
             logger.error(f"Error saving data: {str(e)}", exc_info=True)
             raise
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments to parse. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the last unfinished run, skipping detail pages it already "
+        "fetched and retrying only failed or missing ones.",
+    )
+    parser.add_argument(
+        "--journal",
+        default=str(JOURNAL_PATH),
+        help="Path of the SQLite run journal (default: %(default)s).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Run the JustWatch scraper to collect movie and TV show data."""
     try:
-        # Load API key from environment variables
-        api_key = load_env_vars()
+        args = parse_args(argv)
+
+        # Shared with the review scraper, so both reuse the same connections
+        client = get_firecrawl_client()
 
-        # Get test mode from environment or default to False
-        test_mode = os.getenv("TEST_MODE", "false").lower() == "true"
+        # Get test mode from the environment or .env, defaulting to False
+        test_mode = get_secret("TEST_MODE", "false").lower() == "true"
+        max_workers = int(os.getenv("DETAIL_WORKERS", "4"))
+        use_batch_scrape = os.getenv("BATCH_SCRAPE", "false").lower() == "true"
+        known_max_age_days = float(os.getenv("KNOWN_ITEMS_MAX_AGE_DAYS", "30"))
+        countries = os.getenv("COUNTRIES", DEFAULT_COUNTRY).split(",")
+        listing_paths = os.getenv("LISTINGS", DEFAULT_LISTING).split(",")
+        listing_scrolls = int(os.getenv("LISTING_SCROLLS", "0"))
+        relational = os.getenv("RELATIONAL_EXPORT", "false").lower() == "true"
+        item_budget = float(os.getenv("ITEM_DEADLINE_SECONDS", "0")) or None
+        run_budget = float(os.getenv("RUN_DEADLINE_SECONDS", "0")) or None
+
+        journal = RunJournal(args.journal)
+        run_id = journal.latest_unfinished_run() if args.resume else None
+        if run_id is None:
+            if args.resume:
+                logger.info("No unfinished run to resume, starting a new one")
+            run_id = journal.start_run()
+        else:
+            logger.info(f"Resuming run {run_id}")
+
+        known_items = None
+        if known_max_age_days > 0:
+            known_items = KnownItemsIndex.from_outputs(
+                DATA_DIR / "raw",
+                JUSTWATCH_BASE_URL,
+                max_age=known_max_age_days * 24 * 3600,
+            )
 
         logger.info("Initializing JustWatch scraper")
-        scraper = JustWatchScraper(api_key=api_key, test_mode=test_mode)
+        scraper = JustWatchScraper(
+            client=client,
+            test_mode=test_mode,
+            max_workers=max_workers,
+            use_batch_scrape=use_batch_scrape,
+            journal=journal,
+            run_id=run_id,
+            known_items=known_items,
+            countries=[c.strip() for c in countries if c.strip()],
+            listing_paths=[p.strip() for p in listing_paths if p.strip()],
+            listing_scrolls=listing_scrolls,
+            item_budget=item_budget,
+            run_budget=run_budget,
+        )
 
         logger.info("Starting data collection")
-        data = scraper.get_new_releases()
+        saved = scraper.save_data(scraper.iter_new_releases(), relational=relational)
+
+        if scraper.cache is not None:
+            logger.info(f"Response cache: {scraper.cache.stats()}")
 
-        if data:
-            scraper.save_data(data)
+        if saved and scraper.cut_short:
+            logger.warning(
+                f"Run {run_id} was cut short by its deadline; "
+                "rerun with --resume to fetch the remaining details"
+            )
+        elif saved:
+            journal.finish_run(run_id)
             logger.info("Data collection completed successfully")
         else:
             logger.error("No data collected")
@@ -420,4 +1313,5 @@ def main():
 
 
 if __name__ == "__main__":
+    setup_logging()
     main()
@@ -0,0 +1,154 @@
+"""Index of titles already scraped in previous runs."""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from .sinks import read_jsonl
+
+logger = logging.getLogger(__name__)
+
+JUSTWATCH_URL = "https://www.justwatch.com"
+
+# Fields extracted from the new releases listing page
+LISTING_FIELDS = (
+    "title",
+    "contentType",
+    "streamingPlatforms",
+    "releaseDate",
+    "detailUrl",
+    "genres",
+    "regions",
+)
+LISTING_HASH_FIELD = "listingHash"
+# Epoch seconds of the detail fetch a record's details come from. Reused
+# records keep it, so they age from their first scrape.
+SCRAPED_AT_FIELD = "detailScrapedAt"
+
+
+def listing_hash(item: Dict) -> str:
+    """Return a hash of the listing fields of an item.
+
+    Args:
+        item: Listing item, or a record merged from one.
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON of :data:`LISTING_FIELDS`.
+    """
+    fields = {field: item[field] for field in LISTING_FIELDS if field in item}
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a detail page URL for use as an index key.
+
+    Lowercases the scheme and host and drops the query, fragment and any
+    trailing slash.
+
+    Args:
+        url: Absolute URL.
+
+    Returns:
+        The canonical URL.
+    """
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", "")
+    )
+
+
+class KnownItemsIndex:
+    """Detail records of previously scraped titles.
+
+    Records are keyed by the canonical detail URL and remember the hash of the
+    listing fields they were scraped for, so a title is only reused while its
+    listing entry is unchanged. They also remember when their details were
+    scraped, which is kept when a record is reused.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._records: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, url: str, record: Dict):
+        """Add or replace the record of a title.
+
+        Records without a listing hash are ignored: they come from failed
+        detail fetches or from outputs written before the hash was recorded.
+
+        Args:
+            url: Absolute detail page URL.
+            record: Merged item as saved by the scraper.
+        """
+        if record.get(LISTING_HASH_FIELD):
+            self._records[canonical_url(url)] = record
+
+    def lookup(self, url: str, item_hash: str) -> Optional[Dict]:
+        """Return the stored record of a title if its listing is unchanged.
+
+        Args:
+            url: Absolute detail page URL.
+            item_hash: :func:`listing_hash` of the current listing item.
+
+        Returns:
+            A copy of the stored record, or None if the title is new or its
+            listing fields changed.
+        """
+        record = self._records.get(canonical_url(url))
+        if record is None or record[LISTING_HASH_FIELD] != item_hash:
+            return None
+        return dict(record)
+
+    @classmethod
+    def from_outputs(
+        cls,
+        output_dir: Union[str, Path],
+        base_url: str,
+        max_age: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> "KnownItemsIndex":
+        """Build the index from the JSONL files of earlier runs.
+
+        Files are read oldest first, so the newest record of a title wins.
+        Part files left by interrupted runs are included.
+
+        Args:
+            output_dir: Directory the scraper saved its outputs to.
+            base_url: Base URL relative detail URLs are resolved against.
+            max_age: Ignore records whose details were scraped more than this
+                many seconds ago, so stale titles get scraped again. Records
+                without :data:`SCRAPED_AT_FIELD` count from their file's last
+                modification. None keeps all.
+            clock: Wall clock, injectable for tests.
+
+        Returns:
+            The populated index.
+        """
+        index = cls()
+        output_dir = Path(output_dir)
+        if not output_dir.is_dir():
+            return index
+
+        cutoff = clock() - max_age if max_age is not None else -float("inf")
+        # A file holds no record scraped after the file was last written
+        paths = [
+            path
+            for path in sorted(output_dir.glob("justwatch_data_*.jsonl*"))
+            if path.stat().st_mtime >= cutoff
+        ]
+        for path in paths:
+            modified = path.stat().st_mtime
+            for record in read_jsonl(path):
+                fresh = record.get(SCRAPED_AT_FIELD, modified) >= cutoff
+                if record.get("detailUrl") and fresh:
+                    index.add(urljoin(base_url, record["detailUrl"]), record)
+        logger.info(f"Loaded {len(index)} known items from {len(paths)} files")
+        return index
@@ -0,0 +1,133 @@
+"""Opt-in logging setup for the scraping scripts.
+
+Records are handed to a queue by the threads that log them; a single
+listener thread does the console and file I/O, so scraping threads never
+block on disk writes. The log file is rotated by size.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+DEFAULT_LOG_DIR = "logs"
+LOG_FILE_NAME = "scraper.log"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_PAYLOAD_LIMIT = 500
+# DEBUG records, e.g. whole extractions, are only built when asked for
+DEFAULT_FILE_LEVEL = "INFO"
+
+FILE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(threadName)s - %(message)s"
+CONSOLE_FORMAT = "%(levelname)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_lock = threading.Lock()
+
+
+def payload_summary(value: Any, limit: int = DEFAULT_PAYLOAD_LIMIT) -> str:
+    """Return compact JSON for a log message, cut to ``limit`` characters.
+
+    Args:
+        value: Response or extracted data to include in a message.
+        limit: Maximum length of the returned text.
+
+    Returns:
+        The JSON text, with the number of omitted characters if truncated.
+    """
+    try:
+        text = json.dumps(value, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        text = repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text) - limit} more characters)"
+
+
+def setup_logging(
+    log_dir: Union[str, Path, None] = None,
+    console_level: int = logging.INFO,
+    file_level: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    backup_count: Optional[int] = None,
+) -> logging.handlers.QueueListener:
+    """Route root logger records through a queue to console and file handlers.
+
+    Calling it again returns the running listener without adding handlers.
+    Unset arguments are read from ``LOG_DIR``, ``LOG_LEVEL``,
+    ``LOG_MAX_BYTES`` and ``LOG_BACKUP_COUNT``.
+
+    Args:
+        log_dir: Directory of the rotating log file.
+        console_level: Minimum level written to the console.
+        file_level: Minimum level written to the log file.
+        max_bytes: Size at which the log file is rotated.
+        backup_count: Number of rotated files kept.
+
+    Returns:
+        The started queue listener.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        log_dir = Path(log_dir or os.getenv("LOG_DIR", DEFAULT_LOG_DIR))
+        log_dir.mkdir(parents=True, exist_ok=True)
+        if file_level is None:
+            file_level = logging.getLevelName(
+                os.getenv("LOG_LEVEL", DEFAULT_FILE_LEVEL).upper()
+            )
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_dir / LOG_FILE_NAME,
+            maxBytes=max_bytes or int(os.getenv("LOG_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            backupCount=(
+                backup_count
+                if backup_count is not None
+                else int(os.getenv("LOG_BACKUP_COUNT", DEFAULT_BACKUP_COUNT))
+            ),
+            encoding="utf-8",
+        )
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+        _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        _listener = logging.handlers.QueueListener(
+            _queue_handler.queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True,
+        )
+        _listener.start()
+
+        # Records below both handler levels are dropped before they are built
+        root = logging.getLogger()
+        root.setLevel(min(console_level, file_level))
+        root.addHandler(_queue_handler)
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Flush queued records, stop the listener and close its handlers."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
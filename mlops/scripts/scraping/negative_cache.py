@@ -0,0 +1,183 @@
+"""Negative cache of review pages and domains that yield no reviews.
+
+Streaming landing pages, paywalled sites and pages the LLM extraction finds
+nothing on cost a full scrape on every run. Each such outcome puts the page
+under a penalty that doubles with every repeated failure; a domain is
+penalized once several of its pages failed in a row. Candidates under a
+penalty are skipped before they are scraped, and penalties expire so that
+sites that start publishing reviews are tried again.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from .storage import DAY, SharedStore, SqliteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_PENALTY = 7 * DAY
+DEFAULT_DOMAIN_PENALTY = 3 * DAY
+DEFAULT_MAX_PENALTY = 60 * DAY
+DEFAULT_DOMAIN_THRESHOLD = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_penalties (
+    url TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    failures INTEGER NOT NULL,
+    reason TEXT,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS domain_penalties (
+    domain TEXT PRIMARY KEY,
+    failures INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class NegativeCache(SqliteStore):
+    """Persistent record of review candidates not worth scraping for now.
+
+    A page's first failure penalizes it for ``page_penalty`` seconds, each
+    further one doubles that up to ``max_penalty``. After
+    ``domain_threshold`` failed pages in a row a whole domain is penalized
+    the same way, starting at ``domain_penalty``. A page yielding reviews
+    clears its own penalty and its domain's failure streak.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        page_penalty: float = DEFAULT_PAGE_PENALTY,
+        domain_penalty: float = DEFAULT_DOMAIN_PENALTY,
+        domain_threshold: int = DEFAULT_DOMAIN_THRESHOLD,
+        max_penalty: float = DEFAULT_MAX_PENALTY,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open or create the cache.
+
+        Args:
+            path: SQLite database file.
+            page_penalty: Seconds a page is skipped after its first failure.
+            domain_penalty: Seconds a domain is skipped once it reaches
+                ``domain_threshold`` failures in a row.
+            domain_threshold: Failed pages in a row that penalize a domain.
+            max_penalty: Upper bound for doubled penalties.
+            clock: Wall clock, injectable for tests.
+        """
+        super().__init__(path, SCHEMA)
+        self.page_penalty = page_penalty
+        self.domain_penalty = domain_penalty
+        self.domain_threshold = domain_threshold
+        self.max_penalty = max_penalty
+        self._clock = clock
+
+    def _penalty(self, base: float, strikes: int) -> float:
+        return min(self.max_penalty, base * 2 ** max(0, strikes - 1))
+
+    def blocked_reason(self, url: str, domain: str) -> Optional[str]:
+        """Return why a candidate page should be skipped, if it should.
+
+        Args:
+            url: Review page URL.
+            domain: Domain of the page.
+
+        Returns:
+            A short reason, or None if the page may be scraped.
+        """
+        now = self._clock()
+        with self._lock:
+            page = self._conn.execute(
+                "SELECT reason FROM page_penalties WHERE url = ? AND expires_at > ?",
+                (url, now),
+            ).fetchone()
+            site = self._conn.execute(
+                "SELECT failures FROM domain_penalties "
+                "WHERE domain = ? AND expires_at > ?",
+                (domain, now),
+            ).fetchone()
+        if page is not None:
+            return f"page penalized ({page[0]})"
+        if site is not None:
+            return f"domain penalized after {site[0]} failed pages"
+        return None
+
+    def record_failure(self, url: str, domain: str, reason: str):
+        """Penalize a page that yielded no reviews, and possibly its domain.
+
+        Args:
+            url: Review page URL.
+            domain: Domain of the page.
+            reason: Short description of the outcome, e.g. ``"no extraction"``.
+        """
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT failures FROM page_penalties WHERE url = ?", (url,)
+                ).fetchone()
+                failures = (row[0] if row else 0) + 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO page_penalties "
+                    "(url, domain, failures, reason, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        domain,
+                        failures,
+                        reason,
+                        now + self._penalty(self.page_penalty, failures),
+                    ),
+                )
+
+                row = self._conn.execute(
+                    "SELECT failures FROM domain_penalties WHERE domain = ?", (domain,)
+                ).fetchone()
+                streak = (row[0] if row else 0) + 1
+                strikes = streak - self.domain_threshold + 1
+                expires_at = (
+                    now + self._penalty(self.domain_penalty, strikes)
+                    if strikes > 0
+                    else 0.0
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO domain_penalties "
+                    "(domain, failures, expires_at) VALUES (?, ?, ?)",
+                    (domain, streak, expires_at),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if strikes == 1:
+            logger.info(
+                f"Skipping {domain} for now: {streak} pages in a row without reviews"
+            )
+
+    def record_success(self, url: str, domain: str):
+        """Clear the penalty of a page that yielded reviews and its domain's streak."""
+        with self._lock:
+            self._conn.execute("DELETE FROM page_penalties WHERE url = ?", (url,))
+            self._conn.execute(
+                "DELETE FROM domain_penalties WHERE domain = ?", (domain,)
+            )
+
+
+_default_cache = SharedStore(
+    "REVIEW_NEGATIVE_CACHE_PATH", NegativeCache, "review negative cache"
+)
+
+
+def get_negative_cache() -> Optional[NegativeCache]:
+    """Return the process-wide negative cache, if enabled.
+
+    The cache is enabled by pointing ``REVIEW_NEGATIVE_CACHE_PATH`` at a
+    database file and is opened on first use.
+
+    Returns:
+        The shared cache, or None if it is disabled.
+    """
+    return _default_cache.get()
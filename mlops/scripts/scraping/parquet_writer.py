@@ -0,0 +1,212 @@
+"""Typed, partitioned Parquet output for scraped items."""
+
+import logging
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+STRING_LIST = pa.list_(pa.string())
+
+# Fields extracted by the scraper; anything else in an item is not written
+ITEM_FIELDS = [
+    pa.field("title", pa.string()),
+    pa.field("contentType", pa.string()),
+    pa.field("streamingPlatforms", STRING_LIST),
+    pa.field("releaseDate", pa.string()),
+    pa.field("detailUrl", pa.string()),
+    pa.field("genres", STRING_LIST),
+    pa.field("imdbRating", pa.string()),
+    pa.field("rottenTomatoesRating", pa.string()),
+    pa.field("synopsis", pa.string()),
+    pa.field(
+        "cast",
+        pa.list_(
+            pa.struct(
+                [pa.field("name", pa.string()), pa.field("character", pa.string())]
+            )
+        ),
+    ),
+    pa.field("directors", STRING_LIST),
+    pa.field("duration", pa.string()),
+    pa.field("maturityRating", pa.string()),
+    pa.field("language", pa.string()),
+    pa.field("country", pa.string()),
+    pa.field("yearReleased", pa.string()),
+    pa.field(
+        "regions",
+        pa.list_(
+            pa.struct(
+                [
+                    pa.field("country", pa.string()),
+                    pa.field("detailUrl", pa.string()),
+                    pa.field("streamingPlatforms", STRING_LIST),
+                    pa.field("releaseDate", pa.string()),
+                ]
+            )
+        ),
+    ),
+    pa.field("listingHash", pa.string()),
+]
+PARTITION_FIELDS = [
+    pa.field("scrape_date", pa.string()),
+    pa.field("content_type", pa.string()),
+]
+ITEM_SCHEMA = pa.schema(ITEM_FIELDS + PARTITION_FIELDS)
+
+DEFAULT_ROWS_PER_GROUP = 64 * 1024
+
+
+def _to_string(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _to_string_list(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        value = [value]
+    return [_to_string(v) for v in value if v is not None]
+
+
+def _to_cast(value: Any) -> Optional[List[Dict]]:
+    if not isinstance(value, list):
+        return None
+    cast = []
+    for member in value:
+        if isinstance(member, dict):
+            cast.append(
+                {
+                    "name": _to_string(member.get("name")),
+                    "character": _to_string(member.get("character")),
+                }
+            )
+        elif member is not None:
+            cast.append({"name": _to_string(member), "character": None})
+    return cast
+
+
+def _to_regions(value: Any) -> Optional[List[Dict]]:
+    if not isinstance(value, dict):
+        return None
+    return [
+        {
+            "country": country,
+            "detailUrl": _to_string(region.get("detailUrl")),
+            "streamingPlatforms": _to_string_list(region.get("streamingPlatforms")),
+            "releaseDate": _to_string(region.get("releaseDate")),
+        }
+        for country, region in value.items()
+    ]
+
+
+CONVERTERS = {
+    "streamingPlatforms": _to_string_list,
+    "genres": _to_string_list,
+    "directors": _to_string_list,
+    "cast": _to_cast,
+    "regions": _to_regions,
+}
+
+
+def content_type_partition(content_type: Any) -> str:
+    """Return the partition value for a content type.
+
+    Args:
+        content_type: Content type as extracted, e.g. ``"TV Show"``.
+
+    Returns:
+        Lowercase slug such as ``"tv_show"``, or ``"unknown"``.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", str(content_type or "").lower()).strip("_")
+    return slug or "unknown"
+
+
+def to_row(item: Dict, scrape_date: str) -> Dict:
+    """Coerce a scraped item to a row matching :data:`ITEM_SCHEMA`.
+
+    Extraction results are loosely typed, so scalars are stringified, single
+    values wrapped in lists and region mappings turned into lists of structs.
+
+    Args:
+        item: Scraped item.
+        scrape_date: ISO date of the scrape, used for partitioning.
+
+    Returns:
+        The row.
+    """
+    row = {
+        field.name: CONVERTERS.get(field.name, _to_string)(item.get(field.name))
+        for field in ITEM_FIELDS
+    }
+    row["scrape_date"] = scrape_date
+    row["content_type"] = content_type_partition(item.get("contentType"))
+    return row
+
+
+def _record_batches(
+    items: Iterable[Dict], scrape_date: str, batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    items = iter(items)
+    while True:
+        rows = [to_row(item, scrape_date) for item in islice(items, batch_size)]
+        if not rows:
+            return
+        yield pa.RecordBatch.from_pylist(rows, schema=ITEM_SCHEMA)
+
+
+def write_parquet_dataset(
+    items: Iterable[Dict],
+    root: Union[str, Path],
+    scrape_date: str,
+    basename: str,
+    rows_per_group: int = DEFAULT_ROWS_PER_GROUP,
+) -> int:
+    """Write items to a Hive-partitioned Parquet dataset.
+
+    Files go to ``root/scrape_date=<date>/content_type=<type>/`` and are
+    zstd-compressed with dictionary encoding. Items are converted in batches,
+    so ``items`` may be a stream. Files of earlier runs are left in place.
+
+    Args:
+        items: Scraped items.
+        root: Root directory of the dataset.
+        scrape_date: ISO date of the scrape.
+        basename: Unique prefix for the files written by this call.
+        rows_per_group: Maximum number of rows per row group.
+
+    Returns:
+        Number of rows written.
+    """
+    rows = 0
+
+    def counted(batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+        nonlocal rows
+        for batch in batches:
+            rows += batch.num_rows
+            yield batch
+
+    file_format = ds.ParquetFileFormat()
+    ds.write_dataset(
+        counted(_record_batches(items, scrape_date, rows_per_group)),
+        root,
+        schema=ITEM_SCHEMA,
+        format=file_format,
+        file_options=file_format.make_write_options(
+            compression="zstd", use_dictionary=True
+        ),
+        partitioning=ds.partitioning(pa.schema(PARTITION_FIELDS), flavor="hive"),
+        basename_template=f"{basename}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=rows_per_group,
+        min_rows_per_group=min(rows_per_group, 1024),
+    )
+    logger.debug("Wrote %d rows to Parquet dataset %s", rows, root)
+    return rows
@@ -0,0 +1,165 @@
+"""Token-bucket rate limiter shared by all Firecrawl calls."""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+class RateLimiter:
+    """Limit request rate and concurrency, adapting to 429 responses.
+
+    Requests take a token from a bucket refilled at ``rate`` tokens per second
+    and hold one of ``max_in_flight`` slots while they run. The rate follows
+    additive increase / multiplicative decrease: every successful response
+    raises it by ``increase_step`` up to ``max_rate``, every 429 multiplies it
+    by ``decrease_factor`` down to ``min_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        burst: Optional[float] = None,
+        min_rate: float = 0.1,
+        max_rate: Optional[float] = None,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Initial number of requests allowed per second.
+            max_in_flight: Maximum number of requests running at once.
+            burst: Bucket capacity. Defaults to ``max_in_flight``.
+            min_rate: Lower bound for the adapted rate.
+            max_rate: Upper bound for the adapted rate. Defaults to ``rate``.
+            increase_step: Requests/sec added after each successful response.
+            decrease_factor: Multiplier applied to the rate after a 429.
+            clock: Monotonic clock, injectable for tests.
+            sleep: Sleep function, injectable for tests.
+        """
+        if rate <= 0 or max_in_flight < 1:
+            raise ValueError("rate must be positive and max_in_flight at least 1")
+
+        self.max_in_flight = max_in_flight
+        self.burst = float(burst if burst is not None else max_in_flight)
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self._clock = clock
+        self._sleep = sleep
+
+        self._rate = rate
+        self._tokens = self.burst
+        self._last_refill = clock()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    @property
+    def rate(self) -> float:
+        """Current number of requests allowed per second."""
+        return self._rate
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+
+    def _take_token(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            self._sleep(wait)
+
+    def acquire(self):
+        """Block until a request may start. Pair with :meth:`release`."""
+        self._slots.acquire()
+        try:
+            self._take_token()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self):
+        """Mark a request started with :meth:`acquire` as finished."""
+        self._slots.release()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Context manager wrapping :meth:`acquire` and :meth:`release`."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self):
+        """Additively increase the rate after a successful response."""
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def record_throttle(self):
+        """Multiplicatively decrease the rate after a 429 response."""
+        with self._lock:
+            self._refill()
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+            # Drop any saved-up burst so the next request really waits
+            self._tokens = min(self._tokens, 0.0)
+            rate = self._rate
+        logger.warning(f"Rate limited by API, slowing down to {rate:.2f} req/s")
+
+    def record_response(self, status_code: int):
+        """Adapt the rate to the status code of a finished request.
+
+        Args:
+            status_code: HTTP status code of the response.
+        """
+        if status_code == 429:
+            self.record_throttle()
+        else:
+            self.record_success()
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter used for Firecrawl calls.
+
+    The limiter is created on first use from ``FIRECRAWL_REQUESTS_PER_SECOND``
+    and ``FIRECRAWL_MAX_IN_FLIGHT`` if set.
+
+    Returns:
+        RateLimiter: The shared limiter instance.
+    """
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(
+                rate=float(
+                    os.getenv(
+                        "FIRECRAWL_REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND
+                    )
+                ),
+                max_in_flight=int(
+                    os.getenv("FIRECRAWL_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)
+                ),
+            )
+        return _default_limiter
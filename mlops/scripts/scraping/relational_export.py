@@ -0,0 +1,235 @@
+"""Normalized relational export of scraped items and reviews."""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import urljoin
+
+import pandas as pd
+
+from .known_items import JUSTWATCH_URL, canonical_url
+
+logger = logging.getLogger(__name__)
+
+ITEM_COLUMNS = {
+    "title": "title",
+    "contentType": "content_type",
+    "releaseDate": "release_date",
+    "detailUrl": "detail_url",
+    "imdbRating": "imdb_rating",
+    "rottenTomatoesRating": "rotten_tomatoes_rating",
+    "synopsis": "synopsis",
+    "duration": "duration",
+    "maturityRating": "maturity_rating",
+    "language": "language",
+    "country": "country",
+    "yearReleased": "year_released",
+}
+
+TABLE_COLUMNS = {
+    "item": ["item_id"] + list(ITEM_COLUMNS.values()),
+    "item_cast": ["item_id", "person_id", "ordinal", "name", "character"],
+    "item_platform": ["item_id", "platform_id", "region", "platform"],
+    "item_genre": ["item_id", "genre_id", "genre"],
+    "review": [
+        "review_id",
+        "item_id",
+        "source_name",
+        "review_text",
+        "original_score",
+        "review_url",
+    ],
+}
+ID_COLUMNS = {"item_id", "person_id", "platform_id", "genre_id", "review_id"}
+
+
+def stable_id(*parts: str) -> int:
+    """Return a surrogate ID that is the same in every run.
+
+    Args:
+        *parts: Natural key of the row, e.g. ``("genre", "drama")``.
+
+    Returns:
+        Non-negative 63-bit integer derived from a SHA-256 of the key.
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big") >> 1
+
+
+def item_natural_key(item: Dict, base_url: str = JUSTWATCH_URL) -> str:
+    """Return the natural key of an item: its canonical detail URL.
+
+    Items without a detail URL fall back to title and year.
+
+    Args:
+        item: Scraped item.
+        base_url: Base URL relative detail URLs are resolved against.
+
+    Returns:
+        The natural key.
+    """
+    if item.get("detailUrl"):
+        return canonical_url(urljoin(base_url, item["detailUrl"]))
+    return f"title:{str(item.get('title', '')).lower()}:{item.get('yearReleased', '')}"
+
+
+def item_id(item: Dict, base_url: str = JUSTWATCH_URL) -> int:
+    """Return the stable surrogate ID of an item."""
+    return stable_id("item", item_natural_key(item, base_url))
+
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _name(value) -> Optional[str]:
+    """Return a stripped, non-empty name or None."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class _TableBuilder:
+    """Column-wise accumulator for the export tables."""
+
+    def __init__(self):
+        self.columns = {
+            table: {column: [] for column in columns}
+            for table, columns in TABLE_COLUMNS.items()
+        }
+
+    def add(self, table: str, *values):
+        for column, value in zip(TABLE_COLUMNS[table], values):
+            self.columns[table][column].append(value)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        frames = {}
+        for table, columns in self.columns.items():
+            df = pd.DataFrame(columns, columns=TABLE_COLUMNS[table])
+            for column in ID_COLUMNS.intersection(df.columns):
+                df[column] = df[column].astype("int64")
+            if table == "item_cast":
+                df["ordinal"] = df["ordinal"].astype("int64")
+            frames[table] = df
+        return frames
+
+
+def _add_item(tables: _TableBuilder, iid: int, item: Dict):
+    tables.add("item", iid, *(_name(item.get(field)) for field in ITEM_COLUMNS))
+
+    for ordinal, member in enumerate(_as_list(item.get("cast"))):
+        if isinstance(member, dict):
+            name, character = _name(member.get("name")), _name(member.get("character"))
+        else:
+            name, character = _name(member), None
+        if name:
+            person_id = stable_id("person", name.lower())
+            tables.add("item_cast", iid, person_id, ordinal, name, character)
+
+    # Multi-region items list platforms per region; the top-level list
+    # repeats the first region's
+    regions = item.get("regions") or {None: item}
+    platforms = {
+        (region, platform)
+        for region, info in regions.items()
+        for platform in _as_list(info.get("streamingPlatforms"))
+    }
+    for region, platform in sorted(platforms, key=lambda rp: (rp[0] or "", str(rp[1]))):
+        platform = _name(platform)
+        if platform:
+            platform_id = stable_id("platform", platform.lower())
+            tables.add("item_platform", iid, platform_id, region, platform)
+
+    genres = {_name(g) for g in _as_list(item.get("genres"))} - {None}
+    for genre in sorted(genres):
+        tables.add("item_genre", iid, stable_id("genre", genre.lower()), genre)
+
+
+def _add_reviews(tables: _TableBuilder, iid: int, reviews: Iterable[Dict]):
+    seen = set()
+    for review in reviews:
+        text = _name(review.get("review_text"))
+        if not text:
+            continue
+        review_url = _name(review.get("review_url"))
+        review_id = stable_id("review", str(iid), review_url or "", text)
+        if review_id in seen:
+            continue
+        seen.add(review_id)
+        tables.add(
+            "review",
+            review_id,
+            iid,
+            _name(review.get("source_name")),
+            text,
+            _name(review.get("original_score")),
+            review_url,
+        )
+
+
+def build_tables(
+    items: Iterable[Dict],
+    reviews: Optional[Dict[Union[str, int], List[Dict]]] = None,
+    base_url: str = JUSTWATCH_URL,
+) -> Dict[str, pd.DataFrame]:
+    """Normalize scraped items into keyed tables.
+
+    Rows are accumulated column-wise and each table is built with a single
+    DataFrame constructor call. An item listed twice is exported once, with
+    its first occurrence.
+
+    Args:
+        items: Scraped items. Reviews may be attached under ``"reviews"``.
+        reviews: Reviews keyed by the item's detail URL, or by its
+            ``item_id`` as returned by ``fetch_reviews_for_items``, in
+            addition to any attached ones.
+        base_url: Base URL relative detail URLs are resolved against.
+
+    Returns:
+        DataFrames for the ``item``, ``item_cast``, ``item_platform``,
+        ``item_genre`` and ``review`` tables, with int64 surrogate IDs.
+    """
+    reviews_by_id = {
+        key if isinstance(key, int) else item_id({"detailUrl": key}, base_url): found
+        for key, found in (reviews or {}).items()
+    }
+    tables = _TableBuilder()
+    seen = set()
+    for item in items:
+        iid = item_id(item, base_url)
+        if iid in seen:
+            continue
+        seen.add(iid)
+        _add_item(tables, iid, item)
+        _add_reviews(
+            tables,
+            iid,
+            _as_list(item.get("reviews")) + reviews_by_id.get(iid, []),
+        )
+    return tables.frames()
+
+
+def write_tables(
+    tables: Dict[str, pd.DataFrame], output_dir: Union[str, Path]
+) -> Dict[str, Path]:
+    """Write export tables as one zstd-compressed Parquet file per table.
+
+    Args:
+        tables: Tables as returned by :func:`build_tables`.
+        output_dir: Directory for the table files.
+
+    Returns:
+        Path of each written table file.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name, df in tables.items():
+        paths[name] = output_dir / f"{name}.parquet"
+        df.to_parquet(paths[name], index=False, compression="zstd")
+        logger.debug("Wrote %d rows to %s", len(df), paths[name])
+    return paths
@@ -0,0 +1,282 @@
+"""Application-level retries for Firecrawl POST calls.
+
+urllib3 never retries POST on a bad status, and every Firecrawl endpoint is
+a POST, so all retries happen here instead; the client's sessions do none of
+their own. Responses are classified, retryable failures are retried with
+jittered exponential backoff (honouring ``Retry-After``), and the number of
+retries per run is capped by a shared budget.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+DEFAULT_RETRY_BUDGET = 50
+
+
+class FirecrawlError(requests.exceptions.RequestException):
+    """Base class for classified Firecrawl call failures."""
+
+
+class RetryableError(FirecrawlError):
+    """Transient failure (throttling, 5xx, dropped connection)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+class PermanentError(FirecrawlError):
+    """Failure that will not go away by retrying (4xx other than 408/429)."""
+
+
+class MalformedPayloadError(FirecrawlError):
+    """Response body was not the JSON object the API promises."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header into seconds.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_response(response: requests.Response) -> Dict[str, Any]:
+    """Return the JSON body of a response or raise a classified error.
+
+    Args:
+        response: Response from a Firecrawl endpoint.
+
+    Returns:
+        The decoded JSON object.
+
+    Raises:
+        RetryableError: For 408, 429 and 5xx gateway/availability errors.
+        PermanentError: For any other non-2xx status.
+        MalformedPayloadError: If the body is not a JSON object.
+    """
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise RetryableError(
+            f"HTTP {response.status_code} from {response.url}",
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            response=response,
+        )
+    if not response.ok:
+        raise PermanentError(
+            f"HTTP {response.status_code} from {response.url}", response=response
+        )
+    try:
+        payload = response.json()
+    except ValueError as e:
+        raise MalformedPayloadError(
+            f"Invalid JSON from {response.url}: {e}", response=response
+        ) from e
+    if not isinstance(payload, dict):
+        raise MalformedPayloadError(
+            f"Expected a JSON object from {response.url}, "
+            f"got {type(payload).__name__}",
+            response=response,
+        )
+    return payload
+
+
+class RetryBudget:
+    """Thread-safe cap on the number of retries spent in one run."""
+
+    def __init__(self, max_retries: int = DEFAULT_RETRY_BUDGET):
+        """Initialize the budget.
+
+        Args:
+            max_retries: Total retries allowed across all calls.
+        """
+        self.max_retries = max_retries
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """Number of retries still available."""
+        return max(0, self.max_retries - self.spent)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget.
+
+        Returns:
+            True if a retry was available, False if the budget is exhausted.
+        """
+        with self._lock:
+            if self.spent >= self.max_retries:
+                return False
+            self.spent += 1
+            return True
+
+
+class RetryPolicy:
+    """Retry schedule for Firecrawl calls.
+
+    Retryable errors are retried up to ``max_attempts`` in total, malformed
+    payloads at most ``max_malformed_retries`` times, permanent errors never.
+    Each retry waits a full-jitter exponential delay, or the server's
+    ``Retry-After`` if that is longer.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_malformed_retries: int = 1,
+        budget: Optional[RetryBudget] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        """Initialize the policy.
+
+        Args:
+            max_attempts: Maximum number of attempts per call, including the
+                first one.
+            base_delay: Backoff ceiling for the first retry, in seconds.
+            max_delay: Upper bound for the jittered backoff, in seconds.
+            max_malformed_retries: Retries allowed for malformed payloads.
+            budget: Retry budget shared by every call using this policy.
+            sleep: Sleep function, injectable for tests.
+            rng: Uniform [0, 1) random source, injectable for tests.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_malformed_retries = max_malformed_retries
+        self.budget = budget if budget is not None else RetryBudget()
+        self._sleep = sleep
+        self._rng = rng
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return how long to wait before retry number ``attempt``.
+
+        Args:
+            attempt: 1-based retry number.
+            retry_after: Server-requested delay, if any.
+
+        Returns:
+            Delay in seconds.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = ceiling * self._rng()
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    @staticmethod
+    def _attempt(send: Callable[[], requests.Response]) -> Dict[str, Any]:
+        """Make one attempt, classifying dropped connections as retryable."""
+        try:
+            response = send()
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.RetryError,
+        ) as e:
+            raise RetryableError(f"{type(e).__name__}: {e}") from e
+        return classify_response(response)
+
+    def call(
+        self,
+        send: Callable[[], requests.Response],
+        description: str = "request",
+        deadline: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Send a request, retrying it according to the policy.
+
+        Args:
+            send: Callable performing one attempt and returning the response.
+            description: Short label used in log messages.
+            deadline: :class:`~.deadline.Deadline` of the call. No retry is
+                made whose backoff would not end before it.
+
+        Returns:
+            The decoded JSON body of the first successful response.
+
+        Raises:
+            FirecrawlError: The classified error of the last attempt.
+            requests.exceptions.RequestException: Transport errors other than
+                connection failures and timeouts.
+        """
+        malformed_retries = 0
+        attempt = 1
+        while True:
+            try:
+                return self._attempt(send)
+            except MalformedPayloadError as e:
+                if malformed_retries >= self.max_malformed_retries:
+                    raise
+                malformed_retries += 1
+                error: FirecrawlError = e
+            except RetryableError as e:
+                error = e
+
+            if attempt >= self.max_attempts:
+                raise error
+            delay = self.backoff(attempt, getattr(error, "retry_after", None))
+            if deadline is not None and delay >= deadline.remaining():
+                logger.warning(f"Deadline too close to retry {description}")
+                raise error
+            if not self.budget.try_spend():
+                logger.warning(f"Retry budget exhausted, giving up on {description}")
+                raise error
+
+            logger.warning(
+                f"Retrying {description} after {error} "
+                f"(attempt {attempt + 1}/{self.max_attempts}) in {delay:.1f}s"
+            )
+            self._sleep(delay)
+            attempt += 1
+
+
+_default_policy: Optional[RetryPolicy] = None
+_default_policy_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy used for Firecrawl calls.
+
+    Its budget is read from ``FIRECRAWL_RETRY_BUDGET`` on first use.
+
+    Returns:
+        RetryPolicy: The shared policy instance.
+    """
+    global _default_policy
+    with _default_policy_lock:
+        if _default_policy is None:
+            _default_policy = RetryPolicy(
+                budget=RetryBudget(
+                    int(os.getenv("FIRECRAWL_RETRY_BUDGET", DEFAULT_RETRY_BUDGET))
+                )
+            )
+        return _default_policy
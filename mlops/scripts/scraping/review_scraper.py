@@ -1,78 +1,161 @@
 """Scraper for fetching reviews for movies and TV shows using the Firecrawl direct API."""
 
+import asyncio
 import logging
-import os
-from typing import Any, Dict, List, Optional
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
-from pathlib import Path
+
+import pandas as pd
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from dotenv import load_dotenv
 
+from ..preprocessing.parsers import parse_date
 from ..utils.config_loader import load_config
+from .cache import get_response_cache
+from .deadline import Deadline, current_deadline, deadline_scope
+from .domain_stats import get_domain_stats
+from .firecrawl_client import get_firecrawl_client
+from .journal import RunJournal
+from .logging_setup import payload_summary, setup_logging
+from .negative_cache import get_negative_cache
+from .relational_export import item_id
+from .retry import MalformedPayloadError, PermanentError
 
 logger = logging.getLogger(__name__)
 
+# Concurrent review page scrapes per item unless configured otherwise
+DEFAULT_REVIEW_PAGE_WORKERS = 3
 
-# --- API Key Handling and Session Setup ---
-def load_env_vars() -> str:
-    """Load environment variables from .env file in project root.
+# Concurrent Firecrawl calls across all items of a batch
+DEFAULT_BATCH_CONCURRENCY = 8
 
-    Returns:
-        str: The Firecrawl API key from environment variables.
+# Cached search results are kept shorter for new releases, whose reviews
+# are still coming in
+DEFAULT_SEARCH_TTL_HOURS = 72
+DEFAULT_NEW_RELEASE_SEARCH_TTL_HOURS = 12
+DEFAULT_NEW_RELEASE_DAYS = 7
+
+review_extract_prompt = (
+    "Extract up to {max_reviews_per_site} distinct reviews from this page. "
+    "For each review, provide: the review text itself (review_text), "
+    "any stated original score or rating (original_score, e.g., '8/10', '4 stars', 'A-'), "
+    "and the name of the reviewer or publication if clearly identifiable (reviewer_name). "
+    "Focus on actual review content, not summaries or metadata about the movie/show itself."
+)
+
+review_extract_schema = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "reviewer_name": {
+                "type": "string",
+                "description": "Name of the reviewer or publication",
+            },
+            "review_text": {
+                "type": "string",
+                "description": "The full text of the review",
+            },
+            "original_score": {
+                "type": "string",
+                "description": "The score given in the review, as text",
+            },
+        },
+        "required": ["review_text"],
+    },
+}
 
-    Raises:
-        FileNotFoundError: If .env file is not found.
-        ValueError: If FIRECRAWL_API_KEY is not set in .env file.
+
+def _has_review_extraction(response: Dict[str, Any]) -> bool:
+    """Return whether a scrape response carries a list of extracted reviews."""
+    data = response.get("data")
+    return isinstance(data, dict) and (
+        isinstance(data.get("llm_extraction"), list)
+        or isinstance(data.get("extracted_data"), list)
+    )
+
+
+def _scrape_cached(
+    payload: Dict[str, Any],
+    cacheable: Callable[[Dict[str, Any]], bool],
+    on_fetch: Optional[Callable[[float], None]] = None,
+) -> Dict[str, Any]:
+    """Scrape a page with the shared client, answered from the response cache when it is enabled.
+
+    ``on_fetch`` is called with the latency of the scrape if one was sent,
+    and not at all when the response came from the cache.
     """
-    # Get the project root directory (3 levels up from this script)
-    project_root = Path(__file__).resolve().parent.parent.parent.parent
-    # Assuming this script is in mlops/scripts/scraping, .env is at project root
-    env_path = project_root / ".env"
-
-    if not env_path.exists():
-        # Try one level higher if structure is different (e.g. running from mlops/scripts)
-        project_root_alt = Path(__file__).resolve().parent.parent.parent
-        env_path_alt = project_root_alt / ".env"
-        if not env_path_alt.exists():
-            msg = (
-                f".env file not found at {env_path} or {env_path_alt}. "
-                "Please create one with FIRECRAWL_API_KEY=your-api-key"
-            )
-            logger.error(msg)
-            raise FileNotFoundError(msg)
-        env_path = env_path_alt
-
-    load_dotenv(env_path)
-    logger.info(f"Loaded .env file from: {env_path}")
-
-    api_key = os.getenv("FIRECRAWL_API_KEY")
-    if not api_key:
-        msg = "FIRECRAWL_API_KEY not found in environment variables."
-        logger.error(msg)
-        raise ValueError(msg)
-    logger.info("FIRECRAWL_API_KEY loaded successfully.")
-    return api_key
-
-
-API_KEY = load_env_vars()
-SESSION = requests.Session()
-SESSION.headers.update(
-    {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json",
+    client = get_firecrawl_client()
+    cache = get_response_cache()
+
+    def fetch() -> Dict[str, Any]:
+        start = time.monotonic()
+        response = client.scrape(payload)
+        if on_fetch is not None:
+            on_fetch(time.monotonic() - start)
+        return response
+
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch("scrape", payload, fetch, cacheable)
+
+
+def _has_search_results(response: Dict[str, Any]) -> bool:
+    """Return whether a search response lists at least one page."""
+    return isinstance(response.get("data"), list) and bool(response["data"])
+
+
+def _search_cached(payload: Dict[str, Any], ttl: Optional[float]) -> Dict[str, Any]:
+    """Search with the shared client, answered from the response cache when it is enabled.
+
+    Cache entries are keyed by the normalized query and the result limit,
+    so spelling variants of the same query share one entry.
+    """
+    client = get_firecrawl_client()
+    cache = get_response_cache()
+    if cache is None:
+        return client.search(payload)
+    key = {
+        "query": " ".join(payload["query"].lower().split()),
+        "limit": payload["searchOptions"]["limit"],
     }
-)
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-)
-adapter = HTTPAdapter(max_retries=retry_strategy)
-SESSION.mount("https://", adapter)
-SESSION.mount("http://", adapter)
-# --- End API Key Handling and Session Setup ---
+    return cache.get_or_fetch(
+        "search", key, lambda: client.search(payload), _has_search_results, ttl
+    )
+
+
+def release_dates(items: List[Dict[str, Any]]) -> pd.Series:
+    """Parse the release date of every item, falling back to its year."""
+    return parse_date(
+        [item.get("releaseDate") or item.get("yearReleased") for item in items]
+    )
+
+
+def search_ttl(release_date: Optional[pd.Timestamp], config: Dict[str, Any]) -> float:
+    """Return how long to cache the review search of an item, in seconds.
+
+    Titles released within ``new_release_days`` (or of unknown age) get
+    ``new_release_search_ttl_hours``, older ones ``review_search_ttl_hours``.
+
+    Args:
+        release_date: Release date of the item, or None/NaT if unknown.
+        config: The ``scraping`` section of the configuration.
+
+    Returns:
+        The TTL in seconds.
+    """
+    new_release_days = config.get("new_release_days", DEFAULT_NEW_RELEASE_DAYS)
+    if pd.isna(release_date) or (
+        pd.Timestamp.now() - release_date < pd.Timedelta(days=new_release_days)
+    ):
+        hours = config.get(
+            "new_release_search_ttl_hours", DEFAULT_NEW_RELEASE_SEARCH_TTL_HOURS
+        )
+    else:
+        hours = config.get("review_search_ttl_hours", DEFAULT_SEARCH_TTL_HOURS)
+    return hours * 3600
 
 
 def _get_domain_name(url: str) -> str:
@@ -99,9 +182,16 @@ def _get_domain_name(url: str) -> str:
 
 
 def _search_for_review_pages(
-    item_title: str, item_detail_url: str, search_limit: int
+    item_title: str,
+    item_detail_url: str,
+    search_limit: int,
+    ttl: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
-    """Search for review pages using Firecrawl's direct API."""
+    """Search for review pages using Firecrawl's direct API.
+
+    Results are cached for ``ttl`` seconds when the response cache is
+    enabled, or for the cache's search TTL if None.
+    """
     search_query = f"{item_title} movie reviews"
     if "tv-show" in item_detail_url or "series" in item_detail_url.lower():
         search_query = f"{item_title} TV series reviews"
@@ -113,9 +203,7 @@ def _search_for_review_pages(
         # "pageOptions": { "fetchTimeout": 15000 } # Optional
     }
     try:
-        response = SESSION.post("https://api.firecrawl.dev/v1/search", json=payload)
-        response.raise_for_status()
-        search_results = response.json()
+        search_results = _search_cached(payload, ttl)
 
         if search_results and isinstance(search_results.get("data"), list):
             # Firecrawl search API returns a list of dicts with 'url', 'title', 'markdown', 'metadata'
@@ -127,7 +215,9 @@ def _search_for_review_pages(
             ]
 
         logger.warning(
-            f"Unexpected format or empty data from review search for '{item_title}'. Response: {search_results}"
+            "Unexpected format or empty data from review search for '%s'. Response: %s",
+            item_title,
+            payload_summary(search_results),
         )
         return []
     except requests.exceptions.RequestException as e_req:
@@ -144,6 +234,45 @@ def _search_for_review_pages(
         return []
 
 
+def _record_page_outcome(
+    page_url: str,
+    failure: Optional[str],
+    reviews: int = 0,
+    seconds: Optional[float] = None,
+):
+    """Record whether a page yielded reviews in the negative cache and domain stats.
+
+    Args:
+        page_url: Scraped review page.
+        failure: Why the page yielded no reviews, or None if it did.
+        reviews: Valid reviews the page yielded.
+        seconds: Time the scrape took, or None if it was answered from the
+            response cache and says nothing about the domain's latency.
+    """
+    domain = _get_domain_name(page_url)
+    stats = get_domain_stats()
+    if stats is not None and seconds is not None:
+        stats.record(domain, reviews, seconds)
+    cache = get_negative_cache()
+    if cache is None:
+        return
+    if failure is None:
+        cache.record_success(page_url, domain)
+    else:
+        cache.record_failure(page_url, domain, failure)
+
+
+def _is_penalized(page_url: str) -> bool:
+    """Return whether the negative cache says to skip a candidate page."""
+    cache = get_negative_cache()
+    if cache is None:
+        return False
+    reason = cache.blocked_reason(page_url, _get_domain_name(page_url))
+    if reason is not None:
+        logger.info(f"Skipping review candidate {page_url}: {reason}")
+    return reason is not None
+
+
 def _scrape_reviews_from_page(
     page_url: str,
     page_title: str,
@@ -168,10 +297,12 @@ def _scrape_reviews_from_page(
         # "pageOptions": { "waitFor": 3000 }, # Optional
         # "scrapeOptions": { "onlyMainContent": True } # Optional
     }
+    fetch_seconds: List[float] = []
+    start = time.monotonic()
     try:
-        response = SESSION.post("https://api.firecrawl.dev/v1/scrape", json=payload)
-        response.raise_for_status()
-        scraped_page_data = response.json()
+        scraped_page_data = _scrape_cached(
+            payload, _has_review_extraction, fetch_seconds.append
+        )
 
         extracted_data = None
         if (
@@ -208,17 +339,38 @@ def _scrape_reviews_from_page(
                     page_reviews.append(full_review)
                 else:
                     logger.warning(
-                        f"Skipping invalid review data from {page_url}: {review_data}"
+                        "Skipping invalid review data from %s: %s",
+                        page_url,
+                        payload_summary(review_data),
                     )
         else:
             logger.warning(
-                f"No reviews extracted or unexpected format from {page_url}. Response: {scraped_page_data}"
+                "No reviews extracted or unexpected format from %s. Response: %s",
+                page_url,
+                payload_summary(scraped_page_data),
             )
+        if page_reviews:
+            failure = None
+        elif extracted_data:
+            failure = "no valid reviews"
+        else:
+            failure = "no extraction"
+        _record_page_outcome(
+            page_url,
+            failure,
+            len(page_reviews),
+            fetch_seconds[0] if fetch_seconds else None,
+        )
     except requests.exceptions.RequestException as e_req:
         logger.error(
             f"Request error scraping review page {page_url} for '{item_title}': {e_req}",
             exc_info=True,
         )
+        # Blocked or unparseable pages will fail again; transient errors may not
+        if isinstance(e_req, (PermanentError, MalformedPayloadError)):
+            _record_page_outcome(
+                page_url, type(e_req).__name__, seconds=time.monotonic() - start
+            )
     except Exception as e_scrape:
         logger.error(
             f"Error processing scrape response for review page {page_url} for '{item_title}': {e_scrape}",
@@ -228,23 +380,191 @@ def _scrape_reviews_from_page(
     return page_reviews
 
 
+def _top_pages(
+    item_title: str, search_results: List[Dict[str, Any]], max_pages: int
+) -> List[Dict[str, Any]]:
+    """Return the top search results worth scraping.
+
+    Results without a URL, or that the negative cache penalizes, are
+    skipped in favour of the next ones. With domain statistics enabled, the
+    remaining results are ordered by the expected reviews per second of
+    their domains and those of unproductive domains are dropped.
+    """
+    candidates = []
+    for result in search_results:
+        if not result.get("url"):
+            logger.warning(
+                "Search result for '%s' missing URL: %s",
+                item_title,
+                payload_summary(result),
+            )
+            continue
+        if _is_penalized(result["url"]):
+            continue
+        candidates.append(result)
+
+    stats = get_domain_stats()
+    if stats is not None and candidates:
+        order = stats.rank([_get_domain_name(page["url"]) for page in candidates])
+        for position in sorted(set(range(len(candidates))) - set(order)):
+            logger.info(
+                f"Skipping review candidate {candidates[position]['url']}: its domain rarely yields reviews"
+            )
+        candidates = [candidates[position] for position in order]
+    return candidates[:max_pages]
+
+
+def _scrape_pages_in_rank_order(
+    item_title: str,
+    pages: List[Dict[str, Any]],
+    scrape_page: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+    max_total_reviews: int,
+    max_reviews_per_site: int,
+    max_workers: int,
+    wait_for_abandoned: bool = False,
+) -> List[Dict[str, Any]]:
+    """Scrape review pages concurrently, keeping the reviews in page order.
+
+    A page is only started while the pages in flight could still be needed
+    to reach ``max_total_reviews``, assuming each yields
+    ``max_reviews_per_site``. As soon as the best-ranked finished pages hold
+    enough reviews, the pages not started yet are cancelled and those still
+    running are left to finish in the background, or waited for with
+    ``wait_for_abandoned``. Page scrapes run under the caller's deadline;
+    when it passes, the reviews of the pages finished so far are returned.
+    """
+    deadline = current_deadline()
+
+    def run(page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Worker threads do not inherit the caller's deadline scope
+        with deadline_scope(deadline):
+            return scrape_page(page)
+
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    pending: Dict[Future, int] = {}
+    next_rank = 0
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, max_workers), thread_name_prefix="reviews"
+    )
+    try:
+        while len(_ranked_prefix(results)) < max_total_reviews:
+            for _ in range(
+                _pages_to_start(
+                    results, len(pending), max_total_reviews, max_reviews_per_site
+                )
+            ):
+                if next_rank >= len(pages):
+                    break
+                pending[executor.submit(run, pages[next_rank])] = next_rank
+                next_rank += 1
+            if not pending:
+                break
+
+            timeout = deadline.remaining() if deadline is not None else None
+            if timeout is not None and math.isinf(timeout):
+                timeout = None  # An unlimited deadline; wait() rejects inf
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.warning(
+                    f"Deadline reached for '{item_title}', skipping {len(pending)} review pages."
+                )
+                break
+            for future in done:
+                results[pending.pop(future)] = future.result()
+        else:
+            logger.info(
+                f"Reached max total reviews ({max_total_reviews}) for {item_title}."
+            )
+    finally:
+        executor.shutdown(wait=wait_for_abandoned, cancel_futures=True)
+
+    ranked = [review for rank in sorted(results) for review in results[rank]]
+    return ranked[:max_total_reviews]
+
+
+def _pages_to_start(
+    results: Dict[int, List[Dict[str, Any]]],
+    in_flight: int,
+    max_total_reviews: int,
+    max_reviews_per_site: int,
+) -> int:
+    """Return how many more pages could still be needed to reach the total.
+
+    Pages in flight are assumed to yield ``max_reviews_per_site`` reviews.
+    """
+    per_page = max(1, max_reviews_per_site)
+    expected = sum(map(len, results.values())) + in_flight * per_page
+    return max(0, -(-(max_total_reviews - expected) // per_page))
+
+
+def _ranked_prefix(results: Dict[int, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Return the reviews of the unbroken run of finished pages from rank 0."""
+    prefix: List[Dict[str, Any]] = []
+    rank = 0
+    while rank in results:
+        prefix.extend(results[rank])
+        rank += 1
+    return prefix
+
+
 def fetch_reviews_for_item(
     item_title: str,
     item_detail_url: str,  # Kept for context
     max_search_results_to_process: int = 3,  # Max search results to attempt to scrape
     max_reviews_per_site: int = 1,  # Max reviews to extract from a single site page
+    deadline: Optional[Deadline] = None,
+    release_date: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """Fetch reviews for a given movie/TV show using Firecrawl's direct API.
 
-    Orchestrates searching for review pages and then scraping each page.
+    Orchestrates searching for review pages and then scraping the top ones,
+    up to ``scraping.review_page_workers`` at a time. Reviews come back in
+    the order of their pages: search rank, or with domain statistics
+    enabled, the expected reviews per second of the page's domain (see
+    ``DomainStats.rank``), ties keeping search rank and pages of
+    unproductive domains skipped.
+    The search and the page scrapes share ``deadline`` and any deadline
+    scope the caller is in, e.g. one covering the item's detail fetch too.
+    Pages not reached when it runs out are skipped and the reviews collected
+    so far are returned. ``release_date``, as scraped, sets how long the
+    search results are cached (see :func:`search_ttl`).
+    """
+    with deadline_scope(deadline):
+        return _collect_reviews(
+            item_title,
+            item_detail_url,
+            max_search_results_to_process,
+            max_reviews_per_site,
+            parse_date([release_date]).iloc[0],
+        )
+
+
+def _collect_reviews(
+    item_title: str,
+    item_detail_url: str,
+    max_search_results_to_process: int,
+    max_reviews_per_site: int,
+    release_date: Optional[pd.Timestamp] = None,
+    page_workers: Optional[int] = None,
+    wait_for_abandoned: bool = False,
+) -> List[Dict[str, Any]]:
+    """Search for review pages and scrape them, within the current deadline.
+
+    ``page_workers`` defaults to ``scraping.review_page_workers``. With
+    ``wait_for_abandoned``, page scrapes no longer needed, e.g. once the
+    deadline passed, are waited for before returning rather than left to
+    finish in the background.
     """
     config = load_config()
     search_limit = config.get("scraping", {}).get("review_search_limit", 5)
     max_total_reviews = config.get("scraping", {}).get("max_total_reviews_per_item", 5)
+    ttl = search_ttl(release_date, config.get("scraping", {}))
 
     logger.info(f"Fetching reviews for: '{item_title}' (Source URL: {item_detail_url})")
 
-    search_results = _search_for_review_pages(item_title, item_detail_url, search_limit)
+    search_results = _search_for_review_pages(
+        item_title, item_detail_url, search_limit, ttl=ttl
+    )
 
     if not search_results:
         logger.info(f"No search results found for review query for '{item_title}'")
@@ -254,65 +574,31 @@ def fetch_reviews_for_item(
         f"Found {len(search_results)} potential review pages for '{item_title}'. Processing top {max_search_results_to_process}."
     )
 
-    review_extract_prompt = (
-        "Extract up to {max_reviews_per_site} distinct reviews from this page. "
-        "For each review, provide: the review text itself (review_text), "
-        "any stated original score or rating (original_score, e.g., '8/10', '4 stars', 'A-'), "
-        "and the name of the reviewer or publication if clearly identifiable (reviewer_name). "
-        "Focus on actual review content, not summaries or metadata about the movie/show itself."
-    )
-
-    review_extract_schema = {
-        "type": "array",
-        "items": {
-            "type": "object",
-            "properties": {
-                "reviewer_name": {
-                    "type": "string",
-                    "description": "Name of the reviewer or publication",
-                },
-                "review_text": {
-                    "type": "string",
-                    "description": "The full text of the review",
-                },
-                "original_score": {
-                    "type": "string",
-                    "description": "The score given in the review, as text",
-                },
-            },
-            "required": ["review_text"],
-        },
-    }
-
-    collected_reviews: List[Dict[str, Any]] = []
-    for result in search_results[:max_search_results_to_process]:
-        if len(collected_reviews) >= max_total_reviews:
-            logger.info(
-                f"Reached max total reviews ({max_total_reviews}) for {item_title}."
-            )
-            break
-
-        page_url = result.get("url")
-        page_title = result.get("title", "Unknown Page")
-
-        if not page_url:
-            logger.warning(f"Search result for '{item_title}' missing URL: {result}")
-            continue
+    if page_workers is None:
+        page_workers = config.get("scraping", {}).get(
+            "review_page_workers", DEFAULT_REVIEW_PAGE_WORKERS
+        )
+    pages = _top_pages(item_title, search_results, max_search_results_to_process)
 
-        reviews_from_page = _scrape_reviews_from_page(
-            page_url,
-            page_title,
+    def scrape_page(page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return _scrape_reviews_from_page(
+            page["url"],
+            page.get("title", "Unknown Page"),
             item_title,
             max_reviews_per_site,
             review_extract_prompt,
             review_extract_schema,
         )
 
-        for review in reviews_from_page:
-            if len(collected_reviews) < max_total_reviews:
-                collected_reviews.append(review)
-            else:
-                break  # Break inner loop if max_total_reviews reached
+    collected_reviews = _scrape_pages_in_rank_order(
+        item_title,
+        pages,
+        scrape_page,
+        max_total_reviews,
+        max_reviews_per_site,
+        page_workers,
+        wait_for_abandoned,
+    )
 
     if not collected_reviews:
         logger.info(f"No reviews ultimately collected for '{item_title}'.")
@@ -324,15 +610,178 @@ def fetch_reviews_for_item(
     return collected_reviews
 
 
-if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO)
+def _collect_item_reviews(
+    item: Dict[str, Any],
+    max_search_results_to_process: int,
+    max_reviews_per_site: int,
+    item_budget: Optional[float],
+    release_date: Optional[pd.Timestamp],
+    page_workers: int,
+    journal: Optional[RunJournal] = None,
+    run_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Collect the reviews of one batch item on a batch worker thread.
+
+    The item's budget starts here, with its first Firecrawl call, rather
+    than when the batch was started. The thread, and so the item's batch
+    slot, is only released once its abandoned page scrapes have finished,
+    keeping the calls in flight within the batch concurrency. With a
+    journal, reviews already journaled for the item in ``run_id`` are
+    returned without any calls.
+    """
+
+    def collect() -> List[Dict[str, Any]]:
+        with deadline_scope(Deadline(item_budget) if item_budget else None):
+            return _collect_reviews(
+                item.get("title") or "",
+                item.get("detailUrl") or "",
+                max_search_results_to_process,
+                max_reviews_per_site,
+                release_date,
+                page_workers=page_workers,
+                wait_for_abandoned=True,
+            )
+
+    if journal is None:
+        return collect()
+    return journal.run_task(run_id, "review", str(item_id(item)), collect)
 
-    # Ensure API_KEY is loaded (it's done globally at script start via load_env_vars()).
-    # No need to load .env here explicitly as it's handled by the global API_KEY initialization.
 
-    # The API_KEY is now global, so no need to pass it around or fetch from env here.
-    # If API_KEY is not set, the script would have failed at `load_env_vars()`.
-    logger.info(f"Using globally loaded FIRECRAWL_API_KEY for '{sample_movie_title}'.")
+def _batch_workers(max_concurrency: Optional[int]) -> Tuple[int, int]:
+    """Return the items and pages per item a review batch runs at once."""
+    config = load_config().get("scraping", {})
+    if max_concurrency is None:
+        max_concurrency = config.get(
+            "review_batch_concurrency", DEFAULT_BATCH_CONCURRENCY
+        )
+    max_concurrency = max(1, max_concurrency)
+    page_workers = min(
+        max_concurrency,
+        max(1, config.get("review_page_workers", DEFAULT_REVIEW_PAGE_WORKERS)),
+    )
+    return max(1, max_concurrency // page_workers), page_workers
+
+
+async def iter_reviews_for_items(
+    items: List[Dict[str, Any]],
+    max_search_results_to_process: int = 3,
+    max_reviews_per_site: int = 1,
+    max_concurrency: Optional[int] = None,
+    item_budget: Optional[float] = None,
+    journal: Optional[RunJournal] = None,
+    run_id: Optional[int] = None,
+) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Fetch reviews for many items at once, yielding each item as it finishes.
+
+    Items are collected like :func:`fetch_reviews_for_item`, several at a
+    time on worker threads, so that one item's search and page scrapes run
+    back to back. Each item scrapes up to ``scraping.review_page_workers``
+    pages at a time, and only as many items run at once as keep the
+    Firecrawl calls in flight within ``max_concurrency``. All calls also go
+    through the shared client's rate limiter. Items are yielded in
+    completion order; the reviews of each item keep the rank order of their
+    pages.
+
+    Args:
+        items: Items as returned by ``get_new_releases``, with ``title`` and
+            ``detailUrl``. Items sharing an ID are fetched once.
+        max_search_results_to_process: Search results scraped per item.
+        max_reviews_per_site: Reviews extracted from a single page.
+        max_concurrency: Firecrawl calls in flight across all items. Defaults
+            to ``scraping.review_batch_concurrency``.
+        item_budget: Seconds allowed per item, counted from its first call.
+            None means no limit.
+        journal: Progress journal recording each item's reviews as a
+            ``"review"`` task keyed by its ``item_id``. Items already done
+            in ``run_id`` are taken from the journal without any calls.
+        run_id: Journal run to record into or resume. Required with
+            ``journal``.
+
+    Yields:
+        Tuples of the item's ``item_id``, as in the relational export, and
+        its reviews.
+    """
+    if journal is not None and run_id is None:
+        raise ValueError("run_id is required when a journal is given")
+    max_items, page_workers = _batch_workers(max_concurrency)
+
+    unique_items: Dict[int, Dict[str, Any]] = {}
+    for item in items:
+        unique_items.setdefault(item_id(item), item)
+    released = release_dates(list(unique_items.values()))
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_items, thread_name_prefix="reviews")
+    # Items wait here rather than in the executor queue, so that none of them
+    # is started before a worker is free to run it
+    slots = asyncio.Semaphore(max_items)
+
+    async def collect(item: Dict[str, Any], release_date) -> List[Dict[str, Any]]:
+        async with slots:
+            return await loop.run_in_executor(
+                executor,
+                _collect_item_reviews,
+                item,
+                max_search_results_to_process,
+                max_reviews_per_site,
+                item_budget,
+                release_date,
+                page_workers,
+                journal,
+                run_id,
+            )
+
+    tasks: Dict[asyncio.Future, int] = {}
+    try:
+        for (iid, item), release_date in zip(unique_items.items(), released):
+            tasks[asyncio.ensure_future(collect(item, release_date))] = iid
+        logger.info(
+            f"Fetching reviews for {len(tasks)} items, {max_items} at a time "
+            f"with up to {page_workers} pages each"
+        )
+
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                iid = tasks.pop(task)
+                try:
+                    reviews = task.result()
+                except Exception as e:
+                    title = unique_items[iid].get("title")
+                    logger.error(
+                        f"Error fetching reviews for '{title}': {e}", exc_info=True
+                    )
+                    reviews = []
+                yield iid, reviews
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Items not started yet are dropped; running ones finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def fetch_reviews_for_items(
+    items: List[Dict[str, Any]], **kwargs
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Fetch reviews for many items at once.
+
+    Takes the same arguments as :func:`iter_reviews_for_items`; use that
+    function instead to handle items as they finish. From synchronous code,
+    run it with ``asyncio.run(fetch_reviews_for_items(items))``.
+
+    Returns:
+        Reviews of every item, keyed by ``item_id``. Pass them to
+        ``relational_export.build_tables`` as its ``reviews``.
+    """
+    return {
+        iid: reviews async for iid, reviews in iter_reviews_for_items(items, **kwargs)
+    }
+
+
+if __name__ == "__main__":
+    setup_logging()
+
+    # The shared Firecrawl client loads FIRECRAWL_API_KEY on the first request.
 
     sample_movie_title = "Inception"
     sample_movie_url = "https://www.justwatch.com/us/movie/inception"
@@ -364,7 +813,6 @@ if __name__ == "__main__":
     sample_tv_show_title = "Breaking Bad"
     sample_tv_show_url = "https://www.justwatch.com/us/tv-show/breaking-bad"
 
-    logger.info(f"Using globally loaded FIRECRAWL_API_KEY for '{sample_tv_show_title}'.")
     print(
         f"\nFetching reviews for '{sample_tv_show_title}' using Firecrawl direct API..."
     )
@@ -0,0 +1,135 @@
+"""Incremental, crash-safe writers for scraped items."""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+
+class JsonlSink:
+    """Append items to a compact JSONL file as they arrive.
+
+    Items are written to ``<path>.part`` in batches of ``flush_every``, each
+    batch flushed and fsynced, so a killed run loses at most one batch. On
+    :meth:`commit` the part file is atomically renamed to ``path``; readers
+    therefore only ever see a complete file at ``path``. If the sink is used
+    as a context manager and the block raises, the part file is kept for
+    inspection or recovery with :func:`read_jsonl`.
+    """
+
+    def __init__(self, path: Union[str, Path], flush_every: int = 10):
+        """Initialize the sink.
+
+        Args:
+            path: Final path of the JSONL file.
+            flush_every: Number of items buffered before each flush.
+        """
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + ".part")
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._buffer: List[str] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.part_path, "a", encoding="utf-8")
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file.closed:
+            return  # Already committed or aborted inside the block
+        if exc_type is None:
+            self.commit()
+        else:
+            self.close()
+
+    def write(self, item: Dict):
+        """Buffer one item, flushing the batch once it is full.
+
+        Args:
+            item: JSON-serializable item.
+        """
+        self._buffer.append(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+        self.count += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write buffered items and force them to disk."""
+        if not self._buffer:
+            return
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush and close the part file without publishing it."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def commit(self) -> Path:
+        """Flush, close and atomically publish the file.
+
+        Returns:
+            The final path of the JSONL file.
+        """
+        self.close()
+        os.replace(self.part_path, self.path)
+        logger.debug("Committed %d items to %s", self.count, self.path)
+        return self.path
+
+    def abort(self):
+        """Close and delete the part file."""
+        self.close()
+        self.part_path.unlink(missing_ok=True)
+
+
+def read_jsonl(path: Union[str, Path]) -> Iterator[Dict]:
+    """Read items back from a JSONL file.
+
+    A truncated last line, as left by a run killed mid-write, is skipped.
+
+    Args:
+        path: Path of a JSONL file or of a sink's part file.
+
+    Yields:
+        The decoded items in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line {line_no} in {path}")
+
+
+def jsonl_to_json(jsonl_path: Union[str, Path], json_path: Union[str, Path]):
+    """Write a JSONL file out as a compact JSON array, one item per line.
+
+    Lines are copied through without decoding, so memory use stays flat.
+
+    Args:
+        jsonl_path: Source JSONL file.
+        json_path: Destination JSON file.
+    """
+    with open(jsonl_path, encoding="utf-8") as src, open(
+        json_path, "w", encoding="utf-8"
+    ) as dst:
+        dst.write("[")
+        first = True
+        for line in src:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            dst.write("\n" if first else ",\n")
+            dst.write(line)
+            first = False
+        dst.write("\n]\n")
@@ -0,0 +1,100 @@
+"""SQLite helpers shared by the scraper's persistent state stores."""
+
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Generic, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+# How long a writer waits for another process to release the database
+BUSY_TIMEOUT_MS = 30000
+
+DAY = 24 * 3600
+
+
+def connect(path: Union[str, Path]) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode for use from several threads.
+
+    WAL lets readers in other processes proceed while one process writes, and
+    the busy timeout makes concurrent writers wait instead of failing.
+    Callers must serialize their own use of the returned connection across
+    threads.
+
+    Args:
+        path: Database file, created along with its parent directory.
+
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        isolation_level=None,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+
+class SqliteStore:
+    """Base class of the state stores kept in one SQLite database each.
+
+    Subclasses hold ``_lock`` while they use ``_conn``.
+    """
+
+    def __init__(self, path: Union[str, Path], schema: str):
+        """Open or create the database.
+
+        Args:
+            path: SQLite database file.
+            schema: Idempotent DDL creating the store's tables.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        with self._lock:
+            self._conn.executescript(schema)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+StoreT = TypeVar("StoreT", bound=SqliteStore)
+
+
+class SharedStore(Generic[StoreT]):
+    """Process-wide store enabled by a database path in the environment."""
+
+    def __init__(self, env_var: str, factory: Callable[[str], StoreT], name: str):
+        """Describe the store; it is only opened by the first :meth:`get`.
+
+        Args:
+            env_var: Environment variable naming the database file.
+            factory: Opens the store at a path.
+            name: Description used when logging where the store lives.
+        """
+        self.env_var = env_var
+        self.factory = factory
+        self.name = name
+        self._store: Optional[StoreT] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[StoreT]:
+        """Return the shared store, or None if ``env_var`` is not set."""
+        path = os.getenv(self.env_var)
+        if not path:
+            return None
+        with self._lock:
+            if self._store is None:
+                self._store = self.factory(path)
+                logger.info(f"Using {self.name} at {path}")
+            return self._store
@@ -0,0 +1,23 @@
+"""Shared fixtures for the scraping tests."""
+
+import pytest
+
+
+class FakeClock:
+    """Clock that only moves when a test advances it or sleeps on it."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
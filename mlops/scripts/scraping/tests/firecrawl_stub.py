@@ -0,0 +1,158 @@
+"""Local stand-in for the Firecrawl endpoints used by the scrapers."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Union
+
+
+class FirecrawlStub:
+    """Minimal HTTP server mimicking Firecrawl's scrape and batch scrape API.
+
+    ``/v1/scrape`` returns ``listing`` for URLs ending in ``/new`` and the
+    matching entry of ``details`` otherwise. ``listing`` may also map listing
+    page URLs to their items, in which case only those URLs are listings.
+    Batch scrape jobs complete one more page on every status request and
+    paginate status results with ``next`` every ``page_size`` documents;
+    ``documents_served`` counts the documents all status replies carried.
+    ``/v1/search`` returns ``search_results``.
+    Connections are kept alive; ``connections`` records the client address of
+    every request, so tests can tell whether connections were reused. Each
+    status code in ``fail_statuses`` answers one request before normal replies
+    resume.
+    """
+
+    def __init__(
+        self,
+        listing: Union[List[Dict], Dict[str, List[Dict]]],
+        details: Dict[str, Dict],
+        page_size=2,
+    ):
+        self.listing = listing
+        self.details = details
+        self.page_size = page_size
+        self.requests: List[tuple] = []
+        self.search_results: List[Dict] = []
+        self.connections: List[tuple] = []
+        self.authorizations: List[str] = []
+        self.fail_statuses: List[int] = []
+        self.jobs: Dict[str, Dict] = {}
+        self.documents_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self.post_routes = {
+            "/v1/scrape": self._scrape,
+            "/v1/search": self._search,
+            "/v1/batch/scrape": self._start_batch,
+        }
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _document(self, url: str) -> Dict:
+        return {"json": self.details.get(url, {}), "metadata": {"sourceURL": url}}
+
+    def _scrape(self, body: Dict) -> Dict:
+        if isinstance(self.listing, dict):
+            if body["url"] in self.listing:
+                items = self.listing[body["url"]]
+                return {"success": True, "data": {"json": {"items": items}}}
+        elif body["url"].endswith("/new"):
+            return {"success": True, "data": {"json": {"items": self.listing}}}
+        detail = self.details.get(body["url"])
+        return {"success": bool(detail), "data": {"json": detail or {}}}
+
+    def _search(self, body: Dict) -> Dict:
+        return {"success": True, "data": self.search_results}
+
+    def _start_batch(self, body: Dict) -> Dict:
+        with self._lock:
+            job_id = f"job-{len(self.jobs) + 1}"
+            self.jobs[job_id] = {"urls": body["urls"], "completed": 0}
+        return {"success": True, "id": job_id, "url": f"{self.url}/v1/batch/scrape"}
+
+    def _batch_status(self, job_id: str, skip: int) -> Dict:
+        with self._lock:
+            job = self.jobs[job_id]
+            job["completed"] = min(len(job["urls"]), job["completed"] + 1)
+            done = job["urls"][: job["completed"]]
+            end = skip + self.page_size
+            page = done[skip:end]
+            self.documents_served += len(page)
+        status = {
+            "status": "completed" if len(done) == len(job["urls"]) else "scraping",
+            "total": len(job["urls"]),
+            "completed": len(done),
+            "data": [self._document(url) for url in page],
+        }
+        if end < len(done):
+            status["next"] = f"{self.url}/v1/batch/scrape/{job_id}?skip={end}"
+        return status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler routing to the :class:`FirecrawlStub` serving it."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def stub(self) -> FirecrawlStub:
+        return self.server.stub
+
+    def _record(self, method: str, body) -> bool:
+        stub = self.stub
+        stub.requests.append((method, self.path, body))
+        stub.connections.append(self.client_address)
+        stub.authorizations.append(self.headers.get("Authorization"))
+        with stub._lock:
+            status = stub.fail_statuses.pop(0) if stub.fail_statuses else None
+        if status is None:
+            return False
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def _reply(self, payload: Dict):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        if self._record("POST", body):
+            return
+        route = self.stub.post_routes.get(self.path)
+        if route is None:
+            self.send_error(404)
+        else:
+            self._reply(route(body))
+
+    def do_GET(self):
+        if self._record("GET", None):
+            return
+        path, _, query = self.path.partition("?")
+        if not path.startswith("/v1/batch/scrape/"):
+            self.send_error(404)
+            return
+        skip = int(query.split("=", 1)[1]) if query.startswith("skip=") else 0
+        self._reply(self.stub._batch_status(path.rsplit("/", 1)[1], skip))
+
+    def log_message(self, *args):
+        pass
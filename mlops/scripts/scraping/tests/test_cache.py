@@ -0,0 +1,113 @@
+"""Unit tests for the Firecrawl response cache."""
+
+import pytest
+
+from mlops.scripts.scraping.cache import ResponseCache, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(tmp_path / "cache.sqlite", clock=clock)
+    yield cache
+    cache.close()
+
+
+def test_key_covers_whole_payload():
+    """Test that changing the prompt or schema changes the key."""
+    payload = {"url": "https://a", "jsonOptions": {"prompt": "p", "schema": {}}}
+    reordered = {"jsonOptions": {"schema": {}, "prompt": "p"}, "url": "https://a"}
+    changed = {"url": "https://a", "jsonOptions": {"prompt": "q", "schema": {}}}
+
+    assert cache_key("scrape", payload) == cache_key("scrape", reordered)
+    assert cache_key("scrape", payload) != cache_key("scrape", changed)
+    assert cache_key("scrape", payload) != cache_key("search", payload)
+
+
+def test_hit_and_miss_counters(cache):
+    """Test get/put round trip and the hit/miss counters."""
+    payload = {"url": "https://a"}
+    assert cache.get("scrape", payload) is None
+
+    cache.put("scrape", payload, {"success": True, "data": {"json": {"t": "A"}}})
+    assert cache.get("scrape", payload) == {
+        "success": True,
+        "data": {"json": {"t": "A"}},
+    }
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_entries_expire_per_endpoint(tmp_path, clock):
+    """Test that each endpoint keeps entries for its own TTL."""
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite", ttls={"scrape": 100, "search": 10}, clock=clock
+    )
+    cache.put("scrape", {"url": "a"}, {"ok": 1})
+    cache.put("search", {"query": "a"}, {"ok": 2})
+
+    clock.now += 50
+    assert cache.get("scrape", {"url": "a"}) == {"ok": 1}
+    assert cache.get("search", {"query": "a"}) is None
+
+    clock.now += 60
+    assert cache.get("scrape", {"url": "a"}) is None
+    cache.close()
+
+
+def test_entry_ttl_overrides_endpoint_ttl(cache, clock):
+    """Test that a TTL given with a response replaces the endpoint's."""
+    cache.put("search", {"query": "new"}, {"ok": 1}, ttl=10)
+    cache.get_or_fetch("search", {"query": "old"}, lambda: {"ok": 2}, ttl=1000)
+
+    clock.now += 100
+    assert cache.get("search", {"query": "new"}) is None
+    assert cache.get("search", {"query": "old"}) == {"ok": 2}
+
+
+def test_lru_eviction_over_size_cap(tmp_path, clock):
+    """Test that the least recently used entries go first once over the cap."""
+    cache = ResponseCache(tmp_path / "cache.sqlite", clock=clock)
+    cache.put("scrape", {"url": "probe"}, {"body": "x" * 100})
+    entry_size = cache.stats()["bytes"]
+    cache.max_bytes = entry_size * 2
+
+    clock.now += 1
+    cache.put("scrape", {"url": "a"}, {"body": "x" * 100})
+    clock.now += 1
+    cache.put("scrape", {"url": "b"}, {"body": "x" * 100})
+    clock.now += 1
+    assert cache.get("scrape", {"url": "a"}) is not None  # a is now newer than b
+    clock.now += 1
+    cache.put("scrape", {"url": "c"}, {"body": "x" * 100})
+
+    assert cache.get("scrape", {"url": "a"}) is not None
+    assert cache.get("scrape", {"url": "b"}) is None
+    assert cache.get("scrape", {"url": "c"}) is not None
+    assert cache.stats()["entries"] == 2
+    cache.close()
+
+
+def test_get_or_fetch_skips_uncacheable_responses(cache):
+    """Test that responses rejected by the predicate are fetched again."""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"success": len(calls) > 1}
+
+    def ok(response):
+        return response["success"]
+
+    assert cache.get_or_fetch("scrape", {"url": "a"}, fetch, ok) == {"success": False}
+    assert cache.get_or_fetch("scrape", {"url": "a"}, fetch, ok) == {"success": True}
+    assert cache.get_or_fetch("scrape", {"url": "a"}, fetch, ok) == {"success": True}
+    assert len(calls) == 2
+
+
+def test_cache_file_is_shared(tmp_path, cache):
+    """Test that a second connection to the same file sees stored entries."""
+    cache.put("scrape", {"url": "a"}, {"ok": 1})
+    other = ResponseCache(tmp_path / "cache.sqlite", clock=cache._clock)
+    assert other.get("scrape", {"url": "a"}) == {"ok": 1}
+    other.close()
@@ -0,0 +1,191 @@
+"""Unit tests for item and run deadlines."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from mlops.scripts.scraping.deadline import (
+    MIN_TIMEOUT,
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+)
+from mlops.scripts.scraping.firecrawl_client import FirecrawlClient
+from mlops.scripts.scraping.journal import RunJournal
+from mlops.scripts.scraping.justwatch_scraper import JustWatchScraper
+from mlops.scripts.scraping.rate_limiter import RateLimiter
+from mlops.scripts.scraping.retry import RetryableError, RetryPolicy
+
+
+def make_client(**kwargs):
+    session = MagicMock()
+    session.headers = {}
+    response = MagicMock(status_code=200, ok=True)
+    response.json.return_value = {"success": True, "data": {}}
+    session.post.return_value = response
+    client = FirecrawlClient(
+        "test-api-key",
+        rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+        session=session,
+        **kwargs,
+    )
+    return client, session
+
+
+def test_deadline_remaining_cap_and_expiry(clock):
+    """Test that timeouts are capped to the time left until expiry."""
+    deadline = Deadline(5, clock=clock)
+
+    assert deadline.remaining() == 5
+    assert deadline.cap((10.0, 180.0)) == (5, 5)
+    assert deadline.cap(2.0) == 2.0
+    clock.now += 4
+    assert deadline.cap((0.5, 180.0)) == (0.5, 1)
+    clock.now += 2
+    assert deadline.expired()
+    assert deadline.cap(30.0) == MIN_TIMEOUT
+    with pytest.raises(DeadlineExceeded, match="scrape of x"):
+        deadline.check("scrape of x")
+
+    unlimited = Deadline(None, clock=clock)
+    assert not unlimited.expired()
+    assert unlimited.cap((10.0, 180.0)) == (10.0, 180.0)
+
+
+def test_nested_scopes_keep_the_earliest_deadline(clock):
+    """Test that an inner scope cannot outlive the scope around it."""
+    run = Deadline(10, clock=clock)
+    long_item = Deadline(60, clock=clock)
+    short_item = Deadline(2, clock=clock)
+
+    assert current_deadline() is None
+    with deadline_scope(run):
+        with deadline_scope(long_item) as effective:
+            assert effective is run
+        with deadline_scope(short_item) as effective:
+            assert effective is short_item
+        with deadline_scope(None) as effective:
+            assert effective is run
+        assert current_deadline() is run
+    assert current_deadline() is None
+
+
+def test_scopes_are_per_thread():
+    """Test that a scope on one thread does not bound calls on another."""
+    seen = []
+    with deadline_scope(Deadline(1)):
+        thread = threading.Thread(target=lambda: seen.append(current_deadline()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+
+def test_client_caps_timeout_and_fails_past_deadline(clock):
+    """Test that client calls inside a scope respect its deadline."""
+    client, session = make_client(timeout=(10.0, 180.0))
+    deadline = Deadline(3, clock=clock)
+
+    with deadline_scope(deadline):
+        client.scrape({"url": "https://www.justwatch.com/us/movie/a"})
+        assert session.post.call_args.kwargs["timeout"] == (3, 3)
+
+        clock.now += 3
+        with pytest.raises(DeadlineExceeded):
+            client.scrape({"url": "https://www.justwatch.com/us/movie/b"})
+    assert session.post.call_count == 1
+
+    client.scrape({"url": "https://www.justwatch.com/us/movie/c"})
+    assert session.post.call_args.kwargs["timeout"] == (10.0, 180.0)
+
+
+def test_retry_gives_up_when_backoff_outlasts_deadline():
+    """Test that no retry is scheduled past the deadline."""
+    sleeps = []
+    policy = RetryPolicy(sleep=sleeps.append, rng=lambda: 0.5, base_delay=2.0)
+    send = MagicMock(side_effect=RetryableError("503"))
+
+    with pytest.raises(RetryableError):
+        policy.call(send, deadline=Deadline(1))
+    assert send.call_count == 1
+    assert sleeps == []
+
+
+def make_scraper(detail_delay, **kwargs):
+    kwargs.setdefault("max_workers", 1)
+    scraper = JustWatchScraper(
+        api_key="test-api-key",
+        rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+        **kwargs,
+    )
+    session = MagicMock()
+    scraper.client.session = session
+    listing = [
+        {"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(5)
+    ]
+
+    def fake_post(url, json=None, timeout=None, **kwargs):
+        response = MagicMock(status_code=200, ok=True)
+        if json["url"].endswith("/new"):
+            response.json.return_value = {
+                "success": True,
+                "data": {"json": {"items": listing}},
+            }
+            return response
+        time.sleep(detail_delay)
+        idx = json["url"].rsplit("-", 1)[1]
+        response.json.return_value = {
+            "success": True,
+            "data": {"json": {"synopsis": f"Synopsis {idx}"}},
+        }
+        return response
+
+    session.post.side_effect = fake_post
+    return scraper, session
+
+
+@pytest.mark.parametrize("max_workers, detail_delay", [(1, 0.05), (2, 0.15)])
+def test_run_budget_keeps_remaining_items_without_details(max_workers, detail_delay):
+    """Test that items left when the run budget runs out are kept unfetched."""
+    scraper, session = make_scraper(
+        detail_delay, run_budget=0.12, max_workers=max_workers
+    )
+
+    releases = scraper.get_new_releases()
+
+    assert [r["title"] for r in releases] == [f"Movie {i}" for i in range(5)]
+    fetched = [r for r in releases if r.get("synopsis")]
+    assert 0 < len(fetched) < 5
+    assert session.post.call_count < 6
+    assert scraper.cut_short
+
+
+def test_run_budget_leaves_skipped_items_to_resume(tmp_path):
+    """Test that skipped items are journaled as failed so --resume fetches them."""
+    journal = RunJournal(tmp_path / "journal.sqlite")
+    run_id = journal.start_run()
+    scraper, _ = make_scraper(0.05, run_budget=0.12, journal=journal, run_id=run_id)
+
+    releases = scraper.get_new_releases()
+    fetched = sum(1 for r in releases if r.get("synopsis"))
+    assert journal.counts(run_id) == {"done": fetched, "failed": 5 - fetched}
+
+    resumed, _ = make_scraper(0, journal=journal, run_id=run_id)
+    assert [r["synopsis"] for r in resumed.get_new_releases()] == [
+        f"Synopsis {i}" for i in range(5)
+    ]
+    assert not resumed.cut_short
+    journal.close()
+
+
+def test_item_budget_bounds_detail_timeouts():
+    """Test that detail requests are given at most the item budget."""
+    scraper, session = make_scraper(0, item_budget=1.5)
+
+    releases = scraper.get_new_releases()
+
+    assert [r["synopsis"] for r in releases] == [f"Synopsis {i}" for i in range(5)]
+    detail_timeouts = [c.kwargs["timeout"] for c in session.post.call_args_list[1:]]
+    assert all(max(timeout) <= 1.5 for timeout in detail_timeouts)
@@ -0,0 +1,93 @@
+"""Unit tests for the per-domain review yield statistics."""
+
+import pytest
+
+from mlops.scripts.scraping.domain_stats import DomainStats
+from mlops.scripts.scraping.storage import DAY
+
+
+@pytest.fixture
+def stats(tmp_path, clock):
+    stats = DomainStats(
+        tmp_path / "domains.sqlite",
+        window=4,
+        max_age=10 * DAY,
+        min_scrapes=3,
+        min_success_rate=0.25,
+        clock=clock,
+    )
+    yield stats
+    stats.close()
+
+
+def test_summaries_report_success_rate_yield_and_median_latency(stats):
+    """Test that recorded scrapes are summarized per domain."""
+    stats.record("critics.example", 2, 4.0)
+    stats.record("critics.example", 0, 10.0)
+    stats.record("critics.example", 1, 6.0)
+    stats.record("other.example", 1, 1.0)
+
+    summaries = stats.summaries(["critics.example", "unknown.example"])
+    assert summaries == {
+        "critics.example": {
+            "scrapes": 3,
+            "success_rate": pytest.approx(2 / 3),
+            "reviews_per_scrape": 1.0,
+            "median_seconds": 6.0,
+        }
+    }
+
+
+def test_only_recent_scrapes_count(stats, clock):
+    """Test that scrapes beyond the window or older than max_age are dropped."""
+    for reviews in (0, 0, 1, 1, 1):
+        stats.record("critics.example", reviews, 2.0)
+    assert stats.summaries(["critics.example"])["critics.example"]["scrapes"] == 4
+    assert (
+        stats.summaries(["critics.example"])["critics.example"]["success_rate"] == 0.75
+    )
+
+    clock.now += 11 * DAY
+    assert stats.summaries(["critics.example"]) == {}
+
+
+def test_rank_orders_by_expected_reviews_per_second(stats):
+    """Test that fast, productive domains are ranked first."""
+    for _ in range(4):
+        stats.record("slow.example", 2, 20.0)
+        stats.record("fast.example", 2, 2.0)
+        stats.record("sparse.example", 1, 1.5)
+        stats.record("empty.example", 0, 2.0)
+
+    domains = [
+        "slow.example",
+        "empty.example",
+        "new.example",
+        "sparse.example",
+        "fast.example",
+    ]
+    order = stats.rank(domains)
+
+    # empty.example never yields reviews and is dropped; new.example has no
+    # history and is assumed to take the candidates' median time
+    assert [domains[i] for i in order] == [
+        "fast.example",
+        "sparse.example",
+        "new.example",
+        "slow.example",
+    ]
+
+
+def test_rank_keeps_search_order_without_history(stats):
+    """Test that candidates of unknown domains keep their search rank."""
+    domains = ["b.example", "a.example", "b.example"]
+    assert stats.rank(domains) == [0, 1, 2]
+
+
+def test_domains_are_dropped_only_after_enough_scrapes(stats):
+    """Test that a few failed scrapes do not drop a domain."""
+    stats.record("paywall.example", 0, 3.0)
+    stats.record("paywall.example", 0, 3.0)
+    assert stats.rank(["paywall.example"]) == [0]
+    stats.record("paywall.example", 0, 3.0)
+    assert stats.rank(["paywall.example"]) == []
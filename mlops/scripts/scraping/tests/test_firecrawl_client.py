@@ -0,0 +1,142 @@
+"""Unit tests for the shared Firecrawl client."""
+
+import pytest
+
+from mlops.scripts.scraping import firecrawl_client
+from mlops.scripts.scraping.firecrawl_client import (
+    FirecrawlClient,
+    get_firecrawl_client,
+    load_api_key,
+)
+from mlops.scripts.scraping.justwatch_scraper import JustWatchScraper
+from mlops.scripts.scraping.rate_limiter import RateLimiter
+from mlops.scripts.scraping.retry import RetryableError, RetryPolicy
+from mlops.scripts.scraping.tests.firecrawl_stub import FirecrawlStub
+from mlops.scripts.utils import config_loader
+from mlops.scripts.utils.config_loader import SecretStore
+
+
+def make_client(stub, **kwargs):
+    return FirecrawlClient(
+        "test-api-key",
+        api_url=stub.url,
+        rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+        **kwargs,
+    )
+
+
+def test_endpoint_helpers_send_authenticated_requests():
+    """Test scrape, search and batch helpers against the stub."""
+    url = "https://www.justwatch.com/us/movie/a"
+    with FirecrawlStub([], {url: {"title": "A"}}, page_size=1) as stub:
+        stub.search_results = [{"url": "https://reviews.example/a", "title": "A"}]
+        client = make_client(stub)
+
+        assert client.scrape({"url": url})["data"]["json"] == {"title": "A"}
+        assert client.search({"query": "A movie reviews"})["data"] == (
+            stub.search_results
+        )
+        job = client.start_batch_scrape({"urls": [url, url + "-2"]})
+        status = client.batch_scrape_status(job["id"])
+        assert status["completed"] == 1
+        client.close()
+
+    assert [path for _, path, _ in stub.requests] == [
+        "/v1/scrape",
+        "/v1/search",
+        "/v1/batch/scrape",
+        "/v1/batch/scrape/job-1",
+    ]
+    assert set(stub.authorizations) == {"Bearer test-api-key"}
+
+
+def test_shared_client_reuses_one_connection():
+    """Test that two scrapers sharing a client send over one warm connection."""
+    url = "https://www.justwatch.com/us/movie/a"
+    with FirecrawlStub([], {url: {"title": "A"}}) as stub:
+        client = make_client(stub, pool_maxsize=2)
+        first = JustWatchScraper(client=client)
+        second = JustWatchScraper(client=client, max_workers=2)
+        assert first.client is second.client
+
+        for scraper in (first, second, first):
+            assert scraper._get_detailed_content(url) == {"title": "A"}
+        client.close()
+
+    assert len(stub.connections) == 3
+    assert len(set(stub.connections)) == 1
+
+
+def test_pool_size_follows_scraper_workers():
+    """Test that a scraper's own client pools a connection per worker."""
+    scraper = JustWatchScraper(api_key="test-api-key", max_workers=16)
+    adapter = scraper.client.session.get_adapter("https://api.firecrawl.dev")
+    assert scraper.client.pool_maxsize == 16
+    assert adapter._pool_maxsize == 16
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_failed_status_is_left_to_the_retry_policy(method):
+    """Test that the session does not retry underneath the retry policy."""
+    with FirecrawlStub([], {}) as stub:
+        stub.fail_statuses = [429, 429]
+        limiter = RateLimiter(rate=1000, max_in_flight=4)
+        client = FirecrawlClient(
+            "test-api-key",
+            api_url=stub.url,
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        with pytest.raises(RetryableError):
+            if method == "GET":
+                client.batch_scrape_status("job-1")
+            else:
+                client.scrape({"url": "https://www.justwatch.com/us/movie/a"})
+        client.close()
+
+    # One request reached the server and its 429 slowed the rate limiter down
+    assert len(stub.requests) == 1
+    assert limiter.rate < 1000
+
+
+def test_load_api_key_prefers_environment(monkeypatch):
+    """Test that an exported key is used without reading a .env file."""
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "from-env")
+    assert load_api_key() == "from-env"
+
+
+def test_load_api_key_reads_secret_files(monkeypatch, tmp_path):
+    """Test that the key comes from the shared secret store's files."""
+    env_file = tmp_path / ".env"
+    env_file.write_text("FIRECRAWL_API_KEY=from-file\n")
+    store = SecretStore(env_files=[env_file], secrets_file=tmp_path / "none.yaml")
+    monkeypatch.setattr(config_loader, "_default_secrets", store)
+    monkeypatch.delenv("FIRECRAWL_API_KEY", raising=False)
+    assert load_api_key() == "from-file"
+
+    env_file.write_text("")
+    store.clear()
+    with pytest.raises(ValueError):
+        load_api_key()
+
+
+def test_get_firecrawl_client_is_created_once(monkeypatch):
+    """Test the lazily created process-wide client."""
+    monkeypatch.setattr(firecrawl_client, "_default_client", None)
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "from-env")
+    monkeypatch.setenv("FIRECRAWL_POOL_MAXSIZE", "7")
+
+    client = get_firecrawl_client()
+    assert get_firecrawl_client() is client
+    assert client.pool_maxsize == 7
+    assert client.session.headers["Authorization"] == "Bearer from-env"
+    assert JustWatchScraper().client is client
+
+
+@pytest.mark.parametrize("workers", [1, 32])
+def test_undersized_shared_pool_is_reported(caplog, workers):
+    """Test the warning when more workers share a client than it pools."""
+    client = FirecrawlClient("test-api-key", pool_maxsize=10)
+    JustWatchScraper(client=client, max_workers=workers)
+    warned = "raise FIRECRAWL_POOL_MAXSIZE" in caplog.text
+    assert warned == (workers > 10)
@@ -0,0 +1,144 @@
+"""Unit tests for hedged requests."""
+
+import itertools
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from mlops.scripts.scraping.deadline import Deadline, current_deadline, deadline_scope
+from mlops.scripts.scraping.firecrawl_client import FirecrawlClient
+from mlops.scripts.scraping.hedging import HedgePolicy, LatencyTracker
+from mlops.scripts.scraping.rate_limiter import RateLimiter
+
+KEY = "POST /v1/scrape"
+
+
+def make_policy(latency=0.02, samples=20, **kwargs):
+    tracker = LatencyTracker(min_samples=samples)
+    for _ in range(samples):
+        tracker.record(KEY, latency)
+    return HedgePolicy(tracker=tracker, **kwargs)
+
+
+def slow_then_fast(slow=1.0):
+    """Return a send function whose first call is slow and later ones fast."""
+    counter = itertools.count()
+
+    def send():
+        call = next(counter)
+        if call == 0:
+            time.sleep(slow)
+        return f"call {call}"
+
+    return send
+
+
+def test_latency_percentile():
+    """Test percentiles over the recent window of an endpoint."""
+    tracker = LatencyTracker(window=100, min_samples=10)
+    for ms in range(1, 10):
+        tracker.record(KEY, ms / 1000)
+    assert tracker.percentile(KEY, 0.95) is None
+
+    for ms in range(10, 201):
+        tracker.record(KEY, ms / 1000)
+    assert tracker.percentile(KEY, 0.95) == pytest.approx(0.195)
+    assert tracker.percentile(KEY, 0.5) == pytest.approx(0.150)
+    assert tracker.percentile("GET /v1/other", 0.95) is None
+
+
+def test_slow_call_is_hedged_and_fast_one_wins():
+    """Test that a call slower than the p95 is answered by its hedge."""
+    policy = make_policy(max_extra=0.5)
+
+    start = time.monotonic()
+    result = policy.call(KEY, slow_then_fast())
+
+    assert result == "call 1"
+    assert time.monotonic() - start < 0.5
+    assert (policy.hedges, policy.hedge_wins) == (1, 1)
+    policy.shutdown()
+
+
+def test_fast_call_is_not_hedged():
+    """Test that calls finishing within the p95 send one request only."""
+    policy = make_policy(latency=0.5, max_extra=0.5)
+    send = MagicMock(return_value="ok")
+
+    assert policy.call(KEY, send) == "ok"
+    assert send.call_count == 1
+    assert policy.hedges == 0
+    policy.shutdown()
+
+
+def test_extra_load_is_capped():
+    """Test that no hedge is sent once the extra-load budget is spent."""
+    policy = make_policy(max_extra=0.0)
+
+    assert policy.call(KEY, slow_then_fast(0.2)) == "call 0"
+    assert policy.hedges == 0
+    policy.shutdown()
+
+
+def test_failed_primary_falls_back_to_hedge():
+    """Test that a hedge answering after a failed primary is used."""
+    policy = make_policy(max_extra=0.5)
+    counter = itertools.count()
+
+    def send():
+        if next(counter) == 0:
+            time.sleep(0.1)
+            raise ConnectionError("reset")
+        time.sleep(0.2)
+        return "hedge"
+
+    assert policy.call(KEY, send) == "hedge"
+
+    def always_fail():
+        time.sleep(0.1)
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        policy.call(KEY, always_fail)
+    policy.shutdown()
+
+
+def test_client_hedges_scrapes_but_not_batch_starts():
+    """Test that the client hedges idempotent calls within the caller's deadline."""
+    session = MagicMock()
+    session.headers = {}
+    calls = itertools.count()
+    lock = threading.Lock()
+    deadlines = []
+
+    def fake_post(url, json=None, timeout=None):
+        with lock:
+            call = next(calls)
+            deadlines.append(current_deadline())
+        if call == 0:
+            time.sleep(0.5)
+        response = MagicMock(status_code=200, ok=True)
+        response.json.return_value = {"success": True, "id": "job-1", "call": call}
+        return response
+
+    session.post.side_effect = fake_post
+    policy = HedgePolicy(tracker=make_policy().tracker, max_extra=0.5, max_workers=4)
+    policy.tracker.record("POST /v1/batch/scrape", 0.02)
+    client = FirecrawlClient(
+        "test-api-key",
+        rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+        session=session,
+        hedge_policy=policy,
+    )
+
+    deadline = Deadline(60)
+    with deadline_scope(deadline):
+        assert client.scrape({"url": "https://example.com/a"})["call"] == 1
+    assert deadlines == [deadline, deadline]
+
+    client.start_batch_scrape({"urls": ["https://example.com/a"]})
+    assert session.post.call_count == 3
+    assert policy.hedges == 1
+    client.close()
@@ -0,0 +1,80 @@
+"""Unit tests for the resumable run journal."""
+
+import pytest
+
+from mlops.scripts.scraping.journal import RunJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = RunJournal(tmp_path / "journal.sqlite")
+    yield journal
+    journal.close()
+
+
+def test_listing_snapshot_round_trip(journal):
+    """Test storing and loading a run's listing snapshot."""
+    run_id = journal.start_run()
+    assert journal.load_listing(run_id) is None
+
+    listing = [{"title": "A", "detailUrl": "/us/movie/a"}]
+    journal.save_listing(run_id, listing)
+    assert journal.load_listing(run_id) == listing
+
+
+def test_latest_unfinished_run(journal):
+    """Test that finished runs are not offered for resuming."""
+    assert journal.latest_unfinished_run() is None
+    first = journal.start_run()
+    second = journal.start_run()
+    assert journal.latest_unfinished_run() == second
+
+    journal.finish_run(second)
+    assert journal.latest_unfinished_run() == first
+
+
+def test_completed_only_returns_done_tasks(journal):
+    """Test that failed tasks are left for a resumed run to retry."""
+    run_id = journal.start_run()
+    journal.record_done(run_id, "detail", "a", {"title": "A"})
+    journal.record_failed(run_id, "detail", "b", "timeout")
+    journal.record_done(run_id, "review", "a", [])
+
+    assert journal.completed(run_id, "detail") == {"a": {"title": "A"}}
+    assert journal.counts(run_id) == {"done": 2, "failed": 1}
+
+    # A retry that succeeds replaces the failure
+    journal.record_done(run_id, "detail", "b", {"title": "B"})
+    assert set(journal.completed(run_id, "detail")) == {"a", "b"}
+
+
+def test_run_task_skips_completed_work(journal):
+    """Test that run_task only calls fetch for missing or failed tasks."""
+    run_id = journal.start_run()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return ["review"]
+
+    with pytest.raises(RuntimeError):
+        journal.run_task(run_id, "review", "a", fetch)
+    assert journal.run_task(run_id, "review", "a", fetch) == ["review"]
+    assert journal.run_task(run_id, "review", "a", fetch) == ["review"]
+    assert len(calls) == 2
+
+
+def test_journal_persists_across_connections(tmp_path):
+    """Test that a new process can resume from the journal file."""
+    path = tmp_path / "journal.sqlite"
+    journal = RunJournal(path)
+    run_id = journal.start_run()
+    journal.record_done(run_id, "detail", "a", {"title": "A"})
+    journal.close()
+
+    reopened = RunJournal(path)
+    assert reopened.latest_unfinished_run() == run_id
+    assert reopened.completed(run_id, "detail") == {"a": {"title": "A"}}
+    reopened.close()
@@ -1,11 +1,24 @@
 """Unit tests for JustWatch scraper."""
 
+import json
 import logging
 import os
 import tempfile
+import threading
+import time
 from unittest.mock import MagicMock
 
-from mlops.scripts.scraping.justwatch_scraper import JustWatchScraper
+from mlops.scripts.scraping.cache import ResponseCache
+from mlops.scripts.scraping.journal import RunJournal
+from mlops.scripts.scraping.justwatch_scraper import (
+    JustWatchScraper,
+    dedupe_listing_items,
+    merge_regional_listings,
+)
+from mlops.scripts.scraping.known_items import KnownItemsIndex
+from mlops.scripts.scraping.rate_limiter import RateLimiter
+from mlops.scripts.scraping.sinks import read_jsonl
+from mlops.scripts.scraping.tests.firecrawl_stub import FirecrawlStub
 
 # Ensure logs are captured during tests
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +33,7 @@ def test_justwatch_scraper():
 
     # Mock the session
     mock_session = MagicMock()
-    scraper.session = mock_session  # Replace the session directly
+    scraper.client.session = mock_session  # Replace the session directly
 
     # Configure mock response for new releases
     mock_new_releases_response = MagicMock()
@@ -131,8 +144,522 @@ def test_justwatch_scraper():
         scraper.save_data(releases, output_dir=tmp_dir)
         # Verify files were created
         files = os.listdir(tmp_dir)
+        assert any(f.endswith(".jsonl") for f in files)
+        assert "parquet" in files
         assert any(f.endswith(".json") for f in files)
         assert any(f.endswith(".csv") for f in files)
+        assert not any(f.endswith(".part") for f in files)
+
+
+def test_save_data_streams_iterator(tmp_path):
+    """Test saving from a generator, and that empty input writes no files."""
+    scraper = JustWatchScraper(api_key="test-api-key")
+
+    items = ({"title": f"Movie {i}", "genres": ["Drama"] * (i % 2)} for i in range(3))
+    assert scraper.save_data(items, output_dir=tmp_path) == 3
+    csv_file = next(tmp_path.glob("*.csv"))
+    assert len(csv_file.read_text().splitlines()) == 4
+
+    empty_dir = tmp_path / "empty"
+    assert scraper.save_data(iter([]), output_dir=empty_dir) == 0
+    assert list(empty_dir.iterdir()) == []
+
+
+def test_save_data_relational_export(tmp_path):
+    """Test that the relational export mode writes one file per table."""
+    scraper = JustWatchScraper(api_key="test-api-key")
+    items = [{"title": "Movie", "detailUrl": "/us/movie/m", "genres": ["Drama"]}]
+
+    assert scraper.save_data(items, output_dir=tmp_path, relational=True) == 1
+    tables_dir = next(tmp_path.glob("*_tables"))
+    assert sorted(p.stem for p in tables_dir.iterdir()) == [
+        "item",
+        "item_cast",
+        "item_genre",
+        "item_platform",
+        "review",
+    ]
+
+
+def test_concurrent_detail_fetch_preserves_order():
+    """Test that concurrent detail fetching overlaps requests but keeps order."""
+    scraper = JustWatchScraper(
+        api_key="test-api-key",
+        max_workers=4,
+        rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+    )
+    mock_session = MagicMock()
+    scraper.client.session = mock_session
+
+    listing = [
+        {"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(6)
+    ]
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def fake_post(url, headers=None, json=None, **kwargs):
+        nonlocal in_flight, max_in_flight
+        response = MagicMock()
+        if json["url"].endswith("/new"):
+            response.json.return_value = {
+                "success": True,
+                "data": {"json": {"items": listing}},
+            }
+            return response
+
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # Earlier items finish last, so completion order differs from listing order
+        idx = int(json["url"].rsplit("-", 1)[1])
+        time.sleep(0.01 * (6 - idx))
+        with lock:
+            in_flight -= 1
+        response.json.return_value = {
+            "success": True,
+            "data": {"json": {"title": f"Movie {idx}", "synopsis": f"Synopsis {idx}"}},
+        }
+        return response
+
+    mock_session.post.side_effect = fake_post
+
+    releases = scraper.get_new_releases()
+
+    assert [r["synopsis"] for r in releases] == [f"Synopsis {i}" for i in range(6)]
+    assert mock_session.post.call_count == 7
+    assert max_in_flight > 1
+
+
+def test_iter_new_releases_streams_in_completion_order():
+    """Test that items are yielded before slower earlier items finish."""
+    scraper = JustWatchScraper(
+        api_key="test-api-key",
+        max_workers=2,
+        rate_limiter=RateLimiter(rate=1000, max_in_flight=2),
+    )
+    mock_session = MagicMock()
+    scraper.client.session = mock_session
+    slow_item_released = threading.Event()
+
+    def fake_post(url, headers=None, json=None, **kwargs):
+        response = MagicMock()
+        if json["url"].endswith("/new"):
+            items = [
+                {"title": "Slow", "detailUrl": "/us/movie/slow"},
+                {"title": "Fast", "detailUrl": "/us/movie/fast"},
+            ]
+            response.json.return_value = {
+                "success": True,
+                "data": {"json": {"items": items}},
+            }
+            return response
+        if json["url"].endswith("/slow"):
+            assert slow_item_released.wait(timeout=5)
+        title = json["url"].rsplit("/", 1)[1]
+        response.json.return_value = {
+            "success": True,
+            "data": {"json": {"synopsis": f"{title} synopsis"}},
+        }
+        return response
+
+    mock_session.post.side_effect = fake_post
+
+    releases = scraper.iter_new_releases()
+    first = next(releases)
+    assert first["title"] == "Fast"
+    slow_item_released.set()
+    rest = list(releases)
+    assert [r["title"] for r in rest] == ["Slow"]
+    assert rest[0]["synopsis"] == "slow synopsis"
+
+
+def test_resume_skips_journaled_details(tmp_path):
+    """Test that a resumed run only refetches failed detail pages."""
+    listing = [
+        {"title": "Movie A", "detailUrl": "/us/movie/a"},
+        {"title": "Movie B", "detailUrl": "/us/movie/b"},
+    ]
+    fail_b = True
+    fetched = []
+
+    def fake_post(url, headers=None, json=None, **kwargs):
+        response = MagicMock()
+        fetched.append(json["url"])
+        if json["url"].endswith("/new"):
+            response.json.return_value = {
+                "success": True,
+                "data": {"json": {"items": listing}},
+            }
+        elif json["url"].endswith("/b") and fail_b:
+            response.json.return_value = {"success": False}
+        else:
+            title = json["url"].rsplit("/", 1)[1]
+            response.json.return_value = {
+                "success": True,
+                "data": {"json": {"synopsis": f"Synopsis {title}"}},
+            }
+        return response
+
+    def run(journal, run_id):
+        scraper = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000),
+            journal=journal,
+            run_id=run_id,
+        )
+        scraper.client.session = MagicMock()
+        scraper.client.session.post.side_effect = fake_post
+        return scraper.get_new_releases()
+
+    journal = RunJournal(tmp_path / "journal.sqlite")
+    run_id = journal.start_run()
+    first = run(journal, run_id)
+    assert "synopsis" not in first[1]
+    assert journal.counts(run_id) == {"done": 1, "failed": 1}
+
+    fail_b = False
+    fetched.clear()
+    resumed = run(journal, journal.latest_unfinished_run())
+    assert fetched == ["https://www.justwatch.com/us/movie/b"]
+    assert [r["synopsis"] for r in resumed] == ["Synopsis a", "Synopsis b"]
+    journal.close()
+
+
+def test_batch_scrape_mode_against_stub():
+    """Test batch scrape mode end to end against a local Firecrawl stand-in."""
+    listing = [
+        {"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(5)
+    ]
+    listing.append({"title": "No Link"})
+    details = {
+        f"https://www.justwatch.com/us/movie/movie-{i}": {
+            "title": f"Movie {i}",
+            "genres": ["Drama"],
+            "synopsis": f"Synopsis {i}",
+        }
+        for i in range(4)  # movie-4 never yields data
+    }
+
+    with FirecrawlStub(listing, details, page_size=2) as stub:
+        scraper = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+            use_batch_scrape=True,
+            batch_poll_interval=0.01,
+            api_url=stub.url,
+        )
+        releases = scraper.get_new_releases()
+
+    assert [r["title"] for r in releases] == [item["title"] for item in listing]
+    assert [r.get("synopsis") for r in releases] == [
+        "Synopsis 0",
+        "Synopsis 1",
+        "Synopsis 2",
+        "Synopsis 3",
+        None,
+        None,
+    ]
+
+    posts = [r for r in stub.requests if r[0] == "POST"]
+    assert [path for _, path, _ in posts] == ["/v1/scrape", "/v1/batch/scrape"]
+    batch_body = posts[1][2]
+    assert len(batch_body["urls"]) == 5
+    assert batch_body["jsonOptions"]["schema"]["required"] == ["title", "genres"]
+    # The job was polled until it completed, following pagination links,
+    # and no poll downloaded a page an earlier one had returned
+    assert any("skip=" in path for method, path, _ in stub.requests if method == "GET")
+    assert stub.documents_served == 5
+
+
+def test_response_cache_answers_repeat_runs(tmp_path):
+    """Test that a rerun takes detail pages from the response cache."""
+    listing = [
+        {"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(3)
+    ]
+    details = {
+        f"https://www.justwatch.com/us/movie/movie-{i}": {
+            "title": f"Movie {i}",
+            "genres": ["Drama"],
+        }
+        for i in range(3)
+    }
+
+    with FirecrawlStub(listing, details) as stub:
+        for use_batch_scrape in (False, True, False):
+            cache = ResponseCache(tmp_path / "cache.sqlite")
+            scraper = JustWatchScraper(
+                api_key="test-api-key",
+                rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+                use_batch_scrape=use_batch_scrape,
+                batch_poll_interval=0.01,
+                api_url=stub.url,
+                cache=cache,
+            )
+            releases = scraper.get_new_releases()
+            assert [r["genres"] for r in releases] == [["Drama"]] * 3
+            cache.close()
+
+    posts = [path for method, path, _ in stub.requests if method == "POST"]
+    # Only the listing is scraped again; batch mode found nothing to submit
+    assert posts == ["/v1/scrape"] * 4 + ["/v1/scrape"] + ["/v1/scrape"]
+
+
+def test_known_items_skip_unchanged_details(tmp_path):
+    """Test that a rerun only fetches details of new or changed titles."""
+    listing = [
+        {"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(3)
+    ]
+    details = {
+        f"https://www.justwatch.com/us/movie/movie-{i}": {
+            "title": f"Movie {i}",
+            "genres": ["Drama"],
+        }
+        for i in range(4)
+    }
+
+    with FirecrawlStub(listing, details) as stub:
+        first = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+            api_url=stub.url,
+        )
+        first.save_data(first.iter_new_releases(), output_dir=tmp_path)
+
+        # Next day: movie-1 moved to a new release date, movie-3 is new
+        stub.listing = [
+            listing[0],
+            {**listing[1], "releaseDate": "Tomorrow"},
+            listing[2],
+            {"title": "Movie 3", "detailUrl": "/us/movie/movie-3"},
+        ]
+        stub.requests.clear()
+        second = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+            api_url=stub.url,
+            known_items=KnownItemsIndex.from_outputs(
+                tmp_path, "https://www.justwatch.com/us"
+            ),
+        )
+        releases = second.get_new_releases()
+
+    assert [r["genres"] for r in releases] == [["Drama"]] * 4
+    assert releases[1]["releaseDate"] == "Tomorrow"
+    scraped = [body["url"] for method, _, body in stub.requests if method == "POST"]
+    assert scraped == [
+        "https://www.justwatch.com/us/new",
+        "https://www.justwatch.com/us/movie/movie-1",
+        "https://www.justwatch.com/us/movie/movie-3",
+    ]
+
+
+def test_known_items_are_scraped_again_once_aged(tmp_path):
+    """Test that reusing a record does not reset its age."""
+    listing = [{"title": "Movie 0", "detailUrl": "/us/movie/movie-0"}]
+    details = {
+        "https://www.justwatch.com/us/movie/movie-0": {
+            "title": "Movie 0",
+            "genres": ["Drama"],
+        }
+    }
+    day = 24 * 3600
+
+    def run(max_age):
+        stub.requests.clear()
+        scraper = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+            api_url=stub.url,
+            known_items=KnownItemsIndex.from_outputs(
+                tmp_path, "https://www.justwatch.com/us", max_age=max_age
+            ),
+        )
+        scraper.save_data(scraper.iter_new_releases(), output_dir=tmp_path)
+        return [body["url"] for method, _, body in stub.requests if method == "POST"]
+
+    with FirecrawlStub(listing, details) as stub:
+        assert len(run(30 * day)) == 2
+
+        # Make the first run ten days old
+        (first,) = tmp_path.glob("justwatch_data_*.jsonl")
+        records = [
+            {**record, "detailScrapedAt": record["detailScrapedAt"] - 10 * day}
+            for record in read_jsonl(first)
+        ]
+        first.unlink()
+        old = tmp_path / "justwatch_data_20240101_000000.jsonl"
+        old.write_text("".join(json.dumps(record) + "\n" for record in records))
+        os.utime(old, (time.time() - 10 * day,) * 2)
+
+        # Reused, and written again to a fresh output file
+        assert len(run(30 * day)) == 1
+        # Too old now, although the second run's file is new
+        assert run(5 * day) == [
+            "https://www.justwatch.com/us/new",
+            "https://www.justwatch.com/us/movie/movie-0",
+        ]
+
+
+def test_merge_regional_listings_dedupes_titles():
+    """Test that titles listed in several regions are merged into one."""
+    listings = {
+        "us": [
+            {
+                "title": "Dune",
+                "detailUrl": "https://www.justwatch.com/us/movie/dune",
+                "streamingPlatforms": ["Max"],
+            }
+        ],
+        "uk": [
+            {
+                "title": "Dune: Part One",
+                "detailUrl": "https://www.justwatch.com/uk/movie/dune/",
+                "releaseDate": "Today",
+            },
+            {"title": "Only UK", "detailUrl": "https://www.justwatch.com/uk/tv-show/x"},
+        ],
+    }
+
+    titles = merge_regional_listings(listings)
+
+    assert [t["title"] for t in titles] == ["Dune", "Only UK"]
+    assert titles[0]["regions"] == {
+        "us": {
+            "detailUrl": "https://www.justwatch.com/us/movie/dune",
+            "streamingPlatforms": ["Max"],
+        },
+        "uk": {
+            "detailUrl": "https://www.justwatch.com/uk/movie/dune/",
+            "releaseDate": "Today",
+        },
+    }
+    assert list(titles[1]["regions"]) == ["uk"]
+
+
+def test_multi_country_fetches_shared_details_once():
+    """Test that shared fields are fetched once per title across regions."""
+    jw = "https://www.justwatch.com"
+    listings = {
+        f"{jw}/us/new": [
+            {"title": "A", "detailUrl": "/us/movie/a", "streamingPlatforms": ["Max"]},
+            {"title": "B", "detailUrl": "/us/movie/b"},
+        ],
+        f"{jw}/uk/new": [
+            {"title": "A", "detailUrl": "/uk/movie/a"},
+            {"title": "C", "detailUrl": "/uk/movie/c", "streamingPlatforms": ["BBC"]},
+        ],
+    }
+    details = {
+        f"{jw}/us/movie/a": {"title": "A", "genres": ["Drama"], "releaseDate": "Jan"},
+        f"{jw}/us/movie/b": {"title": "B", "genres": ["Comedy"]},
+        f"{jw}/uk/movie/c": {"title": "C", "genres": ["Crime"]},
+        f"{jw}/uk/movie/a": {
+            "title": "A",
+            "genres": ["Drama"],
+            "streamingPlatforms": ["Sky"],
+            "releaseDate": "Feb",
+        },
+    }
+
+    with FirecrawlStub(listings, details) as stub:
+        scraper = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+            max_workers=4,
+            api_url=stub.url,
+            countries=["us", "UK"],
+        )
+        releases = scraper.get_new_releases()
+
+    assert [r["title"] for r in releases] == ["A", "B", "C"]
+    assert releases[0]["regions"] == {
+        "us": {
+            "detailUrl": f"{jw}/us/movie/a",
+            "streamingPlatforms": ["Max"],
+            "releaseDate": "Jan",
+        },
+        "uk": {
+            "detailUrl": f"{jw}/uk/movie/a",
+            "streamingPlatforms": ["Sky"],
+            "releaseDate": "Feb",
+        },
+    }
+
+    bodies = [body for method, _, body in stub.requests if method == "POST"]
+    scraped = sorted(body["url"] for body in bodies)
+    assert scraped == sorted(list(listings) + list(details))
+    # Only the region missing from the listing got a region-only extraction
+    region_only = [
+        b["url"] for b in bodies if "country of this page" in b["jsonOptions"]["prompt"]
+    ]
+    assert region_only == [f"{jw}/uk/movie/a"]
+
+
+def test_dedupe_listing_items_across_listings():
+    """Test merging titles found in several listings of one region."""
+    pages = [
+        [
+            {"title": "A", "detailUrl": "/us/movie/a"},
+            {"title": "B", "detailUrl": "/us/movie/b", "streamingPlatforms": []},
+        ],
+        [
+            {"title": "B", "detailUrl": "https://www.justwatch.com/us/movie/b/"},
+            {"title": "No Link"},
+        ],
+        [
+            {"title": "B", "detailUrl": "/us/movie/b", "streamingPlatforms": ["Max"]},
+            {"title": "no link"},
+        ],
+    ]
+
+    items = dedupe_listing_items(pages, "https://www.justwatch.com/us")
+
+    assert items == [
+        {"title": "A", "detailUrl": "/us/movie/a"},
+        {"title": "B", "detailUrl": "/us/movie/b", "streamingPlatforms": ["Max"]},
+        {"title": "No Link"},
+    ]
+
+
+def test_discovery_scrapes_every_listing_once_per_title():
+    """Test that titles in several listings get a single detail fetch."""
+    jw = "https://www.justwatch.com/us"
+    listings = {
+        f"{jw}/new": [
+            {"title": "A", "detailUrl": "/us/movie/a"},
+            {"title": "B", "detailUrl": "/us/movie/b"},
+        ],
+        f"{jw}/upcoming": [
+            {"title": "B", "detailUrl": "/us/movie/b"},
+            {"title": "C", "detailUrl": "/us/movie/c"},
+        ],
+        f"{jw}/provider/netflix/new": [{"title": "A", "detailUrl": "/us/movie/a"}],
+    }
+    details = {
+        f"{jw}/movie/{name}": {"title": name.upper(), "genres": ["Drama"]}
+        for name in "abc"
+    }
+
+    with FirecrawlStub(listings, details) as stub:
+        scraper = JustWatchScraper(
+            api_key="test-api-key",
+            rate_limiter=RateLimiter(rate=1000, max_in_flight=4),
+            max_workers=3,
+            api_url=stub.url,
+            listing_paths=["new", "upcoming", "/provider/netflix/new"],
+            listing_scrolls=2,
+        )
+        releases = scraper.get_new_releases()
+
+    assert [r["title"] for r in releases] == ["A", "B", "C"]
+    bodies = [body for method, _, body in stub.requests if method == "POST"]
+    assert sorted(body["url"] for body in bodies) == sorted(
+        list(listings) + list(details)
+    )
+    listing_bodies = [body for body in bodies if body["url"] in listings]
+    assert all(len(body["actions"]) == 4 for body in listing_bodies)
+    assert not any("actions" in body for body in bodies if body["url"] in details)
 
 
 # Removed if __name__ == '__main__': unittest.main() as pytest handles test discovery
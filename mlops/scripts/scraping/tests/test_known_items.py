@@ -0,0 +1,104 @@
+"""Unit tests for the known-items index."""
+
+import json
+import os
+import time
+
+from mlops.scripts.scraping.known_items import (
+    KnownItemsIndex,
+    canonical_url,
+    listing_hash,
+)
+
+BASE_URL = "https://www.justwatch.com/us"
+
+
+def write_output(path, records, mtime=None):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_listing_hash_ignores_detail_fields():
+    """Test that only listing fields feed the hash."""
+    item = {"title": "A", "detailUrl": "/us/movie/a", "releaseDate": "Today"}
+    assert listing_hash(item) == listing_hash({**item, "synopsis": "Long text"})
+    assert listing_hash(item) != listing_hash({**item, "releaseDate": "Tomorrow"})
+
+
+def test_canonical_url():
+    """Test that trivially different URLs map to the same key."""
+    assert canonical_url("HTTPS://WWW.JustWatch.com/us/movie/a/?x=1#top") == (
+        "https://www.justwatch.com/us/movie/a"
+    )
+
+
+def test_from_outputs_keeps_newest_hashed_record(tmp_path):
+    """Test building the index from earlier outputs."""
+    item = {"title": "A", "detailUrl": "/us/movie/a"}
+    item_hash = listing_hash(item)
+    write_output(
+        tmp_path / "justwatch_data_20240101_000000.jsonl",
+        [
+            {**item, "synopsis": "Old", "listingHash": item_hash},
+            {"title": "B", "detailUrl": "/us/movie/b"},  # detail fetch failed
+        ],
+    )
+    write_output(
+        tmp_path / "justwatch_data_20240102_000000.jsonl.part",
+        [{**item, "synopsis": "New", "listingHash": item_hash}],
+    )
+
+    index = KnownItemsIndex.from_outputs(tmp_path, BASE_URL)
+
+    assert len(index) == 1
+    record = index.lookup("https://www.justwatch.com/us/movie/a/", item_hash)
+    assert record["synopsis"] == "New"
+    assert index.lookup("https://www.justwatch.com/us/movie/a", "changed") is None
+    assert index.lookup("https://www.justwatch.com/us/movie/b", item_hash) is None
+
+
+def test_from_outputs_skips_old_files(tmp_path):
+    """Test that files older than max_age are not indexed."""
+    item = {"title": "A", "detailUrl": "/us/movie/a"}
+    record = {**item, "listingHash": listing_hash(item)}
+    write_output(
+        tmp_path / "justwatch_data_20240101_000000.jsonl",
+        [record],
+        mtime=time.time() - 10 * 24 * 3600,
+    )
+
+    assert len(KnownItemsIndex.from_outputs(tmp_path, BASE_URL)) == 1
+    assert len(KnownItemsIndex.from_outputs(tmp_path, BASE_URL, max_age=3600)) == 0
+    assert len(KnownItemsIndex.from_outputs(tmp_path / "missing", BASE_URL)) == 0
+
+
+def test_from_outputs_ages_records_from_their_scrape(tmp_path):
+    """Test that a reused record in a fresh file still ages from its scrape."""
+    now = time.time()
+    item = {"title": "A", "detailUrl": "/us/movie/a"}
+    fresh = {"title": "B", "detailUrl": "/us/movie/b"}
+    write_output(
+        tmp_path / "justwatch_data_20240110_000000.jsonl",
+        [
+            {
+                **item,
+                "listingHash": listing_hash(item),
+                "detailScrapedAt": now - 10 * 24 * 3600,
+            },
+            {
+                **fresh,
+                "listingHash": listing_hash(fresh),
+                "detailScrapedAt": now - 3600,
+            },
+        ],
+    )
+
+    index = KnownItemsIndex.from_outputs(
+        tmp_path, BASE_URL, max_age=5 * 24 * 3600, clock=lambda: now
+    )
+
+    assert (
+        index.lookup("https://www.justwatch.com/us/movie/a", listing_hash(item)) is None
+    )
+    assert index.lookup("https://www.justwatch.com/us/movie/b", listing_hash(fresh))
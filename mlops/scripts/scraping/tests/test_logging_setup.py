@@ -0,0 +1,91 @@
+"""Unit tests for the queued, rotating logging setup."""
+
+import logging
+import threading
+
+import pytest
+
+from mlops.scripts.scraping.logging_setup import (
+    payload_summary,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def root_level():
+    root = logging.getLogger()
+    level = root.level
+    yield
+    shutdown_logging()
+    root.setLevel(level)
+
+
+def test_payload_summary_truncates_large_payloads():
+    """Test compact JSON output and the truncation marker."""
+    assert payload_summary({"a": [1, 2]}) == '{"a":[1,2]}'
+    summary = payload_summary({"text": "x" * 1000}, limit=20)
+    assert summary.startswith('{"text":"xxxxxxxxxxx...')
+    assert summary.endswith("(991 more characters)")
+    assert payload_summary({"obj": object()}, limit=1000).startswith('{"obj":"<object')
+
+
+def test_records_from_threads_reach_the_log_file(tmp_path, root_level):
+    """Test that records logged from worker threads are written by the listener."""
+    listener = setup_logging(tmp_path, console_level=logging.CRITICAL)
+    assert setup_logging(tmp_path / "other") is listener
+    assert not (tmp_path / "other").exists()
+
+    log = logging.getLogger("mlops.test")
+    threads = [
+        threading.Thread(target=log.info, args=(f"from worker {i}",)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.debug("debug detail")
+    shutdown_logging()
+
+    text = (tmp_path / "scraper.log").read_text()
+    assert all(f"from worker {i}" in text for i in range(4))
+    # DEBUG records are not even built unless LOG_LEVEL asks for them
+    assert "debug detail" not in text
+    assert not any(
+        isinstance(h, logging.handlers.QueueHandler)
+        for h in logging.getLogger().handlers
+    )
+
+
+def test_log_level_enables_debug_records(tmp_path, root_level, monkeypatch):
+    """Test that LOG_LEVEL=DEBUG writes DEBUG records to the file."""
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    setup_logging(tmp_path, console_level=logging.CRITICAL)
+    assert logging.getLogger().isEnabledFor(logging.DEBUG)
+    logging.getLogger("mlops.test").debug("detail of %s", "item")
+    shutdown_logging()
+
+    assert "DEBUG" in (tmp_path / "scraper.log").read_text()
+    assert "detail of item" in (tmp_path / "scraper.log").read_text()
+
+
+def test_log_file_is_rotated_by_size(tmp_path, root_level):
+    """Test size-based rotation and the number of backups kept."""
+    setup_logging(
+        tmp_path,
+        console_level=logging.CRITICAL,
+        file_level=logging.INFO,
+        max_bytes=500,
+        backup_count=2,
+    )
+    log = logging.getLogger("mlops.test")
+    for i in range(50):
+        log.info(f"message {i} " + "x" * 50)
+    log.debug("not written")
+    shutdown_logging()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["scraper.log", "scraper.log.1", "scraper.log.2"]
+    assert all(p.stat().st_size <= 500 for p in tmp_path.iterdir())
+    assert "message 49" in (tmp_path / "scraper.log").read_text()
+    assert "not written" not in (tmp_path / "scraper.log").read_text()
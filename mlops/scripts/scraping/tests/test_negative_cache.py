@@ -0,0 +1,83 @@
+"""Unit tests for the review page negative cache."""
+
+import pytest
+
+from mlops.scripts.scraping.negative_cache import NegativeCache
+from mlops.scripts.scraping.storage import DAY
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = NegativeCache(
+        tmp_path / "negative.sqlite",
+        page_penalty=DAY,
+        domain_penalty=2 * DAY,
+        domain_threshold=2,
+        max_penalty=3 * DAY,
+        clock=clock,
+    )
+    yield cache
+    cache.close()
+
+
+def test_page_penalty_doubles_and_expires(cache, clock):
+    """Test that repeated failures of a page double its penalty."""
+    url = "https://site.example/landing"
+    assert cache.blocked_reason(url, "site.example") is None
+
+    cache.record_failure(url, "site.example", "no extraction")
+    assert cache.blocked_reason(url, "site.example") == "page penalized (no extraction)"
+    clock.now += DAY
+    assert cache.blocked_reason(url, "site.example") is None
+
+    cache.record_failure(url, "site.example", "no extraction")
+    clock.now += 1.5 * DAY
+    assert cache.blocked_reason(url, "site.example") is not None
+    clock.now += 0.5 * DAY
+    assert cache.blocked_reason(url, "site.example") is None
+
+
+def test_domain_is_penalized_after_failures_in_a_row(cache, clock):
+    """Test that a domain is skipped once enough of its pages failed."""
+    cache.record_failure(
+        "https://paywall.example/a", "paywall.example", "no extraction"
+    )
+    assert cache.blocked_reason("https://paywall.example/b", "paywall.example") is None
+
+    cache.record_failure(
+        "https://paywall.example/b", "paywall.example", "PermanentError"
+    )
+    reason = cache.blocked_reason("https://paywall.example/c", "paywall.example")
+    assert reason == "domain penalized after 2 failed pages"
+    assert cache.blocked_reason("https://other.example/a", "other.example") is None
+
+    # Failing again once the penalty expires doubles it, up to the cap
+    clock.now += 2 * DAY
+    cache.record_failure(
+        "https://paywall.example/c", "paywall.example", "no extraction"
+    )
+    clock.now += 2.9 * DAY
+    assert cache.blocked_reason("https://paywall.example/d", "paywall.example")
+    clock.now += 0.1 * DAY
+    assert cache.blocked_reason("https://paywall.example/d", "paywall.example") is None
+
+
+def test_success_clears_page_and_domain_streak(cache):
+    """Test that a page yielding reviews resets the penalties."""
+    url = "https://reviews.example/a"
+    cache.record_failure(url, "reviews.example", "no valid reviews")
+    cache.record_success(url, "reviews.example")
+    assert cache.blocked_reason(url, "reviews.example") is None
+
+    cache.record_failure(
+        "https://reviews.example/b", "reviews.example", "no extraction"
+    )
+    assert cache.blocked_reason("https://reviews.example/c", "reviews.example") is None
+
+
+def test_cache_file_is_shared(tmp_path, cache, clock):
+    """Test that penalties persist across instances."""
+    cache.record_failure("https://a.example/x", "a.example", "no extraction")
+    other = NegativeCache(tmp_path / "negative.sqlite", clock=clock)
+    assert other.blocked_reason("https://a.example/x", "a.example") is not None
+    other.close()
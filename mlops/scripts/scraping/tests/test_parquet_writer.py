@@ -0,0 +1,98 @@
+"""Unit tests for the partitioned Parquet writer."""
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from mlops.scripts.scraping.parquet_writer import (
+    ITEM_SCHEMA,
+    content_type_partition,
+    to_row,
+    write_parquet_dataset,
+)
+
+ITEMS = [
+    {
+        "title": "Movie",
+        "contentType": "Movie",
+        "streamingPlatforms": ["Netflix", "Max"],
+        "genres": ["Drama"],
+        "imdbRating": 7.5,
+        "cast": [{"name": "Actor", "character": "Hero"}],
+        "regions": {"uk": {"streamingPlatforms": ["BBC"], "releaseDate": "Feb"}},
+        "unknownField": "dropped",
+    },
+    {
+        "title": "Show",
+        "contentType": "TV Show",
+        "streamingPlatforms": "Hulu",
+        "cast": ["Someone"],
+    },
+    {"title": "Untyped"},
+]
+
+
+def test_to_row_coerces_loose_types():
+    """Test coercion of extraction results to the typed schema."""
+    row = to_row(ITEMS[0], "2024-05-01")
+    assert row["imdbRating"] == "7.5"
+    assert row["regions"] == [
+        {
+            "country": "uk",
+            "detailUrl": None,
+            "streamingPlatforms": ["BBC"],
+            "releaseDate": "Feb",
+        }
+    ]
+    assert "unknownField" not in row
+
+    row = to_row(ITEMS[1], "2024-05-01")
+    assert row["streamingPlatforms"] == ["Hulu"]
+    assert row["cast"] == [{"name": "Someone", "character": None}]
+    assert row["content_type"] == "tv_show"
+
+
+def test_content_type_partition():
+    """Test partition values for content types."""
+    assert content_type_partition("TV Show") == "tv_show"
+    assert content_type_partition(" movie ") == "movie"
+    assert content_type_partition(None) == "unknown"
+
+
+def test_write_partitioned_dataset(tmp_path):
+    """Test partition layout, encoding and reading back nested columns."""
+    rows = write_parquet_dataset(iter(ITEMS), tmp_path, "2024-05-01", "run1")
+    assert rows == 3
+
+    partitions = sorted(
+        str(path.parent.relative_to(tmp_path)) for path in tmp_path.rglob("*.parquet")
+    )
+    assert partitions == [
+        "scrape_date=2024-05-01/content_type=movie",
+        "scrape_date=2024-05-01/content_type=tv_show",
+        "scrape_date=2024-05-01/content_type=unknown",
+    ]
+
+    movie_file = next((tmp_path / partitions[0]).glob("run1-*.parquet"))
+    column = pq.ParquetFile(movie_file).metadata.row_group(0).column(0)
+    assert column.compression == "ZSTD"
+    assert "RLE_DICTIONARY" in column.encodings
+
+    dataset = ds.dataset(tmp_path, schema=ITEM_SCHEMA, partitioning="hive")
+    table = dataset.to_table(
+        columns=["title", "cast", "streamingPlatforms"],
+        filter=ds.field("content_type") == "movie",
+    )
+    assert table.to_pylist() == [
+        {
+            "title": "Movie",
+            "cast": [{"name": "Actor", "character": "Hero"}],
+            "streamingPlatforms": ["Netflix", "Max"],
+        }
+    ]
+
+    # A second run adds files instead of replacing the first run's
+    write_parquet_dataset(iter(ITEMS[:1]), tmp_path, "2024-05-01", "run2")
+    assert dataset.count_rows() == 3
+    assert (
+        ds.dataset(tmp_path, schema=ITEM_SCHEMA, partitioning="hive").count_rows() == 4
+    )
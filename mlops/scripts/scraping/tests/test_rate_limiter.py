@@ -0,0 +1,92 @@
+"""Unit tests for the shared Firecrawl rate limiter."""
+
+import threading
+
+import pytest
+
+from mlops.scripts.scraping.rate_limiter import RateLimiter
+from mlops.scripts.scraping.tests.conftest import FakeClock
+
+
+def make_limiter(**kwargs):
+    clock = FakeClock(now=0.0)
+    limiter = RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+    return limiter, clock
+
+
+def test_burst_then_paced_by_rate():
+    """Test that the bucket allows a burst, then spaces requests at the rate."""
+    limiter, clock = make_limiter(rate=2.0, max_in_flight=2)
+
+    for _ in range(2):
+        with limiter.slot():
+            pass
+    assert clock.now == 0.0
+
+    with limiter.slot():
+        pass
+    assert clock.now == pytest.approx(0.5)
+
+
+def test_throttle_decreases_and_success_recovers_rate():
+    """Test additive increase / multiplicative decrease of the rate."""
+    limiter, _ = make_limiter(
+        rate=4.0, max_in_flight=1, min_rate=1.0, increase_step=1.0
+    )
+
+    limiter.record_response(429)
+    assert limiter.rate == 2.0
+    limiter.record_response(429)
+    limiter.record_response(429)
+    assert limiter.rate == 1.0  # clamped to min_rate
+
+    limiter.record_response(200)
+    assert limiter.rate == 2.0
+    for _ in range(5):
+        limiter.record_response(200)
+    assert limiter.rate == 4.0  # clamped to max_rate
+
+
+def test_throttle_drops_saved_burst():
+    """Test that a 429 makes the next request wait even with tokens saved."""
+    limiter, clock = make_limiter(rate=1.0, max_in_flight=4, min_rate=0.5)
+
+    limiter.record_throttle()
+    with limiter.slot():
+        pass
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_max_in_flight_is_enforced():
+    """Test that no more than max_in_flight requests run at once."""
+    limiter = RateLimiter(rate=1000, max_in_flight=2)
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    active = []
+
+    def worker():
+        with limiter.slot():
+            active.append(1)
+            started.release()
+            release.wait(timeout=5)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    started.acquire(timeout=5)
+    started.acquire(timeout=5)
+    assert not started.acquire(timeout=0.1)
+    assert len(active) == 2
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(active) == 3
+
+
+def test_invalid_arguments():
+    """Test that nonsensical limits are rejected."""
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(max_in_flight=0)
@@ -0,0 +1,110 @@
+"""Unit tests for the normalized relational export."""
+
+import pandas as pd
+
+from mlops.scripts.scraping.relational_export import (
+    build_tables,
+    item_id,
+    stable_id,
+    write_tables,
+)
+
+ITEMS = [
+    {
+        "title": "Movie",
+        "contentType": "Movie",
+        "detailUrl": "/us/movie/movie",
+        "streamingPlatforms": ["Netflix"],
+        "genres": ["Drama", " Thriller", "Drama"],
+        "imdbRating": 7.5,
+        "cast": [
+            {"name": "Actor One", "character": "Hero"},
+            {"name": "", "character": "Nobody"},
+            "Actor Two",
+        ],
+        "reviews": [
+            {"source_name": "Site", "review_text": "Great", "review_url": "https://r/1"}
+        ],
+    },
+    {
+        "title": "Show",
+        "contentType": "TV Show",
+        "detailUrl": "https://www.justwatch.com/us/tv-show/show",
+        "streamingPlatforms": ["Hulu"],
+        "regions": {
+            "us": {"streamingPlatforms": ["Hulu"]},
+            "uk": {"streamingPlatforms": ["Netflix", "BBC"]},
+        },
+        "genres": ["Drama"],
+    },
+    {"title": "Movie again", "detailUrl": "https://www.justwatch.com/us/movie/movie/"},
+]
+
+
+def test_stable_ids_are_deterministic():
+    """Test that IDs depend only on natural keys."""
+    assert stable_id("genre", "drama") == stable_id("genre", "drama")
+    assert stable_id("genre", "drama") != stable_id("person", "drama")
+    assert 0 <= stable_id("x") < 2**63
+    assert item_id(ITEMS[0]) == item_id(ITEMS[2])
+
+
+def test_build_tables():
+    """Test normalizing items, nested lists and reviews into keyed tables."""
+    reviews = {
+        "https://www.justwatch.com/us/tv-show/show/": [
+            {"source_name": "Paper", "review_text": "Fine", "original_score": 3}
+        ]
+    }
+    tables = build_tables(ITEMS, reviews=reviews)
+    movie_id, show_id = item_id(ITEMS[0]), item_id(ITEMS[1])
+
+    item = tables["item"]
+    assert list(item["item_id"]) == [movie_id, show_id]
+    assert item["item_id"].dtype == "int64"
+    assert list(item["imdb_rating"]) == ["7.5", None]
+
+    cast = tables["item_cast"]
+    assert list(cast["name"]) == ["Actor One", "Actor Two"]
+    assert list(cast["ordinal"]) == [0, 2]
+
+    platform = tables["item_platform"]
+    assert list(zip(platform["item_id"], platform["region"], platform["platform"])) == [
+        (movie_id, None, "Netflix"),
+        (show_id, "uk", "BBC"),
+        (show_id, "uk", "Netflix"),
+        (show_id, "us", "Hulu"),
+    ]
+    netflix = platform[platform["platform"] == "Netflix"]["platform_id"]
+    assert netflix.nunique() == 1
+
+    genre = tables["item_genre"]
+    assert sorted(genre[genre["item_id"] == movie_id]["genre"]) == ["Drama", "Thriller"]
+    assert genre[genre["genre"] == "Drama"]["genre_id"].nunique() == 1
+
+    review = tables["review"]
+    assert list(zip(review["item_id"], review["review_text"])) == [
+        (movie_id, "Great"),
+        (show_id, "Fine"),
+    ]
+    assert list(review["original_score"]) == [None, "3"]
+
+
+def test_write_tables_round_trip(tmp_path):
+    """Test writing the tables and joining them back on integer keys."""
+    paths = write_tables(build_tables(ITEMS), tmp_path / "tables")
+
+    assert sorted(path.name for path in paths.values()) == [
+        "item.parquet",
+        "item_cast.parquet",
+        "item_genre.parquet",
+        "item_platform.parquet",
+        "review.parquet",
+    ]
+    item = pd.read_parquet(paths["item"])
+    genre = pd.read_parquet(paths["item_genre"])
+    drama = item.merge(genre, on="item_id").query("genre == 'Drama'")
+    assert sorted(drama["title"]) == ["Movie", "Show"]
+
+    empty = write_tables(build_tables([]), tmp_path / "empty")
+    assert pd.read_parquet(empty["review"]).empty
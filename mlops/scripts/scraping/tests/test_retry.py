@@ -0,0 +1,144 @@
+"""Unit tests for the Firecrawl retry engine."""
+
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from mlops.scripts.scraping.retry import (
+    MalformedPayloadError,
+    PermanentError,
+    RetryableError,
+    RetryBudget,
+    RetryPolicy,
+    classify_response,
+    parse_retry_after,
+)
+
+
+def make_response(status_code=200, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.url = "https://api.firecrawl.dev/v1/scrape"
+    response.headers = headers or {}
+    if isinstance(payload, Exception):
+        response.json.side_effect = payload
+    else:
+        response.json.return_value = payload if payload is not None else {}
+    return response
+
+
+def make_policy(**kwargs):
+    sleeps = []
+    policy = RetryPolicy(sleep=sleeps.append, rng=lambda: 0.5, **kwargs)
+    return policy, sleeps
+
+
+def test_parse_retry_after():
+    """Test parsing of delay-seconds and HTTP-date Retry-After values."""
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_classify_response():
+    """Test that responses map to the right error class."""
+    assert classify_response(make_response(200, {"success": True})) == {"success": True}
+    with pytest.raises(RetryableError) as exc_info:
+        classify_response(make_response(429, headers={"Retry-After": "3"}))
+    assert exc_info.value.retry_after == 3.0
+    with pytest.raises(RetryableError):
+        classify_response(make_response(503))
+    with pytest.raises(PermanentError):
+        classify_response(make_response(402))
+    with pytest.raises(MalformedPayloadError):
+        classify_response(make_response(200, ValueError("bad json")))
+    with pytest.raises(MalformedPayloadError):
+        classify_response(make_response(200, ["not", "an", "object"]))
+
+
+def test_success_does_not_sleep():
+    """Test that a successful first attempt adds no delay."""
+    policy, sleeps = make_policy()
+    send = MagicMock(return_value=make_response(200, {"ok": 1}))
+
+    assert policy.call(send) == {"ok": 1}
+    assert send.call_count == 1
+    assert sleeps == []
+    assert policy.budget.spent == 0
+
+
+def test_retries_with_backoff_and_retry_after():
+    """Test jittered exponential backoff, overridden by a longer Retry-After."""
+    policy, sleeps = make_policy(base_delay=1.0)
+    send = MagicMock(
+        side_effect=[
+            make_response(500),
+            requests.exceptions.ConnectionError("reset"),
+            make_response(429, headers={"Retry-After": "10"}),
+            make_response(200, {"ok": 1}),
+        ]
+    )
+
+    assert policy.call(send) == {"ok": 1}
+    assert sleeps == [0.5, 1.0, 10.0]
+    assert policy.budget.spent == 3
+
+
+def test_permanent_error_is_not_retried():
+    """Test that 4xx errors other than 408/429 fail immediately."""
+    policy, sleeps = make_policy()
+    send = MagicMock(return_value=make_response(401))
+
+    with pytest.raises(PermanentError):
+        policy.call(send)
+    assert send.call_count == 1
+    assert sleeps == []
+
+
+def test_malformed_payload_retried_once():
+    """Test that malformed payloads get a single retry."""
+    policy, _ = make_policy()
+    send = MagicMock(return_value=make_response(200, ValueError("truncated")))
+
+    with pytest.raises(MalformedPayloadError):
+        policy.call(send)
+    assert send.call_count == 2
+
+
+def test_gives_up_after_max_attempts():
+    """Test that the last retryable error is raised after max_attempts."""
+    policy, _ = make_policy(max_attempts=3)
+    send = MagicMock(return_value=make_response(502))
+
+    with pytest.raises(RetryableError):
+        policy.call(send)
+    assert send.call_count == 3
+
+
+def test_budget_is_shared_across_calls():
+    """Test that the per-run budget stops retries once spent."""
+    policy, _ = make_policy(budget=RetryBudget(max_retries=2))
+    send = MagicMock(return_value=make_response(503))
+
+    with pytest.raises(RetryableError):
+        policy.call(send)
+    assert send.call_count == 3
+    assert policy.budget.remaining == 0
+
+    send.reset_mock()
+    with pytest.raises(RetryableError):
+        policy.call(send)
+    assert send.call_count == 1
+
+
+def test_other_request_exceptions_propagate():
+    """Test that unclassified transport errors are not retried."""
+    policy, _ = make_policy()
+    send = MagicMock(side_effect=requests.exceptions.InvalidURL("bad url"))
+
+    with pytest.raises(requests.exceptions.InvalidURL):
+        policy.call(send)
+    assert send.call_count == 1
@@ -3,6 +3,10 @@ from unittest.mock import patch, MagicMock, call
 import requests # For requests.exceptions.RequestException
 import logging # To configure logger for tests if needed
 import os # For integration test API key check
+import asyncio
+import pandas as pd
+import threading
+import time
 
 # Assuming review_scraper is in mlops.scripts.scraping
 # This structure assumes that the 'tests' directory is at the same level as 'mlops'
@@ -13,11 +17,23 @@ try:
         _search_for_review_pages,
         _scrape_reviews_from_page,
         fetch_reviews_for_item,
+        fetch_reviews_for_items,
+        iter_reviews_for_items,
         _get_domain_name,
+        release_dates,
         review_extract_schema,
         review_extract_prompt,
-        API_KEY as SCRAPER_API_KEY # Import the API_KEY loaded by the scraper module
+        search_ttl,
     )
+    from mlops.scripts.scraping.cache import ResponseCache
+    from mlops.scripts.scraping.deadline import Deadline
+    from mlops.scripts.scraping.domain_stats import DomainStats
+    from mlops.scripts.scraping.journal import RunJournal
+    from mlops.scripts.scraping.negative_cache import NegativeCache
+    from mlops.scripts.scraping.relational_export import build_tables, item_id
+    from mlops.scripts.scraping.firecrawl_client import DEFAULT_TIMEOUT, FirecrawlClient
+    from mlops.scripts.scraping.rate_limiter import RateLimiter
+    from mlops.scripts.scraping.retry import RetryPolicy
 except ModuleNotFoundError as e:
     # Attempting a common alternative for running tests within a project structure
     # where 'mlops' is a top-level directory accessible via Python's path.
@@ -31,7 +47,6 @@ except ModuleNotFoundError as e:
             _get_domain_name,
             review_extract_schema,
             review_extract_prompt,
-            API_KEY as SCRAPER_API_KEY
         )
     except ModuleNotFoundError:
         print(f"Initial ModuleNotFoundError: {e}")
@@ -49,10 +64,25 @@ logger = logging.getLogger(__name__)
 
 # Common patches for most unit tests.
 # We can apply them individually or explore pytest fixtures for these later if preferred.
+def _mock_session():
+    """Session double that also stands in for get_firecrawl_client.
+
+    Calling it returns a client sending through the double, so tests can
+    configure and inspect ``mock_session.post`` directly.
+    """
+    session = MagicMock()
+    session.return_value = FirecrawlClient(
+        "test_api_key_for_scraper_tests",
+        session=session,
+        rate_limiter=RateLimiter(rate=1000),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+    return session
+
+
 COMMON_UNIT_TEST_PATCHES = [
-    patch('mlops.scripts.scraping.review_scraper.API_KEY', 'test_api_key_for_scraper_tests'),
     patch('mlops.scripts.scraping.review_scraper.load_config'),
-    patch('mlops.scripts.scraping.review_scraper.SESSION')
+    patch('mlops.scripts.scraping.review_scraper.get_firecrawl_client', new_callable=_mock_session)
 ]
 
 # Helper to apply multiple decorators
@@ -100,7 +130,8 @@ def test_search_for_review_pages_success(mock_scraper_logger, mock_session, mock
         json={
             "query": "Test Movie movie reviews",
             "searchOptions": {"limit": 2},
-        }
+        },
+        timeout=DEFAULT_TIMEOUT,
     )
     mock_scraper_logger.info.assert_any_call("Searching for reviews with query: 'Test Movie movie reviews'")
 
@@ -119,7 +150,8 @@ def test_search_for_review_pages_tv_show_query(mock_scraper_logger, mock_session
         json={
             "query": "Test Show TV series reviews",
             "searchOptions": {"limit": 1},
-        }
+        },
+        timeout=DEFAULT_TIMEOUT,
     )
 
 @apply_patches(COMMON_UNIT_TEST_PATCHES)
@@ -152,6 +184,46 @@ def test_search_for_review_pages_no_data_or_unexpected_format(mock_scraper_logge
     mock_scraper_logger.warning.assert_called_once()
 
 
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+def test_search_for_review_pages_uses_search_cache(mock_session, mock_load_config_global, tmp_path):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"data": [{"url": "http://example.com/review1", "title": "Review 1"}]}
+    mock_session.post.return_value = mock_response
+    now = [1000.0]
+    cache = ResponseCache(tmp_path / "cache.sqlite", clock=lambda: now[0])
+
+    with patch('mlops.scripts.scraping.review_scraper.get_response_cache', return_value=cache):
+        first = _search_for_review_pages("Test Movie", "http://moviedetail.com/movie", 2, ttl=100)
+        # The same query with different spacing and case is served from the cache
+        second = _search_for_review_pages("test  movie", "http://moviedetail.com/movie", 2, ttl=100)
+        assert mock_session.post.call_count == 1
+        _search_for_review_pages("Test Movie", "http://moviedetail.com/movie", 3, ttl=100)
+        assert mock_session.post.call_count == 2
+
+        now[0] += 101
+        _search_for_review_pages("Test Movie", "http://moviedetail.com/movie", 2, ttl=100)
+        assert mock_session.post.call_count == 3
+
+    assert first == second == [{"url": "http://example.com/review1", "title": "Review 1"}]
+    cache.close()
+
+
+def test_search_ttl_is_shorter_for_new_releases():
+    config = {"review_search_ttl_hours": 72, "new_release_search_ttl_hours": 12, "new_release_days": 7}
+    today = pd.Timestamp.now().normalize()
+    items = [
+        {"releaseDate": (today - pd.Timedelta(days=2)).strftime("%Y-%m-%d")},
+        {"releaseDate": "March 3, 2020"},
+        {"yearReleased": 2019},
+        {"title": "No date"},
+    ]
+
+    ttls = [search_ttl(date, config) for date in release_dates(items)]
+
+    assert ttls == [12 * 3600, 72 * 3600, 72 * 3600, 12 * 3600]
+
+
 @apply_patches(COMMON_UNIT_TEST_PATCHES)
 @patch('mlops.scripts.scraping.review_scraper.logger')
 def test_scrape_reviews_from_page_success(mock_scraper_logger, mock_session, mock_load_config_global):
@@ -192,7 +264,8 @@ def test_scrape_reviews_from_page_success(mock_scraper_logger, mock_session, moc
                 "extractionPrompt": expected_payload_prompt,
                 "extractionSchema": current_review_extract_schema,
             }
-        }
+        },
+        timeout=DEFAULT_TIMEOUT,
     )
     mock_scraper_logger.info.assert_any_call("Successfully extracted 2 review items from http://example.com/review1")
 
@@ -216,19 +289,19 @@ def test_scrape_reviews_from_page_no_llm_extraction(mock_scraper_logger, mock_se
 
     results = _scrape_reviews_from_page("url", "title", "item", 1, "prompt", {})
     assert results == []
-    mock_scraper_logger.warning.assert_any_call("No reviews extracted or unexpected format from url. Response: {'data': {'llm_extraction': []}}")
+    mock_scraper_logger.warning.assert_any_call("No reviews extracted or unexpected format from %s. Response: %s", "url", "{\"data\":{\"llm_extraction\":[]}}")
 
     mock_scraper_logger.reset_mock()
     mock_response.json.return_value = {"data": {}}
     results = _scrape_reviews_from_page("url", "title", "item", 1, "prompt", {})
     assert results == []
-    mock_scraper_logger.warning.assert_any_call("No reviews extracted or unexpected format from url. Response: {'data': {}}")
+    mock_scraper_logger.warning.assert_any_call("No reviews extracted or unexpected format from %s. Response: %s", "url", "{\"data\":{}}")
 
     mock_scraper_logger.reset_mock()
     mock_response.json.return_value = {"data": {"llm_extraction": [{"invalid": "data"}]}}
     results = _scrape_reviews_from_page("url", "title", "item", 1, "prompt", {})
     assert results == []
-    mock_scraper_logger.warning.assert_any_call("Skipping invalid review data from url: {'invalid': 'data'}")
+    mock_scraper_logger.warning.assert_any_call("Skipping invalid review data from %s: %s", "url", "{\"invalid\":\"data\"}")
 
 
 @apply_patches(COMMON_UNIT_TEST_PATCHES)
@@ -236,24 +309,20 @@ def test_scrape_reviews_from_page_no_llm_extraction(mock_scraper_logger, mock_se
 @patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
 @patch('mlops.scripts.scraping.review_scraper.logger')
 def test_fetch_reviews_for_item_success(mock_scraper_logger, mock_scrape, mock_search, mock_session_global, mock_load_config_global):
-    config_values = {
-        ("scraping", {}): {"review_search_limit": 5, "max_total_reviews_per_item": 3},
-        "review_search_limit": 5,
-        "max_total_reviews_per_item": 3,
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 3}
     }
-    mock_load_config_global.return_value.get.side_effect = lambda k1, k2_default=None: \
-        config_values.get(k1, {}).get(k2_default) if isinstance(k1, str) and isinstance(config_values.get(k1), dict) \
-        else config_values.get((k1, k2_default), k2_default if k2_default is not None else 5)
-
 
     mock_search.return_value = [
         {"url": "http://site1.com/rev", "title": "Review Site 1"},
         {"url": "http://site2.com/rev", "title": "Review Site 2"}
     ]
-    mock_scrape.side_effect = [
-        [{"source_name": "Critic A", "review_text": "Amazing!", "review_url": "http://site1.com/rev"}],
-        [{"source_name": "Critic B", "review_text": "Good.", "review_url": "http://site2.com/rev"}]
-    ]
+    page_reviews = {
+        "http://site1.com/rev": [{"source_name": "Critic A", "review_text": "Amazing!", "review_url": "http://site1.com/rev"}],
+        "http://site2.com/rev": [{"source_name": "Critic B", "review_text": "Good.", "review_url": "http://site2.com/rev"}],
+    }
+    # Pages are scraped concurrently, so answer by URL rather than call order
+    mock_scrape.side_effect = lambda url, *args: page_reviews[url]
 
     results = fetch_reviews_for_item(
         "Test Movie", "http://details.com",
@@ -265,22 +334,103 @@ def test_fetch_reviews_for_item_success(mock_scraper_logger, mock_scrape, mock_s
     assert results[0]['source_name'] == "Critic A"
     assert results[1]['review_text'] == "Good."
 
-    mock_search.assert_called_once_with("Test Movie", "http://details.com", 5)
+    # No release date is known, so the search is cached like a new release's
+    mock_search.assert_called_once_with("Test Movie", "http://details.com", 5, ttl=12 * 3600)
 
     expected_scrape_calls = [
         call("http://site1.com/rev", "Review Site 1", "Test Movie", 1, review_extract_prompt, review_extract_schema),
         call("http://site2.com/rev", "Review Site 2", "Test Movie", 1, review_extract_prompt, review_extract_schema)
     ]
-    mock_scrape.assert_has_calls(expected_scrape_calls)
+    mock_scrape.assert_has_calls(expected_scrape_calls, any_order=True)
     assert mock_scrape.call_count == 2
     mock_scraper_logger.info.assert_any_call("Successfully collected 2 reviews for 'Test Movie'.")
 
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+def test_fetch_reviews_for_item_skips_pages_in_negative_cache(mock_search, mock_session_global, mock_load_config_global, tmp_path):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 3}
+    }
+    mock_search.return_value = [
+        {"url": "http://stream.com/watch", "title": "Watch Now"},
+        {"url": "http://site1.com/rev", "title": "Review Site 1"},
+        {"url": "http://site2.com/rev", "title": "Review Site 2"},
+    ]
+    extractions = {
+        "http://stream.com/watch": [],
+        "http://site1.com/rev": [{"reviewer_name": "Critic A", "review_text": "Amazing!"}],
+        "http://site2.com/rev": [{"reviewer_name": "Critic B", "review_text": "Good."}],
+    }
+
+    def answer(url, json, **kwargs):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"data": {"llm_extraction": extractions[json["url"]]}}
+        return response
+
+    mock_session_global.post.side_effect = answer
+    negative_cache = NegativeCache(tmp_path / "negative.sqlite")
+
+    with patch('mlops.scripts.scraping.review_scraper.get_negative_cache', return_value=negative_cache):
+        first = fetch_reviews_for_item("Test Movie", "http://details.com", max_search_results_to_process=2)
+        # The landing page yielded nothing, so the next run takes the third result instead
+        second = fetch_reviews_for_item("Test Movie", "http://details.com", max_search_results_to_process=2)
+
+    assert [r["source_name"] for r in first] == ["Critic A"]
+    assert [r["source_name"] for r in second] == ["Critic A", "Critic B"]
+    assert negative_cache.blocked_reason("http://stream.com/watch", "stream.com") == "page penalized (no extraction)"
+    assert negative_cache.blocked_reason("http://site1.com/rev", "site1.com") is None
+    scraped = [c.kwargs["json"]["url"] for c in mock_session_global.post.call_args_list]
+    assert scraped.count("http://stream.com/watch") == 1
+    negative_cache.close()
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+def test_fetch_reviews_for_item_ranks_pages_by_domain_yield(mock_search, mock_session_global, mock_load_config_global, tmp_path):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 3}
+    }
+    mock_search.return_value = [
+        {"url": "http://empty.com/rev", "title": "Empty"},
+        {"url": "http://slow.com/rev", "title": "Slow"},
+        {"url": "http://fast.com/rev", "title": "Fast"},
+    ]
+    extractions = {
+        "http://slow.com/rev": [{"reviewer_name": "Critic S", "review_text": "Slow but good."}],
+        "http://fast.com/rev": [{"reviewer_name": "Critic F", "review_text": "Quick take."}],
+    }
+
+    def answer(url, json, **kwargs):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"data": {"llm_extraction": extractions[json["url"]]}}
+        return response
+
+    mock_session_global.post.side_effect = answer
+    stats = DomainStats(tmp_path / "domains.sqlite")
+    for _ in range(5):
+        stats.record("empty.com", 0, 5.0)
+        stats.record("slow.com", 1, 30.0)
+        stats.record("fast.com", 1, 3.0)
+
+    with patch('mlops.scripts.scraping.review_scraper.get_domain_stats', return_value=stats):
+        results = fetch_reviews_for_item("Test Movie", "http://details.com", max_search_results_to_process=2)
+
+    # empty.com never yields reviews, and fast.com goes before slow.com
+    assert [r["source_name"] for r in results] == ["Critic F", "Critic S"]
+    scraped = [c.kwargs["json"]["url"] for c in mock_session_global.post.call_args_list]
+    assert "http://empty.com/rev" not in scraped
+    assert stats.summaries(["fast.com"])["fast.com"]["scrapes"] == 6
+    stats.close()
+
 @apply_patches(COMMON_UNIT_TEST_PATCHES)
 @patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
 @patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
 @patch('mlops.scripts.scraping.review_scraper.logger')
 def test_fetch_reviews_for_item_no_search_results(mock_scraper_logger, mock_scrape, mock_search, mock_session_global, mock_load_config_global):
-    mock_load_config_global.return_value.get.return_value = 5
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 5}
+    }
     mock_search.return_value = []
 
     results = fetch_reviews_for_item("Test Movie", "http://details.com")
@@ -295,7 +445,9 @@ def test_fetch_reviews_for_item_no_search_results(mock_scraper_logger, mock_scra
 @patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
 @patch('mlops.scripts.scraping.review_scraper.logger')
 def test_fetch_reviews_for_item_search_but_no_scrape_results(mock_scraper_logger, mock_scrape, mock_search, mock_session_global, mock_load_config_global):
-    mock_load_config_global.return_value.get.return_value = 5
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 5}
+    }
     mock_search.return_value = [{"url": "http://site1.com/rev", "title": "Review Site 1"}]
     mock_scrape.return_value = []
 
@@ -311,15 +463,9 @@ def test_fetch_reviews_for_item_search_but_no_scrape_results(mock_scraper_logger
 @patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
 @patch('mlops.scripts.scraping.review_scraper.logger')
 def test_fetch_reviews_for_item_max_total_reviews_limit_hit(mock_scraper_logger, mock_scrape, mock_search, mock_session_global, mock_load_config_global):
-    config_values = {
-        ("scraping", {}): {"review_search_limit": 5, "max_total_reviews_per_item": 1},
-        "review_search_limit": 5,
-        "max_total_reviews_per_item": 1,
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 1}
     }
-    mock_load_config_global.return_value.get.side_effect = lambda k1, k2_default=None: \
-        config_values.get(k1, {}).get(k2_default) if isinstance(k1, str) and isinstance(config_values.get(k1), dict) \
-        else config_values.get((k1, k2_default), k2_default if k2_default is not None else (5 if k1 == "review_search_limit" else 1))
-
 
     mock_search.return_value = [
         {"url": "http://site1.com/rev", "title": "Review Site 1"},
@@ -346,14 +492,9 @@ def test_fetch_reviews_for_item_max_total_reviews_limit_hit(mock_scraper_logger,
 @patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
 @patch('mlops.scripts.scraping.review_scraper.logger')
 def test_fetch_reviews_for_item_max_reviews_per_site_respected_in_scrape_call(mock_scraper_logger, mock_scrape, mock_search, mock_session_global, mock_load_config_global):
-    config_values = {
-        ("scraping", {}): {"review_search_limit": 5, "max_total_reviews_per_item": 10},
-        "review_search_limit": 5,
-        "max_total_reviews_per_item": 10,
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 10}
     }
-    mock_load_config_global.return_value.get.side_effect = lambda k1, k2_default=None: \
-        config_values.get(k1, {}).get(k2_default) if isinstance(k1, str) and isinstance(config_values.get(k1), dict) \
-        else config_values.get((k1, k2_default), k2_default if k2_default is not None else 10)
 
     mock_search.return_value = [{"url": "http://site1.com/rev", "title": "Review Site 1"}]
 
@@ -373,12 +514,326 @@ def test_fetch_reviews_for_item_max_reviews_per_site_respected_in_scrape_call(mo
         review_extract_prompt, review_extract_schema
     )
 
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_fetch_reviews_for_item_scrapes_pages_concurrently_in_rank_order(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 3, "review_page_workers": 3}
+    }
+    mock_search.return_value = [
+        {"url": f"http://site{i}.com/rev", "title": f"Review Site {i}"} for i in range(3)
+    ]
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def scrape(url, *args):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # The top-ranked page is the slowest
+        time.sleep(0.1 if "site0" in url else 0.01)
+        with lock:
+            in_flight -= 1
+        return [{"source_name": url, "review_text": "Review", "review_url": url}]
+
+    mock_scrape.side_effect = scrape
+
+    results = fetch_reviews_for_item(
+        "Test Movie", "http://details.com",
+        max_search_results_to_process=3,
+        max_reviews_per_site=1
+    )
+
+    assert [r["review_url"] for r in results] == [f"http://site{i}.com/rev" for i in range(3)]
+    assert max_in_flight == 3
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_fetch_reviews_for_item_stops_starting_pages_once_enough(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 2, "review_page_workers": 4}
+    }
+    mock_search.return_value = [
+        {"url": f"http://site{i}.com/rev", "title": f"Review Site {i}"} for i in range(4)
+    ]
+
+    def scrape(url, *args):
+        if "site0" in url:
+            return []  # The first page fails, so the third one is started
+        return [{"source_name": url, "review_text": "Review", "review_url": url}]
+
+    mock_scrape.side_effect = scrape
+
+    results = fetch_reviews_for_item(
+        "Test Movie", "http://details.com",
+        max_search_results_to_process=4,
+        max_reviews_per_site=1
+    )
+
+    assert [r["review_url"] for r in results] == ["http://site1.com/rev", "http://site2.com/rev"]
+    scraped = sorted(c.args[0] for c in mock_scrape.call_args_list)
+    assert scraped == [f"http://site{i}.com/rev" for i in range(3)]
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_fetch_reviews_for_item_waits_on_pages_under_unlimited_deadline(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 2, "review_page_workers": 2}
+    }
+    mock_search.return_value = [
+        {"url": f"http://site{i}.com/rev", "title": f"Review Site {i}"} for i in range(2)
+    ]
+
+    def scrape(url, *args):
+        time.sleep(0.05)
+        return [{"source_name": url, "review_text": "Review", "review_url": url}]
+
+    mock_scrape.side_effect = scrape
+
+    results = fetch_reviews_for_item(
+        "Test Movie", "http://details.com",
+        max_search_results_to_process=2,
+        deadline=Deadline(None),
+    )
+
+    assert [r["review_url"] for r in results] == [f"http://site{i}.com/rev" for i in range(2)]
+
+def _search_by_title(title, detail_url, search_limit, ttl=None):
+    slug = title.lower().replace(" ", "-")
+    return [{"url": f"http://site{i}.com/{slug}", "title": f"Site {i}"} for i in range(2)]
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_fetch_reviews_for_items_returns_reviews_by_item_id(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 5}
+    }
+    mock_search.side_effect = _search_by_title
+    mock_scrape.side_effect = lambda url, *args: [{"source_name": url, "review_text": "Review", "review_url": url}]
+    items = [
+        {"title": "Movie A", "detailUrl": "/us/movie/movie-a"},
+        {"title": "Movie B", "detailUrl": "/us/movie/movie-b"},
+        {"title": "Movie A", "detailUrl": "/us/movie/movie-a"},
+    ]
+
+    results = asyncio.run(fetch_reviews_for_items(items, max_search_results_to_process=2))
+
+    assert set(results) == {item_id(items[0]), item_id(items[1])}
+    assert [r["review_url"] for r in results[item_id(items[1])]] == [
+        "http://site0.com/movie-b",
+        "http://site1.com/movie-b",
+    ]
+    assert mock_search.call_count == 2
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_fetch_reviews_for_items_feed_the_relational_export(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 5}
+    }
+    mock_search.side_effect = _search_by_title
+    mock_scrape.side_effect = lambda url, *args: [{"source_name": url, "review_text": "Review", "review_url": url}]
+    items = [
+        {"title": "Movie A", "detailUrl": "/us/movie/movie-a"},
+        {"title": "Movie B", "detailUrl": "https://www.justwatch.com/us/movie/movie-b/"},
+    ]
+
+    reviews = asyncio.run(fetch_reviews_for_items(items, max_search_results_to_process=2))
+    tables = build_tables(items, reviews=reviews)
+
+    by_item = tables["review"].groupby("item_id")["review_url"].apply(list).to_dict()
+    assert by_item == {
+        item_id(items[0]): ["http://site0.com/movie-a", "http://site1.com/movie-a"],
+        item_id(items[1]): ["http://site0.com/movie-b", "http://site1.com/movie-b"],
+    }
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_fetch_reviews_for_items_resumes_from_journal(mock_scrape, mock_search, mock_session_global, mock_load_config_global, tmp_path):
+    mock_load_config_global.return_value = {
+        "scraping": {"review_search_limit": 5, "max_total_reviews_per_item": 5}
+    }
+    mock_search.side_effect = _search_by_title
+    failing = {"Movie B"}
+
+    def scrape(url, page_title, title, *args):
+        if title in failing:
+            raise RuntimeError("boom")
+        return [{"source_name": url, "review_text": "Review", "review_url": url}]
+
+    mock_scrape.side_effect = scrape
+    items = [
+        {"title": "Movie A", "detailUrl": "/us/movie/movie-a"},
+        {"title": "Movie B", "detailUrl": "/us/movie/movie-b"},
+    ]
+    journal = RunJournal(tmp_path / "journal.sqlite")
+    run_id = journal.start_run()
+
+    first = asyncio.run(fetch_reviews_for_items(items, journal=journal, run_id=run_id))
+    assert first[item_id(items[1])] == []
+    assert set(journal.completed(run_id, "review")) == {str(item_id(items[0]))}
+
+    failing.clear()
+    mock_search.reset_mock()
+    resumed = asyncio.run(fetch_reviews_for_items(items, journal=journal, run_id=run_id))
+
+    assert [c.args[0] for c in mock_search.call_args_list] == ["Movie B"]
+    assert resumed[item_id(items[0])] == first[item_id(items[0])]
+    assert len(resumed[item_id(items[1])]) == 2
+    journal.close()
+
+
+def test_iter_reviews_for_items_requires_run_id_with_journal(tmp_path):
+    journal = RunJournal(tmp_path / "journal.sqlite")
+
+    async def collect():
+        return [r async for r in iter_reviews_for_items([], journal=journal)]
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
+    journal.close()
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_iter_reviews_for_items_starts_item_budget_at_first_call(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {
+            "review_search_limit": 5,
+            "max_total_reviews_per_item": 5,
+            "review_page_workers": 1,
+        }
+    }
+
+    def search(*args, **kwargs):
+        time.sleep(0.05)
+        return _search_by_title(*args, **kwargs)
+
+    def scrape(url, *args):
+        time.sleep(0.05)
+        return [{"source_name": url, "review_text": "Review", "review_url": url}]
+
+    mock_search.side_effect = search
+    mock_scrape.side_effect = scrape
+    # Two items at a time take about 0.15s each, so the batch takes well over
+    # one item's budget while every item stays within its own
+    items = [{"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(8)]
+
+    results = asyncio.run(
+        fetch_reviews_for_items(
+            items, max_search_results_to_process=2, max_concurrency=2, item_budget=0.4
+        )
+    )
+
+    assert {iid: len(reviews) for iid, reviews in results.items()} == {
+        item_id(item): 2 for item in items
+    }
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_iter_reviews_for_items_streams_under_one_concurrency_limit(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {
+            "review_search_limit": 5,
+            "max_total_reviews_per_item": 5,
+            "review_page_workers": 2,
+        }
+    }
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def track(delay, result):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(delay)
+        with lock:
+            in_flight -= 1
+        return result
+
+    # The first item's search is slow, so later items finish before it
+    mock_search.side_effect = lambda title, *args, **kwargs: track(
+        0.2 if title == "Movie 0" else 0.01, _search_by_title(title, *args, **kwargs)
+    )
+    mock_scrape.side_effect = lambda url, *args: track(
+        0.01, [{"source_name": url, "review_text": "Review", "review_url": url}]
+    )
+    items = [{"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(4)]
+
+    async def collect():
+        return [iid async for iid, _ in iter_reviews_for_items(items, max_concurrency=4)]
+
+    order = asyncio.run(collect())
+
+    assert sorted(order) == sorted(item_id(item) for item in items)
+    assert order[-1] == item_id(items[0])
+    assert 2 <= max_in_flight <= 4
+
+
+@apply_patches(COMMON_UNIT_TEST_PATCHES)
+@patch('mlops.scripts.scraping.review_scraper._search_for_review_pages')
+@patch('mlops.scripts.scraping.review_scraper._scrape_reviews_from_page')
+def test_iter_reviews_for_items_keeps_timed_out_scrapes_within_limit(mock_scrape, mock_search, mock_session_global, mock_load_config_global):
+    mock_load_config_global.return_value = {
+        "scraping": {
+            "review_search_limit": 5,
+            "max_total_reviews_per_item": 5,
+            "review_page_workers": 2,
+        }
+    }
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def track(delay, result):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(delay)
+        with lock:
+            in_flight -= 1
+        return result
+
+    mock_search.side_effect = lambda *args, **kwargs: track(0.01, _search_by_title(*args, **kwargs))
+    # Every page scrape outlasts the item budget
+    mock_scrape.side_effect = lambda url, *args: track(
+        0.2, [{"source_name": url, "review_text": "Review", "review_url": url}]
+    )
+    items = [{"title": f"Movie {i}", "detailUrl": f"/us/movie/movie-{i}"} for i in range(3)]
+
+    results = asyncio.run(
+        fetch_reviews_for_items(
+            items, max_search_results_to_process=2, max_concurrency=2, item_budget=0.05
+        )
+    )
+
+    assert results == {item_id(item): [] for item in items}
+    assert max_in_flight == 2
+
 # --- Integration Test (makes real API calls) ---
 
 def test_fetch_reviews_for_item_integration():
-    # SCRAPER_API_KEY is imported from review_scraper module where it's loaded by load_env_vars()
-    if not SCRAPER_API_KEY: # or os.getenv("FIRECRAWL_API_KEY")
-        pytest.skip("FIRECRAWL_API_KEY not set in environment (checked via review_scraper.API_KEY), skipping integration test.", allow_module_level=True)
+    if not os.getenv("FIRECRAWL_API_KEY"):
+        pytest.skip("FIRECRAWL_API_KEY not set in environment, skipping integration test.")
 
     item_title = "Inception"
     item_detail_url = "https://www.justwatch.com/us/movie/inception" # Contextual
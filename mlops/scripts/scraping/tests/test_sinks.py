@@ -0,0 +1,71 @@
+"""Unit tests for the incremental JSONL sink."""
+
+import json
+
+import pytest
+
+from mlops.scripts.scraping.sinks import JsonlSink, jsonl_to_json, read_jsonl
+
+
+def test_commit_publishes_file_atomically(tmp_path):
+    """Test that items only appear at the final path after commit."""
+    path = tmp_path / "items.jsonl"
+    with JsonlSink(path, flush_every=2) as sink:
+        sink.write({"title": "A", "genres": ["Drama"]})
+        sink.write({"title": "B"})
+        sink.write({"title": "C"})
+        assert not path.exists()
+        # The first full batch is already on disk
+        assert len(sink.part_path.read_text().splitlines()) == 2
+
+    assert not sink.part_path.exists()
+    lines = path.read_text().splitlines()
+    assert lines[0] == '{"title":"A","genres":["Drama"]}'
+    assert [item["title"] for item in read_jsonl(path)] == ["A", "B", "C"]
+
+
+def test_failed_run_keeps_part_file(tmp_path):
+    """Test that a crash leaves the flushed items in the part file."""
+    path = tmp_path / "items.jsonl"
+    with pytest.raises(RuntimeError):
+        with JsonlSink(path, flush_every=1) as sink:
+            sink.write({"title": "A"})
+            raise RuntimeError("killed")
+
+    assert not path.exists()
+    assert list(read_jsonl(sink.part_path)) == [{"title": "A"}]
+
+
+def test_read_jsonl_skips_truncated_line(tmp_path):
+    """Test that a half-written last line does not break reading."""
+    path = tmp_path / "items.jsonl.part"
+    path.write_text('{"title":"A"}\n{"title":"B"}\n{"title":"C","gen')
+
+    assert [item["title"] for item in read_jsonl(path)] == ["A", "B"]
+
+
+def test_abort_removes_part_file(tmp_path):
+    """Test that abort leaves nothing behind."""
+    sink = JsonlSink(tmp_path / "items.jsonl")
+    sink.write({"title": "A"})
+    sink.abort()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_jsonl_to_json(tmp_path):
+    """Test that the JSON snapshot is a valid array of the JSONL items."""
+    items = [{"title": "A", "cast": [{"name": "X"}]}, {"title": "B"}]
+    jsonl_path = tmp_path / "items.jsonl"
+    with JsonlSink(jsonl_path) as sink:
+        for item in items:
+            sink.write(item)
+
+    json_path = tmp_path / "items.json"
+    jsonl_to_json(jsonl_path, json_path)
+    assert json.loads(json_path.read_text()) == items
+
+    empty_path = tmp_path / "empty.jsonl"
+    empty_path.write_text("")
+    jsonl_to_json(empty_path, tmp_path / "empty.json")
+    assert json.loads((tmp_path / "empty.json").read_text()) == []
@@ -0,0 +1,24 @@
+"""Unit tests for the shared SQLite store helpers."""
+
+from mlops.scripts.scraping.negative_cache import NegativeCache
+from mlops.scripts.scraping.storage import SharedStore
+
+
+def test_shared_store_is_disabled_without_path(monkeypatch):
+    """Test that no store is opened while its variable is unset."""
+    monkeypatch.delenv("TEST_STORE_PATH", raising=False)
+    shared = SharedStore("TEST_STORE_PATH", NegativeCache, "test store")
+    assert shared.get() is None
+
+
+def test_shared_store_is_opened_once(monkeypatch, tmp_path):
+    """Test that the store is opened on first use and then reused."""
+    path = tmp_path / "state" / "store.sqlite"
+    monkeypatch.setenv("TEST_STORE_PATH", str(path))
+    shared = SharedStore("TEST_STORE_PATH", NegativeCache, "test store")
+
+    store = shared.get()
+    assert isinstance(store, NegativeCache)
+    assert store.path == path and path.exists()
+    assert shared.get() is store
+    store.close()
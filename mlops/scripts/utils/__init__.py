@@ -0,0 +1 @@
+"""Shared utilities for trending-movies-tvshows project."""
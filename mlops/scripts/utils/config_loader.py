@@ -0,0 +1,258 @@
+"""Layered YAML configuration and secrets, cached for hot paths.
+
+The configuration is ``mlops/config/config_base.yaml`` merged with the
+override file of the environment named by ``APP_ENV``, e.g.
+``config_prod.yaml``. The merged result is kept in memory and rebuilt only
+when one of the files changes on disk, so :func:`load_config` can be called
+per item while a long-running process still picks up edits.
+
+Secrets are read from the environment, then from ``.env`` files and a local
+YAML secrets file standing in for a secrets manager. Values read from files
+are cached for a few minutes.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import yaml
+from dotenv import dotenv_values
+
+logger = logging.getLogger(__name__)
+
+MLOPS_DIR = Path(__file__).resolve().parent.parent.parent
+CONFIG_DIR = MLOPS_DIR / "config"
+BASE_CONFIG_NAME = "config_base.yaml"
+DEFAULT_APP_ENV = "dev"
+
+ENV_FILES = (MLOPS_DIR.parent / ".env", MLOPS_DIR / ".env")
+SECRETS_FILE = CONFIG_DIR / "secrets.local.yaml"
+
+# How long the config files are trusted before their mtimes are checked again
+DEFAULT_RECHECK_SECONDS = 1.0
+DEFAULT_SECRETS_TTL = 300.0
+
+
+def merge_configs(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``base`` updated with ``override``, merging nested mappings.
+
+    Args:
+        base: Lower layer, e.g. the base configuration.
+        override: Upper layer whose values win.
+
+    Returns:
+        A new merged mapping; the arguments are not modified.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_configs(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a mapping, not {type(data).__name__}")
+    return data
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class ConfigLoader:
+    """Base plus environment configuration, cached until a file changes.
+
+    The merged configuration is shared by all callers and must not be
+    modified.
+    """
+
+    def __init__(
+        self,
+        config_dir: Union[str, Path] = CONFIG_DIR,
+        app_env: Optional[str] = None,
+        recheck_seconds: float = DEFAULT_RECHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the loader.
+
+        Args:
+            config_dir: Directory holding the YAML files.
+            app_env: Environment whose overrides apply. Defaults to
+                ``APP_ENV``, read on every load, or ``dev``.
+            recheck_seconds: How long a loaded configuration is returned
+                without checking the files' mtimes.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self.config_dir = Path(config_dir)
+        self.app_env = app_env
+        self.recheck_seconds = recheck_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._config: Optional[Dict[str, Any]] = None
+        self._stamp: Optional[Tuple] = None
+        self._checked_at = -float("inf")
+
+    def paths(self) -> List[Path]:
+        """Return the base and environment files, lowest layer first."""
+        app_env = self.app_env or os.getenv("APP_ENV", DEFAULT_APP_ENV)
+        return [
+            self.config_dir / BASE_CONFIG_NAME,
+            self.config_dir / f"config_{app_env}.yaml",
+        ]
+
+    def load(self) -> Dict[str, Any]:
+        """Return the merged configuration, rebuilding it if a file changed.
+
+        Returns:
+            The merged configuration. A missing environment file counts as
+            empty.
+
+        Raises:
+            FileNotFoundError: If the base configuration file is missing.
+        """
+        config = self._config
+        if (
+            config is not None
+            and self._clock() - self._checked_at < self.recheck_seconds
+        ):
+            return config
+
+        with self._lock:
+            paths = self.paths()
+            stamp = tuple((path, _mtime(path)) for path in paths)
+            if self._config is None or stamp != self._stamp:
+                self._config = self._read(stamp)
+                self._stamp = stamp
+                logger.info(
+                    f"Loaded configuration from {', '.join(str(p) for p, m in stamp if m)}"
+                )
+            self._checked_at = self._clock()
+            return self._config
+
+    def _read(self, stamp: Sequence[Tuple[Path, Optional[int]]]) -> Dict[str, Any]:
+        (base_path, base_mtime), *overrides = stamp
+        if base_mtime is None:
+            raise FileNotFoundError(f"Base configuration not found at {base_path}")
+        config = _read_yaml(base_path)
+        for path, mtime in overrides:
+            if mtime is not None:
+                config = merge_configs(config, _read_yaml(path))
+        return config
+
+    def clear(self):
+        """Drop the cached configuration so the next load reads the files."""
+        with self._lock:
+            self._config = None
+            self._stamp = None
+
+
+class SecretStore:
+    """Secrets from the environment, ``.env`` files and a local secrets file.
+
+    Exported environment variables always win and are never cached. Values
+    from the files are cached for ``ttl`` seconds, so rotated secrets are
+    picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        env_files: Sequence[Union[str, Path]] = ENV_FILES,
+        secrets_file: Union[str, Path, None] = None,
+        ttl: float = DEFAULT_SECRETS_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the store.
+
+        Args:
+            env_files: ``.env`` files to read, later ones overriding earlier
+                ones.
+            secrets_file: YAML mapping of secret names to values, standing in
+                for a secrets manager. Defaults to ``SECRETS_FILE`` from the
+                environment, or ``mlops/config/secrets.local.yaml``.
+            ttl: Seconds file values are cached for.
+            clock: Monotonic clock, injectable for tests.
+        """
+        self.env_files = [Path(path) for path in env_files]
+        self.secrets_file = Path(
+            secrets_file or os.getenv("SECRETS_FILE", str(SECRETS_FILE))
+        )
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._values: Optional[Dict[str, str]] = None
+        self._loaded_at = -float("inf")
+
+    def _read(self) -> Dict[str, str]:
+        values: Dict[str, str] = {}
+        for path in self.env_files:
+            if path.exists():
+                values.update(
+                    {k: v for k, v in dotenv_values(path).items() if v is not None}
+                )
+        if self.secrets_file.exists():
+            values.update({k: str(v) for k, v in _read_yaml(self.secrets_file).items()})
+        return values
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the secret ``name``, or ``default`` if it is not set.
+
+        Args:
+            name: Secret name, e.g. ``FIRECRAWL_API_KEY``.
+            default: Value returned when no source defines the secret.
+
+        Returns:
+            The secret value.
+        """
+        value = os.getenv(name)
+        if value:
+            return value
+        with self._lock:
+            if self._values is None or self._clock() - self._loaded_at >= self.ttl:
+                self._values = self._read()
+                self._loaded_at = self._clock()
+            return self._values.get(name, default)
+
+    def clear(self):
+        """Drop the cached file values so the next lookup reads the files."""
+        with self._lock:
+            self._values = None
+
+
+_default_loader = ConfigLoader()
+_default_secrets: Optional[SecretStore] = None
+_default_secrets_lock = threading.Lock()
+
+
+def load_config() -> Dict[str, Any]:
+    """Return the merged configuration of the current ``APP_ENV``.
+
+    Cheap enough to call per item: files are only re-read after they change.
+
+    Returns:
+        The merged configuration, shared by all callers; do not modify it.
+    """
+    return _default_loader.load()
+
+
+def get_secret(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Return a secret from the process-wide :class:`SecretStore`."""
+    global _default_secrets
+    with _default_secrets_lock:
+        if _default_secrets is None:
+            _default_secrets = SecretStore(
+                ttl=float(os.getenv("SECRETS_TTL_SECONDS", DEFAULT_SECRETS_TTL))
+            )
+    return _default_secrets.get(name, default)
@@ -0,0 +1 @@
+"""Tests for the utils package."""
@@ -0,0 +1,120 @@
+"""Unit tests for the layered configuration and secrets loader."""
+
+import os
+
+import pytest
+
+from mlops.scripts.scraping.tests.conftest import FakeClock
+from mlops.scripts.utils.config_loader import (
+    ConfigLoader,
+    SecretStore,
+    load_config,
+    merge_configs,
+)
+
+
+def write(path, text, mtime=None):
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_merge_configs_merges_nested_mappings():
+    """Test that overrides replace leaves and merge nested mappings."""
+    base = {"scraping": {"a": 1, "b": 2}, "items": [1, 2], "name": "base"}
+    override = {"scraping": {"b": 3}, "items": [3]}
+
+    assert merge_configs(base, override) == {
+        "scraping": {"a": 1, "b": 3},
+        "items": [3],
+        "name": "base",
+    }
+    assert base["scraping"] == {"a": 1, "b": 2}
+
+
+def test_environment_file_overrides_base(tmp_path, monkeypatch):
+    """Test that APP_ENV selects the override layer."""
+    write(tmp_path / "config_base.yaml", "scraping:\n  limit: 5\n  workers: 3\n")
+    write(tmp_path / "config_prod.yaml", "scraping:\n  workers: 16\n")
+    loader = ConfigLoader(tmp_path, recheck_seconds=0)
+
+    monkeypatch.setenv("APP_ENV", "prod")
+    assert loader.load() == {"scraping": {"limit": 5, "workers": 16}}
+    monkeypatch.setenv("APP_ENV", "staging")
+    assert loader.load() == {"scraping": {"limit": 5, "workers": 3}}
+
+
+def test_config_is_cached_until_a_file_changes(tmp_path):
+    """Test that files are re-read only when their mtime changes."""
+    base = tmp_path / "config_base.yaml"
+    write(base, "scraping:\n  limit: 5\n", mtime=1_000_000_000)
+    clock = FakeClock()
+    loader = ConfigLoader(tmp_path, app_env="dev", recheck_seconds=1.0, clock=clock)
+
+    config = loader.load()
+    assert loader.load() is config
+
+    write(base, "scraping:\n  limit: 9\n", mtime=2_000_000_000)
+    # Within the recheck window the cached configuration is trusted
+    assert loader.load() is config
+    clock.now += 1.0
+    assert loader.load() == {"scraping": {"limit": 9}}
+
+    write(tmp_path / "config_dev.yaml", "scraping:\n  limit: 7\n")
+    clock.now += 1.0
+    assert loader.load() == {"scraping": {"limit": 7}}
+
+
+def test_missing_base_config_raises(tmp_path):
+    """Test that a missing base file is reported."""
+    with pytest.raises(FileNotFoundError):
+        ConfigLoader(tmp_path).load()
+
+
+def test_invalid_config_raises(tmp_path):
+    """Test that a file not holding a mapping is rejected."""
+    write(tmp_path / "config_base.yaml", "- a\n- b\n")
+    with pytest.raises(ValueError):
+        ConfigLoader(tmp_path).load()
+
+
+def test_repository_config_has_scraping_settings():
+    """Test the shipped configuration files."""
+    scraping = load_config()["scraping"]
+    assert scraping["review_search_limit"] == 5
+    assert scraping["max_total_reviews_per_item"] == 5
+
+
+def test_secrets_come_from_environment_then_files(tmp_path, monkeypatch):
+    """Test the lookup order of secret sources."""
+    env_file = tmp_path / ".env"
+    write(env_file, "API_KEY=from-dotenv\nOTHER=dotenv-other\n")
+    secrets_file = tmp_path / "secrets.local.yaml"
+    write(secrets_file, "OTHER: from-secrets-file\n")
+    store = SecretStore(env_files=[env_file], secrets_file=secrets_file)
+    monkeypatch.delenv("API_KEY", raising=False)
+    monkeypatch.delenv("OTHER", raising=False)
+
+    assert store.get("API_KEY") == "from-dotenv"
+    assert store.get("OTHER") == "from-secrets-file"
+    assert store.get("MISSING", "default") == "default"
+    monkeypatch.setenv("API_KEY", "from-env")
+    assert store.get("API_KEY") == "from-env"
+
+
+def test_secret_files_are_cached_for_ttl(tmp_path, monkeypatch):
+    """Test that rotated file secrets are picked up once the TTL expires."""
+    env_file = tmp_path / ".env"
+    write(env_file, "API_KEY=old\n")
+    clock = FakeClock()
+    store = SecretStore(
+        env_files=[env_file], secrets_file=tmp_path / "none.yaml", ttl=60, clock=clock
+    )
+    monkeypatch.delenv("API_KEY", raising=False)
+
+    assert store.get("API_KEY") == "old"
+    write(env_file, "API_KEY=new\n")
+    clock.now += 59
+    assert store.get("API_KEY") == "old"
+    clock.now += 1
+    assert store.get("API_KEY") == "new"